@@ -0,0 +1,16 @@
+"""Make the vbe_3d package and the shared example modules importable.
+
+Importing this module puts the project root and the examples directory on
+sys.path. Python caches the module, so the paths are added at most once per
+interpreter no matter how many scripts import it.
+"""
+
+import os
+import sys
+
+EXAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(EXAMPLES_DIR)
+
+for _path in (PROJECT_ROOT, EXAMPLES_DIR):
+    if _path not in sys.path:
+        sys.path.append(_path)
@@ -1,15 +1,46 @@
 """Configuration loader for world and robot settings."""
 
-import json
+import copy
+import importlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, Iterator, List, Tuple
 
 from vbe_3d.core.world import World
 from vbe_3d.core.robot import Robot
-from vbe_3d.core.static_element import StaticElement, ResourceType
-from vbe_3d.brain.factory import brain_from_export
-from vbe_3d.brain.rl_brain import RLBrain
-from vbe_3d.brain.rule_based import RuleBasedBrain
+from vbe_3d.core.static_element import StaticElement
+from vbe_3d.utils.json_codec import loads as json_loads
+
+try:
+    import ijson  # incremental parser used to stream selected fields
+except ImportError:
+    ijson = None
+
+# Parsed configs keyed by absolute path, tagged with the file's mtime (ns) so
+# repeated loads of an unchanged file skip the parse entirely.
+_CONFIG_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+# Config files larger than this (in bytes) are streamed when ijson is available
+STREAMING_THRESHOLD = 1 << 20
+
+# Robot counts from which brains are created on a thread pool
+PARALLEL_BRAIN_THRESHOLD = 8
+
+# Brain classes by config name, as (module, class) so that a backend such as
+# RLBrain (and torch with it) is only imported once a config asks for it.
+_BRAIN_CLASSES: Dict[str, Tuple[str, str]] = {
+    "RLBrain": ("vbe_3d.brain.rl_brain", "RLBrain"),
+    "RuleBasedBrain": ("vbe_3d.brain.rule_based", "RuleBasedBrain"),
+}
+
+
+@lru_cache(maxsize=None)
+def _brain_class(brain_type: str):
+    """Import and return the brain class for a config brain type."""
+    module_name, class_name = _BRAIN_CLASSES[brain_type]
+    return getattr(importlib.import_module(module_name), class_name)
 
 
 class ConfigLoader:
@@ -19,14 +50,63 @@ class ConfigLoader:
     def load_config(config_path: str) -> Dict[str, Any]:
         """Load configuration from a JSON file.
         
+        Parsed configurations are cached per path and modification time;
+        each call returns its own copy, so callers may modify it.
+        
         Args:
             config_path: Path to the JSON configuration file.
             
         Returns:
             Dictionary containing the configuration data.
         """
-        with open(config_path, 'r') as f:
-            return json.load(f)
+        return copy.deepcopy(ConfigLoader._cached_config(config_path))
+    
+    @staticmethod
+    def _cached_config(config_path: str) -> Dict[str, Any]:
+        """The cached configuration itself, for callers that only read it."""
+        path = os.path.abspath(config_path)
+        mtime = os.stat(path).st_mtime_ns
+        cached = _CONFIG_CACHE.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        config = json_loads(Path(path).read_bytes())
+        _CONFIG_CACHE[path] = (mtime, config)
+        return config
+    
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop all cached configurations."""
+        _CONFIG_CACHE.clear()
+    
+    @staticmethod
+    def load_config_fields(
+        config_path: str,
+        fields: Tuple[str, ...] = ("static_elements", "robots")
+    ) -> Dict[str, Iterator[Dict[str, Any]]]:
+        """Load only the given top-level list fields of a configuration file.
+        
+        When ijson is installed each field is streamed straight from the file,
+        so unrelated sections (world metadata, presets, ...) are never turned
+        into Python objects. Otherwise the full configuration is loaded.
+        
+        Args:
+            config_path: Path to the JSON configuration file.
+            fields: Names of the top-level list fields to extract.
+            
+        Returns:
+            Dictionary mapping each field name to an iterator over its items.
+            Missing fields yield no items.
+        """
+        if ijson is None:
+            config = ConfigLoader._cached_config(config_path)
+            return {field: iter(copy.deepcopy(config.get(field, []))) for field in fields}
+        return {field: ConfigLoader._stream_field(config_path, field) for field in fields}
+    
+    @staticmethod
+    def _stream_field(config_path: str, field: str) -> Iterator[Dict[str, Any]]:
+        """Yield the items of a top-level list field as they are parsed."""
+        with open(config_path, 'rb') as f:
+            yield from ijson.items(f, f"{field}.item", use_float=True)
     
     @staticmethod
     def create_brain(brain_type: str):
@@ -38,13 +118,10 @@ class ConfigLoader:
         Returns:
             Brain instance.
         """
-        if brain_type == "RLBrain":
-            return RLBrain()
-        elif brain_type == "RuleBasedBrain":
-            return RuleBasedBrain()
-        else:
+        if brain_type not in _BRAIN_CLASSES:
             # Default to rule-based brain
-            return RuleBasedBrain()
+            brain_type = "RuleBasedBrain"
+        return _brain_class(brain_type)()
     
     @staticmethod
     def create_static_element(element_config: Dict[str, Any]) -> StaticElement:
@@ -56,32 +133,25 @@ class ConfigLoader:
         Returns:
             StaticElement instance.
         """
-        return StaticElement(
-            position=tuple(element_config["position"]),
-            color=tuple(element_config["color"]),
-            resource_value=element_config["resource_value"],
-            resource_type=ResourceType[element_config["resource_type"]],
-            decay_rate=element_config.get("decay_rate", 0.0),
-            respawn_time=element_config.get("respawn_time"),
-            max_uses=element_config.get("max_uses"),
-            is_obstacle=element_config.get("is_obstacle", False),
-            is_collectible=element_config.get("is_collectible", True)
-        )
+        return StaticElement.from_config_dict(element_config)
     
     @staticmethod
-    def create_robot(robot_config: Dict[str, Any]) -> Robot:
+    def create_robot(robot_config: Dict[str, Any], brain=None) -> Robot:
         """Create a robot from configuration.
         
         Args:
             robot_config: Configuration dictionary for the robot.
+            brain: Brain to give the robot; created from the config's
+                "brain_type" when omitted.
             
         Returns:
             Robot instance.
         """
-        brain = ConfigLoader.create_brain(robot_config["brain_type"])
+        if brain is None:
+            brain = ConfigLoader.create_brain(robot_config["brain_type"])
         
         return Robot(
-            position=tuple(robot_config["position"]),
+            position=robot_config["position"],
             color=tuple(robot_config["color"]),
             brain=brain,
             max_energy=robot_config.get("max_energy", 100.0),
@@ -93,21 +163,82 @@ class ConfigLoader:
     def setup_world_from_config(world: World, config_path: str) -> None:
         """Set up a world with robots and static elements from configuration.
         
+        Configuration files larger than STREAMING_THRESHOLD are streamed
+        (see setup_world_from_config_streaming) when ijson is installed;
+        smaller ones are read from the load_config cache.
+        
         Args:
             world: The world instance to populate.
             config_path: Path to the JSON configuration file.
         """
-        config = ConfigLoader.load_config(config_path)
+        if ijson is not None and os.path.getsize(config_path) > STREAMING_THRESHOLD:
+            ConfigLoader.setup_world_from_config_streaming(world, config_path)
+            return
+        
+        config = ConfigLoader._cached_config(config_path)
         
         # Add static elements
-        for element_config in config["static_elements"]:
-            element = ConfigLoader.create_static_element(element_config)
-            world.add_static(element)
+        world.add_statics([
+            ConfigLoader.create_static_element(element_config)
+            for element_config in config.get("static_elements", ())
+        ])
         
         # Add robots
-        for robot_config in config["robots"]:
-            robot = ConfigLoader.create_robot(robot_config)
-            world.add_robot(robot)
+        world.add_robots(ConfigLoader.create_robots(config.get("robots", ())))
+    
+    @staticmethod
+    def create_robots(robot_configs: List[Dict[str, Any]]) -> List[Robot]:
+        """Create robots for a list of configuration entries.
+        
+        For PARALLEL_BRAIN_THRESHOLD or more robots on a multi-core machine
+        the brains are built on a thread pool, since network initialisation
+        for RLBrain spends most of its time in torch with the GIL released.
+        The robots themselves are still created in order, so their ids
+        follow the configuration.
+        
+        Args:
+            robot_configs: Configuration dictionaries for the robots.
+            
+        Returns:
+            List of Robot instances, in configuration order.
+        """
+        workers = os.cpu_count() or 1
+        if workers == 1 or len(robot_configs) < PARALLEL_BRAIN_THRESHOLD:
+            return [ConfigLoader.create_robot(robot_config) for robot_config in robot_configs]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            brains = list(executor.map(
+                ConfigLoader.create_brain,
+                [robot_config["brain_type"] for robot_config in robot_configs]
+            ))
+        return [
+            ConfigLoader.create_robot(robot_config, brain)
+            for robot_config, brain in zip(robot_configs, brains)
+        ]
+    
+    @staticmethod
+    def setup_world_from_config_streaming(world: World, config_path: str) -> None:
+        """Set up a world from a configuration file without loading it whole.
+        
+        Static elements and robots are created as their entries are parsed,
+        so only one entry's dictionary is alive at a time instead of the
+        entire parsed file. Requires ijson; without it the full configuration
+        is loaded.
+        
+        Args:
+            world: The world instance to populate.
+            config_path: Path to the JSON configuration file.
+        """
+        fields = ConfigLoader.load_config_fields(config_path)
+        
+        world.add_statics(
+            ConfigLoader.create_static_element(element_config)
+            for element_config in fields["static_elements"]
+        )
+        
+        world.add_robots(
+            ConfigLoader.create_robot(robot_config)
+            for robot_config in fields["robots"]
+        )
     
     @staticmethod
     def create_world_from_config(engine, config_path: str) -> World:
@@ -1,8 +1,7 @@
 """Minimal live demo – run and move two robots."""
 
 import os
-import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import _bootstrap  # noqa: F401  (sets up sys.path)
 
 from vbe_3d.engine.ursina_engine import UrsinaEngine
 from config_loader import ConfigLoader
@@ -16,6 +15,7 @@ if __name__ == "__main__":
     
     # Create world from configuration
     world = ConfigLoader.create_world_from_config(engine, config_path)
+    world.warmup_brains()
     
     # Run the simulation
     engine.run(world)
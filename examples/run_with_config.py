@@ -1,9 +1,8 @@
 """Flexible demo script that can run with different configuration files."""
 
 import os
-import sys
 import argparse
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import _bootstrap  # noqa: F401  (sets up sys.path)
 
 from vbe_3d.engine.ursina_engine import UrsinaEngine
 from config_loader import ConfigLoader
@@ -28,7 +27,7 @@ def main():
     # List available configs if requested
     if args.list_configs:
         config_dir = os.path.dirname(__file__)
-        config_files = [f for f in os.listdir(config_dir) if f.endswith('_config.json')]
+        config_files = [e.name for e in os.scandir(config_dir) if e.is_file() and e.name.endswith('_config.json')]
         print("Available configuration files:")
         for config_file in config_files:
             print(f"  - {config_file}")
@@ -53,6 +52,7 @@ def main():
     
     # Create world from configuration
     world = ConfigLoader.create_world_from_config(engine, config_path)
+    world.warmup_brains()
     
     # Run the simulation
     engine.run(world)
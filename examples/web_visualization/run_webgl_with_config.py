@@ -1,23 +1,16 @@
 """Flexible WebGL demo script that can run with different configuration files."""
 
-import asyncio
 import os
 import sys
 import argparse
-from pathlib import Path
 
-# Add the project root to Python path
-project_root = str(Path(__file__).parent.parent.parent)
-if project_root not in sys.path:
-    sys.path.append(project_root)
-
-# Add the examples directory to Python path for config_loader
-examples_dir = str(Path(__file__).parent.parent)
-if examples_dir not in sys.path:
-    sys.path.append(examples_dir)
+# _bootstrap lives one level up and adds the project root and examples dir
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import _bootstrap  # noqa: F401
 
 from vbe_3d.engine.webgl_engine import WebGLEngine
 from config_loader import ConfigLoader
+from tick_loop import run, run_tick_loop
 
 async def run_webgl_demo(config_path: str):
     """Run the WebGL visualization demo with specified configuration."""
@@ -31,23 +24,11 @@ async def run_webgl_demo(config_path: str):
     
     # Create world from configuration
     world = ConfigLoader.create_world_from_config(engine, config_path)
+    world.warmup_brains()
     
     try:
         # Run simulation continuously
-        while True:
-            # Step the world simulation
-            world.step()
-            
-            # Update all objects in the visualization
-            for obj in list(engine.entities.keys()):
-                engine.update_object(obj)
-            
-            # Wait for messages to be processed
-            await engine.message_queue.join()
-            
-            # Add small delay between steps
-            await asyncio.sleep(0.1)
-            
+        await run_tick_loop(world, engine)
     except KeyboardInterrupt:
         print("\nDemo interrupted by user")
     finally:
@@ -74,7 +55,7 @@ def main():
     # List available configs if requested
     if args.list_configs:
         config_dir = os.path.join(os.path.dirname(__file__), '..')
-        config_files = [f for f in os.listdir(config_dir) if f.endswith('_config.json')]
+        config_files = [e.name for e in os.scandir(config_dir) if e.is_file() and e.name.endswith('_config.json')]
         print("Available configuration files:")
         for config_file in config_files:
             print(f"  - {config_file}")
@@ -95,7 +76,7 @@ def main():
     print(f"Loading configuration from: {config_path}")
     
     # Run the async demo
-    asyncio.run(run_webgl_demo(config_path))
+    run(run_webgl_demo(config_path))
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
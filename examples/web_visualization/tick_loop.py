@@ -0,0 +1,52 @@
+"""Simulation tick loop shared by the WebGL demos."""
+
+import asyncio
+import collections
+
+try:
+    import uvloop  # libuv-based event loop, faster socket and timer handling
+except ImportError:
+    uvloop = None
+
+# Target duration of one simulation tick in seconds
+TICK_INTERVAL = 0.1
+
+# Ticks whose messages may still be sending before the loop waits for the
+# oldest of them to finish
+MAX_PENDING_TICKS = 2
+
+
+async def run_tick_loop(world, engine):
+    """Step the world and send its objects to the engine once per tick, forever."""
+    loop = asyncio.get_running_loop()
+    next_tick = loop.time()
+    # One engine.messages_sent() future per tick still being sent, oldest first
+    pending_ticks = collections.deque()
+
+    while True:
+        # Step the world simulation (batched when all brains are rule-based)
+        world.step_batched()
+
+        # Update all objects in the visualization with one batched message
+        engine.update_objects(engine.entity_list)
+
+        # Let this tick's messages drain while the next step runs, and only
+        # block when the sender falls more than MAX_PENDING_TICKS behind
+        pending_ticks.append(engine.messages_sent())
+        if len(pending_ticks) > MAX_PENDING_TICKS:
+            await pending_ticks.popleft()
+
+        # Sleep until the next tick is due; if a step overran, skip the
+        # missed ticks instead of trying to catch up
+        next_tick += TICK_INTERVAL
+        now = loop.time()
+        if next_tick < now:
+            next_tick = now
+        await asyncio.sleep(next_tick - now)
+
+
+def run(coroutine):
+    """Run a demo coroutine, on uvloop when it is installed."""
+    if uvloop is not None:
+        uvloop.install()
+    asyncio.run(coroutine)
@@ -1,5 +1,6 @@
 let scene, camera, renderer, controls;
 let objects = new Map();
+let slotMeshes = [];  // mesh per position-buffer slot, see applyPositions
 let ws;
 
 function createSky() {
@@ -113,6 +114,7 @@ function initWebSocket() {
         console.log('Connecting to WebSocket at:', wsUrl);
         
         ws = new WebSocket(wsUrl);
+        ws.binaryType = 'arraybuffer';
         
         ws.onopen = function() {
             console.log('WebSocket connection established successfully');
@@ -128,16 +130,26 @@ function initWebSocket() {
         
         ws.onmessage = function(event) {
             try {
+                if (event.data instanceof ArrayBuffer) {
+                    applyPositions(event.data);
+                    return;
+                }
                 const data = JSON.parse(event.data);
                 console.log('Received WebSocket message:', data);
                 
                 switch(data.type) {
                     case 'add':
-                        addObject(data.id, data.position, data.color, data.model_type, data.scale);
+                        addObject(data.id, data.slot, data.position, data.color, data.model_type, data.scale);
+                        break;
+                    case 'add_batch':
+                        data.objects.forEach(obj => addObject(obj.id, obj.slot, obj.position, obj.color, obj.model_type, obj.scale));
                         break;
                     case 'update':
                         updateObject(data.id, data.position, data.color, data.rotation, data.scale);
                         break;
+                    case 'update_batch':
+                        data.objects.forEach(obj => updateObject(obj.id, obj.position, obj.color, obj.rotation, obj.scale));
+                        break;
                     case 'remove':
                         removeObject(data.id);
                         break;
@@ -164,7 +176,7 @@ function animate() {
     renderer.render(scene, camera);
 }
 
-function addObject(id, position, color, modelType, scale) {
+function addObject(id, slot, position, color, modelType, scale) {
     let geometry;
     switch(modelType) {
         case 'cube':
@@ -181,8 +193,26 @@ function addObject(id, position, color, modelType, scale) {
     const mesh = new THREE.Mesh(geometry, material);
     mesh.position.set(position[0], position[1], position[2]);
     
+    mesh.userData.slot = slot;
+    
     scene.add(mesh);
     objects.set(id, mesh);
+    slotMeshes[slot] = mesh;
+}
+
+function applyPositions(buffer) {
+    // Binary frame: 16-byte records of (uint32 slot, float32 x, y, z), little-endian
+    const view = new DataView(buffer);
+    for (let offset = 0; offset + 16 <= view.byteLength; offset += 16) {
+        const mesh = slotMeshes[view.getUint32(offset, true)];
+        if (mesh) {
+            mesh.position.set(
+                view.getFloat32(offset + 4, true),
+                view.getFloat32(offset + 8, true),
+                view.getFloat32(offset + 12, true)
+            );
+        }
+    }
 }
 
 function updateObject(id, position, color, rotation, scale) {
@@ -203,6 +233,9 @@ function removeObject(id) {
     const mesh = objects.get(id);
     if (mesh) {
         scene.remove(mesh);
+        if (slotMeshes[mesh.userData.slot] === mesh) {
+            slotMeshes[mesh.userData.slot] = undefined;
+        }
         mesh.geometry.dispose();
         mesh.material.dispose();
         objects.delete(id);
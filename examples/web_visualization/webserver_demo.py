@@ -1,24 +1,16 @@
 """WebGL visualization demo with robots and static elements."""
 
-import asyncio
 import time
 import sys
-import json
 import os
-from pathlib import Path
 
-# Add the project root to Python path
-project_root = str(Path(__file__).parent.parent.parent)
-if project_root not in sys.path:
-    sys.path.append(project_root)
-
-# Add the examples directory to Python path for config_loader
-examples_dir = str(Path(__file__).parent.parent)
-if examples_dir not in sys.path:
-    sys.path.append(examples_dir)
+# _bootstrap lives one level up and adds the project root and examples dir
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import _bootstrap  # noqa: F401
 
 from vbe_3d.engine.webgl_engine import WebGLEngine
 from config_loader import ConfigLoader
+from tick_loop import run, run_tick_loop
 
 async def run_webgl_demo():
     """Run the WebGL visualization demo."""
@@ -35,23 +27,11 @@ async def run_webgl_demo():
     
     # Create world from configuration
     world = ConfigLoader.create_world_from_config(engine, config_path)
+    world.warmup_brains()
     
     try:
         # Run simulation continuously
-        while True:
-            # Step the world simulation
-            world.step()
-            
-            # Update all objects in the visualization
-            for obj in list(engine.entities.keys()):
-                engine.update_object(obj)
-            
-            # Wait for messages to be processed
-            await engine.message_queue.join()
-            
-            # Add small delay between steps
-            await asyncio.sleep(0.1)
-            
+        await run_tick_loop(world, engine)
     except KeyboardInterrupt:
         print("\nDemo interrupted by user")
     finally:
@@ -61,7 +41,7 @@ async def run_webgl_demo():
 def main():
     """Main entry point."""
     print("Starting WebGL demo...")
-    asyncio.run(run_webgl_demo())
+    run(run_webgl_demo())
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
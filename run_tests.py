@@ -14,99 +14,389 @@ import unittest
 import sys
 import time
 import os
-import signal
 import threading
-from io import StringIO
+import functools
+import glob
+import heapq
+import json
+import re
+import subprocess
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, TimeoutError
 
 
-class TimeoutError(Exception):
-    """Custom timeout exception."""
-    pass
+# Wall-clock limit for one shard of the full suite, in seconds
+SHARD_TIMEOUT = 600
+
+# Per-test durations of previous runs, used to balance the shards
+DURATIONS_FILE = '.test_durations.json'
+
+# Test ids from the last discovery, reused while no test file changes
+TEST_IDS_CACHE_FILE = '.test_ids_cache.json'
+
+# Shared loader; no test depends on method order, so skip sorting them
+_LOADER = unittest.TestLoader()
+_LOADER.sortTestMethodsUsing = None
+
+
+class ProgressTestResult(unittest.TextTestResult):
+    """Text test result that flags slow tests and records test durations."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.current_test = None
+        self.test_start_time = None
+        self.durations = {}
+    
+    def startTest(self, test):
+        # Start time first: the watchdog reads it once current_test is set
+        self.test_start_time = time.monotonic()
+        self.current_test = str(test)
+        super().startTest(test)
+    
+    def stopTest(self, test):
+        duration = time.monotonic() - self.test_start_time
+        self.durations[test.id()] = duration
+        if duration > 5.0:  # Warn if test takes more than 5 seconds
+            # sys.stdout is still the capture buffer here when buffer=True
+            print(f"⚠️  Slow test: {self.current_test} took {duration:.2f}s", file=sys.__stdout__)
+        self.current_test = None
+        super().stopTest(test)
 
 
 class ProgressTestRunner(unittest.TextTestRunner):
-    """Test runner with progress tracking and timeout support."""
+    """Test runner with progress tracking and timeout support.
+    
+    The timeout is enforced by a watchdog thread that polls the running
+    test's start time. A test cannot be interrupted safely from another
+    thread (it may be deep inside torch), so on timeout the process exits
+    with status 1.
+    """
+    
+    resultclass = ProgressTestResult
     
     def __init__(self, timeout=30, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.timeout = timeout
-        self.current_test = None
-        self.test_start_time = None
+        self._result = None
         
     def run(self, test):
         """Run tests with progress tracking."""
-        self.test_start_time = time.time()
-        self.current_test = None
-        
-        # Set up timeout handler
-        def timeout_handler(signum, frame):
-            if self.current_test:
-                raise TimeoutError(f"Test {self.current_test} timed out after {self.timeout} seconds")
-        
-        # Set up signal handler for timeout (Unix-like systems)
-        if hasattr(signal, 'SIGALRM'):
-            signal.signal(signal.SIGALRM, timeout_handler)
-        
-        return super().run(test)
+        done = threading.Event()
+        if self.timeout:
+            watchdog = threading.Thread(target=self._watchdog, args=(done,), daemon=True)
+            watchdog.start()
+        try:
+            return super().run(test)
+        finally:
+            done.set()
     
     def _makeResult(self):
-        """Create a custom result object with progress tracking."""
-        result = super()._makeResult()
-        original_startTest = result.startTest
-        original_stopTest = result.stopTest
-        
-        def startTest(test):
-            self.current_test = str(test)
-            self.test_start_time = time.time()
-            print(f"\n🔄 Running: {self.current_test}")
-            if hasattr(signal, 'SIGALRM'):
-                signal.alarm(self.timeout)
-            return original_startTest(test)
-        
-        def stopTest(test):
-            duration = time.time() - self.test_start_time
-            if duration > 5.0:  # Warn if test takes more than 5 seconds
-                print(f"⚠️  Slow test: {self.current_test} took {duration:.2f}s")
-            if hasattr(signal, 'SIGALRM'):
-                signal.alarm(0)  # Cancel alarm
-            self.current_test = None
-            return original_stopTest(test)
-        
-        result.startTest = startTest
-        result.stopTest = stopTest
-        return result
+        self._result = super()._makeResult()
+        return self._result
+    
+    def _watchdog(self, done):
+        """Exit the process if a single test runs longer than the timeout."""
+        while not done.wait(1.0):
+            result = self._result
+            if result is None or result.current_test is None:
+                continue
+            if time.monotonic() - result.test_start_time > self.timeout:
+                print(f"\n⏰ TIMEOUT: Test {result.current_test} timed out after {self.timeout} seconds",
+                      file=sys.__stdout__)
+                sys.__stdout__.flush()
+                os._exit(1)
+
+
+class ShardedTestResult:
+    """Merged outcome of test shards run in separate processes.
+    
+    Exposes the subset of the unittest.TestResult interface that
+    print_test_summary and main rely on. Shards only report counts plus a
+    short summary of each failure and error, so skipped tests are kept as
+    a count (skipped_count) rather than a list.
+    """
+    
+    def __init__(self):
+        self.testsRun = 0
+        self.skipped_count = 0
+        self.failures = []
+        self.errors = []
+        self.durations = {}
+    
+    def add_shard(self, tests_run, failures, errors, skipped_count, durations):
+        """Merge the result of one shard."""
+        self.testsRun += tests_run
+        self.skipped_count += skipped_count
+        self.failures.extend(failures)
+        self.errors.extend(errors)
+        self.durations.update(durations)
+    
+    def wasSuccessful(self):
+        return not self.failures and not self.errors
+
+
+def _warmup():
+    """Import the heavy dependencies up front.
+    
+    Called before test discovery and as the initializer of worker
+    processes, so import and initialisation costs are paid once per process
+    before any test runs. torch is limited to one intra-op thread, since
+    several shards each starting a full thread pool would oversubscribe
+    the CPU for the tiny networks used in the tests.
+    """
+    try:
+        import torch
+        torch.set_num_threads(1)
+        import vbe_3d.brain.rl_brain  # noqa: F401
+        import vbe_3d.core.world  # noqa: F401
+    except ImportError as e:
+        # Let the affected test modules report the missing dependency
+        print(f"⚠️  Warmup import failed: {e}")
+
+
+def _flatten_ids(suite):
+    """Return the ids of all test cases in a (nested) suite."""
+    ids = []
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            ids.extend(_flatten_ids(test))
+        else:
+            ids.append(test.id())
+    return ids
+
+
+def _run_shard(result_path, test_ids):
+    """Entry point of a shard process (`run_tests.py --shard`).
+    
+    Runs the tests like `python -m unittest -b -v` would, reporting to
+    stderr in the same format, and writes the outcome to result_path as
+    JSON: the number of tests run, (test, short summary) pairs for
+    failures and errors, the skipped count and the duration of each test.
+    """
+    _warmup()
+    runner = unittest.TextTestRunner(
+        stream=sys.stderr,
+        verbosity=2,
+        buffer=True,
+        resultclass=ProgressTestResult
+    )
+    result = runner.run(_LOADER.loadTestsFromNames(test_ids))
+    with open(result_path, 'w') as f:
+        json.dump({
+            'tests_run': result.testsRun,
+            'failures': [(str(test), _short_failure(tb)) for test, tb in result.failures],
+            'errors': [(str(test), _short_error(tb)) for test, tb in result.errors],
+            'skipped': len(result.skipped),
+            'durations': result.durations,
+        }, f)
+    return 0 if result.wasSuccessful() else 1
+
+
+def _run_shard_subproc(test_ids):
+    """Run a shard of tests in a fresh interpreter.
+    
+    Each shard is a separate process, so all memory held by its tests is
+    returned to the OS when it exits; output of passing tests is buffered
+    out of the report.
+    
+    Returns:
+        Tuple of (tests run, failures, errors, skipped count, durations),
+        where failures and errors are lists of (test description, short
+        summary) pairs and durations maps test ids to seconds.
+    """
+    env = dict(os.environ)
+    env.setdefault('OMP_NUM_THREADS', '1')  # see _warmup
+    fd, result_path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--shard', result_path, *test_ids],
+            capture_output=True, text=True, timeout=SHARD_TIMEOUT, env=env
+        )
+        shard = _read_durations(result_path)
+    finally:
+        os.remove(result_path)
+    if 'tests_run' not in shard:
+        # The interpreter died before the shard could write its result
+        tail = (completed.stderr or completed.stdout)[-2000:]
+        return 0, [], [(f"shard of {len(test_ids)} tests", tail)], 0, {}
+    return (shard['tests_run'], [tuple(failure) for failure in shard['failures']],
+            [tuple(error) for error in shard['errors']], shard['skipped'], shard['durations'])
+
+
+def _read_durations(path):
+    """Load a JSON object such as {test id: seconds}; missing or corrupt files read as empty."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_durations(durations):
+    """Merge new test durations into DURATIONS_FILE."""
+    stored = _read_durations(DURATIONS_FILE)
+    stored.update(durations)
+    try:
+        with open(DURATIONS_FILE, 'w') as f:
+            json.dump(stored, f, indent=0, sort_keys=True)
+    except OSError as e:
+        print(f"⚠️  Could not save test durations: {e}")
+
+
+def _balance_shards(test_ids, workers, durations):
+    """Split tests into shards of roughly equal total duration.
+    
+    Tests with a recorded duration are assigned longest first, each to the
+    shard with the least total time so far (LPT scheduling). Tests without
+    one (new tests, or the first run) are then dealt out round-robin.
+    """
+    known = sorted((test_id for test_id in test_ids if test_id in durations),
+                   key=durations.get, reverse=True)
+    shards = [[] for _ in range(workers)]
+    heap = [(0.0, index) for index in range(workers)]
+    for test_id in known:
+        total, index = heapq.heappop(heap)
+        shards[index].append(test_id)
+        heapq.heappush(heap, (total + durations[test_id], index))
+    unknown = [test_id for test_id in test_ids if test_id not in durations]
+    for position, test_id in enumerate(unknown):
+        shards[position % workers].append(test_id)
+    return shards
+
+
+def _discover_cached(start_dir='tests'):
+    """Return the ids of all tests under start_dir, or None on discovery errors.
+    
+    Discovery imports every test module (and with them torch and ursina),
+    which the parent of the shard processes does not otherwise need. The
+    ids are cached in TEST_IDS_CACHE_FILE, keyed on the number of test
+    files and their newest modification time, and reused while neither
+    changes.
+    """
+    paths = glob.glob(os.path.join(start_dir, '**', '*.py'), recursive=True)
+    key = [len(paths), max((os.stat(path).st_mtime_ns for path in paths), default=0)]
+    try:
+        with open(TEST_IDS_CACHE_FILE) as f:
+            cached = json.load(f)
+        if cached['key'] == key:
+            return cached['ids']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    
+    # Discover from the project root so test ids (tests.test_x.Case.test_y)
+    # can be loaded by name from there in shard processes
+    suite = _LOADER.discover(start_dir, pattern='test_*.py', top_level_dir='.')
+    if _LOADER.errors:
+        # Unimportable test modules cannot be reloaded by name
+        return None
+    test_ids = _flatten_ids(suite)
+    try:
+        with open(TEST_IDS_CACHE_FILE, 'w') as f:
+            json.dump({'key': key, 'ids': test_ids}, f)
+    except OSError as e:
+        print(f"⚠️  Could not cache test ids: {e}")
+    return test_ids
+
+
+def run_sharded(test_ids, workers):
+    """Run the given tests split into shards, each in its own interpreter."""
+    shards = _balance_shards(test_ids, workers, _read_durations(DURATIONS_FILE))
+    shards = [shard for shard in shards if shard]
+    result = ShardedTestResult()
+    
+    # Threads are enough to drive the shards: the work happens in the
+    # subprocesses
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        futures = {executor.submit(_run_shard_subproc, shard): index for index, shard in enumerate(shards)}
+        for future in as_completed(futures):
+            shard_result = future.result()
+            result.add_shard(*shard_result)
+            print(f"✓ Shard {futures[future] + 1}/{len(shards)}: {shard_result[0]} tests")
+    return result
+
+
+def _terminate_workers():
+    """Kill all worker processes started by this process."""
+    for child in multiprocessing.active_children():
+        child.terminate()
+
+
+def _run_single(test_name):
+    """Run one test (or test case/module) by name in a worker process."""
+    suite = _LOADER.loadTestsFromName(test_name)
+    runner = ProgressTestRunner(
+        verbosity=2,
+        stream=sys.stdout,
+        buffer=True,
+        timeout=None  # enforced by the parent process
+    )
+    return runner.run(suite).wasSuccessful()
 
 
 def run_all_tests():
     """Run all tests and return results."""
+    # Shard across processes when there are spare cores. Discovery errors
+    # (unimportable test modules) cannot be reloaded by name, so those runs
+    # stay in-process where they are reported as usual
+    workers = max(1, (os.cpu_count() or 1) - 2)
+    test_ids = _discover_cached() if workers > 1 else None
+    if test_ids is not None:
+        print(f"Running tests in {workers} shard processes...")
+        start_time = time.monotonic()
+        try:
+            result = run_sharded(test_ids, workers)
+        except subprocess.TimeoutExpired:
+            print(f"\n⏰ TIMEOUT: A test shard did not finish within {SHARD_TIMEOUT} seconds")
+            result = None
+        except KeyboardInterrupt:
+            print("\n⏹️  Test execution interrupted by user")
+            result = None
+        duration = time.monotonic() - start_time
+        if result is not None:
+            _save_durations(result.durations)
+        return result, duration
+    
+    _warmup()
+    
     # Discover and run all tests
-    loader = unittest.TestLoader()
-    start_dir = 'tests'
-    suite = loader.discover(start_dir, pattern='test_*.py')
+    _LOADER.errors.clear()
+    suite = _LOADER.discover('tests', pattern='test_*.py', top_level_dir='.')
     
     # Create a test runner with progress tracking and timeout
     runner = ProgressTestRunner(
         verbosity=1,  # Reduced verbosity to show progress better
         stream=sys.stdout,
-        buffer=False,
+        buffer=True,
         timeout=30  # 30 second timeout per test
     )
     
     # Run tests and capture results
-    start_time = time.time()
+    start_time = time.monotonic()
     try:
         result = runner.run(suite)
-    except TimeoutError as e:
-        print(f"\n⏰ TIMEOUT: {e}")
-        result = None
     except KeyboardInterrupt:
         print("\n⏹️  Test execution interrupted by user")
         result = None
-    end_time = time.time()
+    end_time = time.monotonic()
+    if result is not None:
+        _save_durations(result.durations)
     
     return result, end_time - start_time
 
 
+def _short_failure(traceback):
+    """Return the assertion message of a failure traceback."""
+    return traceback.rpartition('AssertionError:')[2].strip() or traceback
+
+
+def _short_error(traceback):
+    """Return the innermost traceback of an error."""
+    return traceback.rpartition('Traceback (most recent call last):')[2].strip() or traceback
+
+
 def print_test_summary(result, duration):
     """Print a comprehensive test summary."""
     print("\n" + "="*80)
@@ -123,7 +413,9 @@ def print_test_summary(result, duration):
     total_tests = result.testsRun
     failed_tests = len(result.failures)
     error_tests = len(result.errors)
-    skipped_tests = len(result.skipped) if hasattr(result, 'skipped') else 0
+    skipped_tests = getattr(result, 'skipped_count', None)
+    if skipped_tests is None:
+        skipped_tests = len(result.skipped) if hasattr(result, 'skipped') else 0
     passed_tests = total_tests - failed_tests - error_tests - skipped_tests
     
     print(f"Total Tests: {total_tests}")
@@ -140,7 +432,7 @@ def print_test_summary(result, duration):
         print("-" * 40)
         for test, traceback in result.failures:
             print(f"❌ {test}")
-            print(f"   {traceback.split('AssertionError:')[-1].strip()}")
+            print(f"   {_short_failure(traceback)}")
             print()
     
     # Print error tests
@@ -149,7 +441,7 @@ def print_test_summary(result, duration):
         print("-" * 40)
         for test, traceback in result.errors:
             print(f"💥 {test}")
-            print(f"   {traceback.split('Traceback (most recent call last):')[-1].strip()}")
+            print(f"   {_short_error(traceback)}")
             print()
     
     # Overall result
@@ -161,66 +453,96 @@ def print_test_summary(result, duration):
     print("="*80)
 
 
+# File names counted as test modules by print_test_coverage
+_TEST_FILE = re.compile(r'test_.*\.py').fullmatch
+
+
+@functools.lru_cache(maxsize=8)
+def _list_py_files(root, mtime_ns):
+    """Return the paths of all .py files below root, sorted.
+    
+    Uses os.scandir, whose entries carry the file type, so no per-file
+    stat calls are needed. __pycache__ and hidden directories are not
+    entered. mtime_ns only serves as part of the cache key, so a changed
+    root directory is rescanned.
+    """
+    files = []
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith(('__', '.')):
+                        stack.append(entry.path)
+                elif entry.name.endswith('.py'):
+                    files.append(entry.path)
+    return tuple(sorted(files))
+
+
 def print_test_coverage():
     """Print test coverage information."""
     print("\nTEST COVERAGE")
     print("-" * 40)
     
     # List all test files
-    test_files = []
-    for root, dirs, files in os.walk('tests'):
-        for file in files:
-            if file.startswith('test_') and file.endswith('.py'):
-                test_files.append(os.path.join(root, file))
+    test_files = [
+        path for path in _list_py_files('tests', os.stat('tests').st_mtime_ns)
+        if _TEST_FILE(os.path.basename(path))
+    ]
     
     print(f"Test Files: {len(test_files)}")
-    for test_file in sorted(test_files):
+    for test_file in test_files:
         print(f"  ✓ {test_file}")
     
     # List all source files
-    source_files = []
-    for root, dirs, files in os.walk('vbe_3d'):
-        for file in files:
-            if file.endswith('.py') and not file.startswith('__'):
-                source_files.append(os.path.join(root, file))
+    source_files = [
+        path for path in _list_py_files('vbe_3d', os.stat('vbe_3d').st_mtime_ns)
+        if not os.path.basename(path).startswith('__')
+    ]
     
     print(f"\nSource Files: {len(source_files)}")
-    for source_file in sorted(source_files):
+    for source_file in source_files:
         print(f"  📄 {source_file}")
 
 
 def run_specific_test(test_name, timeout=60):
-    """Run a specific test with extended timeout."""
+    """Run a specific test with extended timeout.
+    
+    The test runs in a worker process so that it can be killed cleanly when
+    it exceeds the timeout.
+    """
     print(f"\n🎯 Running specific test: {test_name}")
     print("=" * 50)
     
-    loader = unittest.TestLoader()
-    suite = loader.loadTestsFromName(test_name)
-    
-    runner = ProgressTestRunner(
-        verbosity=2,
-        stream=sys.stdout,
-        buffer=False,
-        timeout=timeout
-    )
-    
-    start_time = time.time()
+    context = multiprocessing.get_context('spawn')
+    executor = ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=_warmup)
+    start_time = time.monotonic()
     try:
-        result = runner.run(suite)
-        end_time = time.time()
+        success = executor.submit(_run_single, test_name).result(timeout=timeout)
+        end_time = time.monotonic()
         
         print(f"\n⏱️  Test duration: {end_time - start_time:.2f} seconds")
-        return result.wasSuccessful()
-    except TimeoutError as e:
-        print(f"\n⏰ TIMEOUT: {e}")
+        return success
+    except TimeoutError:
+        _terminate_workers()
+        print(f"\n⏰ TIMEOUT: Test {test_name} timed out after {timeout} seconds")
         return False
     except KeyboardInterrupt:
+        _terminate_workers()
         print("\n⏹️  Test interrupted by user")
         return False
+    finally:
+        executor.shutdown(wait=False)
 
 
 def main():
     """Main test runner function."""
+    if sys.argv[1:2] == ['--shard']:
+        if len(sys.argv) < 3:
+            print("Usage: run_tests.py --shard RESULT_FILE [TEST_ID ...]", file=sys.stderr)
+            sys.exit(2)
+        sys.exit(_run_shard(sys.argv[2], sys.argv[3:]))
+    
     print("Virtual Bot Environment 3D - Test Suite")
     print("=" * 50)
     
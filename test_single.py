@@ -6,49 +6,59 @@ Simple test runner for a single test with timeout handling.
 import unittest
 import sys
 import time
-import threading
-import signal
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
 
+# Shared loader; no test depends on method order, so skip sorting them
+_LOADER = unittest.TestLoader()
+_LOADER.sortTestMethodsUsing = None
 
-class TimeoutException(Exception):
-    pass
 
+def _run_test(test_name):
+    """Load and run a test in a worker process.
+    
+    Returns:
+        Tuple of (successful, failures, errors), where failures and errors are
+        lists of (test description, traceback) string pairs.
+    """
+    suite = _LOADER.loadTestsFromName(test_name)
+    result = unittest.TestResult()
+    suite.run(result)
+    return (
+        result.wasSuccessful(),
+        [(str(test), traceback) for test, traceback in result.failures],
+        [(str(test), traceback) for test, traceback in result.errors],
+    )
 
-def timeout_handler(signum, frame):
-    raise TimeoutException("Test timed out")
+
+def _terminate_workers():
+    """Kill all worker processes started by this process."""
+    for child in multiprocessing.active_children():
+        child.terminate()
 
 
 def run_test_with_timeout(test_name, timeout=10):
-    """Run a single test with timeout."""
+    """Run a single test with timeout.
+    
+    The test runs in a worker process, which is killed if it does not finish
+    within the timeout.
+    """
     print(f"🎯 Running test: {test_name}")
     print(f"⏱️  Timeout: {timeout} seconds")
     print("=" * 50)
     
-    # Load the test
-    loader = unittest.TestLoader()
-    try:
-        suite = loader.loadTestsFromName(test_name)
-    except Exception as e:
-        print(f"❌ Error loading test: {e}")
-        return False
-    
-    # Create a result object
-    result = unittest.TestResult()
-    
-    # Set up timeout (Unix-like systems)
-    if hasattr(signal, 'SIGALRM'):
-        signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(timeout)
-    
+    context = multiprocessing.get_context('spawn')
+    executor = ProcessPoolExecutor(max_workers=1, mp_context=context)
     start_time = time.time()
     
     try:
         # Run the test
-        suite.run(result)
-        
-        # Cancel alarm
-        if hasattr(signal, 'SIGALRM'):
-            signal.alarm(0)
+        future = executor.submit(_run_test, test_name)
+        try:
+            successful, failures, errors = future.result(timeout=timeout)
+        except (ImportError, AttributeError, ValueError) as e:
+            print(f"❌ Error loading test: {e}")
+            return False
         
         end_time = time.time()
         duration = end_time - start_time
@@ -56,35 +66,39 @@ def run_test_with_timeout(test_name, timeout=10):
         print(f"\n⏱️  Test duration: {duration:.2f} seconds")
         
         # Print results
-        if result.wasSuccessful():
+        if successful:
             print("✅ Test PASSED!")
             return True
         else:
             print("❌ Test FAILED!")
             
-            if result.failures:
+            if failures:
                 print("\nFailures:")
-                for test, traceback in result.failures:
+                for test, traceback in failures:
                     print(f"  ❌ {test}")
                     print(f"     {traceback.split('AssertionError:')[-1].strip()}")
             
-            if result.errors:
+            if errors:
                 print("\nErrors:")
-                for test, traceback in result.errors:
+                for test, traceback in errors:
                     print(f"  💥 {test}")
                     print(f"     {traceback.split('Traceback (most recent call last):')[-1].strip()}")
             
             return False
             
-    except TimeoutException:
+    except TimeoutError:
+        _terminate_workers()
         print(f"\n⏰ Test timed out after {timeout} seconds!")
         return False
     except KeyboardInterrupt:
+        _terminate_workers()
         print("\n⏹️  Test interrupted by user!")
         return False
     except Exception as e:
         print(f"\n💥 Unexpected error: {e}")
         return False
+    finally:
+        executor.shutdown(wait=False)
 
 
 def main():
@@ -102,4 +116,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
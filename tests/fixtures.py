@@ -0,0 +1,49 @@
+"""Shared test fixtures.
+
+Each template is built on first use and cached for the rest of the test
+process, like a session-scoped fixture. Tests that mutate a template must
+work on a copy of it.
+"""
+
+import functools
+from unittest.mock import Mock
+from vbe_3d.core.robot import Robot
+from vbe_3d.brain.rule_based import RuleBasedBrain
+
+
+ROBOT_POSITION = (1.0, 2.0, 3.0)
+ROBOT_COLOR = (0.5, 0.5, 0.5)
+
+
+def make_robot():
+    """Build a new robot with the standard fixture parameters."""
+    return Robot(
+        position=ROBOT_POSITION,
+        color=ROBOT_COLOR,
+        brain=RuleBasedBrain(),
+        max_energy=100.0,
+        movement_cost=1.0,
+        reproduction_threshold=20.0
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def robot_template():
+    """Shared robot built by make_robot()."""
+    return make_robot()
+
+
+@functools.lru_cache(maxsize=None)
+def other_robot_template():
+    """Shared counterparty robot at the origin."""
+    return Robot(position=(0, 0, 0))
+
+
+@functools.lru_cache(maxsize=None)
+def world_mock():
+    """Shared world mock with no elements and an empty spatial index."""
+    world = Mock()
+    world.static_elements = []
+    world.robots = []
+    world._get_nearby_objects = Mock(return_value=[])
+    return world
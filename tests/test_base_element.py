@@ -1,5 +1,6 @@
 """Unit tests for the BaseElement class."""
 
+import copy
 import unittest
 from unittest.mock import Mock
 from vbe_3d.core.base_element import BaseElement
@@ -8,11 +9,17 @@ from vbe_3d.core.base_element import BaseElement
 class TestBaseElement(unittest.TestCase):
     """Test cases for the BaseElement class."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build the element once; setUp hands each test a shallow copy."""
+        cls.position = (1.0, 2.0, 3.0)
+        cls.color = (0.5, 0.5, 0.5)
+        cls._proto = BaseElement(cls.position, cls.color)
+
     def setUp(self):
         """Set up test fixtures."""
-        self.position = (1.0, 2.0, 3.0)
-        self.color = (0.5, 0.5, 0.5)
-        self.element = BaseElement(self.position, self.color)
+        # A copy, since test_world_assignment rebinds element.world
+        self.element = copy.copy(self._proto)
 
     def test_init(self):
         """Test BaseElement initialization."""
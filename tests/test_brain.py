@@ -1,13 +1,16 @@
 """Unit tests for the brain modules."""
 
+import copy
+import random
+import subprocess
+import sys
 import unittest
 from unittest.mock import Mock, patch
-import torch
 import numpy as np
 from vbe_3d.brain.base_brain import RobotBrain
 from vbe_3d.brain.rule_based import RuleBasedBrain
-from vbe_3d.brain.rl_brain import RLBrain
-from vbe_3d.brain.factory import brain_from_export
+from vbe_3d.brain import factory
+from vbe_3d.brain.factory import brain_from_export, register_brain
 
 
 class TestRobotBrain(unittest.TestCase):
@@ -38,6 +41,19 @@ class TestRobotBrain(unittest.TestCase):
         
         self.assertEqual(export_data["type"], "RuleBasedBrain")
 
+    def test_decide_actions_for_asks_each_brain(self):
+        """Test the default batch decision calls decide_action per brain."""
+        class CountingBrain(RobotBrain):
+            def decide_action(self, observation):
+                return int(observation[0])
+        
+        observations = np.array([[3.0] + [0.0] * 8, [5.0] + [0.0] * 8])
+        
+        actions = CountingBrain.decide_actions_for([CountingBrain(), CountingBrain()], observations)
+        
+        self.assertEqual(actions.dtype, np.int64)
+        self.assertEqual(actions.tolist(), [3, 5])
+
 
 class TestRuleBasedBrain(unittest.TestCase):
     """Test cases for the RuleBasedBrain class."""
@@ -102,6 +118,18 @@ class TestRuleBasedBrain(unittest.TestCase):
         # Should be random choice from [0,1,2,3,4] (no vertical movement)
         self.assertIn(action, [0, 1, 2, 3, 4])
 
+    def test_decide_action_random_walk_follows_random_seed(self):
+        """Test random.seed makes the random walk reproducible."""
+        self.robot.energy = 50.0
+        observation = [0.0] * 9
+        
+        runs = []
+        for _ in range(2):
+            random.seed(1)
+            runs.append([self.brain.decide_action(observation) for _ in range(10)])
+        
+        self.assertEqual(runs[0], runs[1])
+
     def test_decide_action_low_energy(self):
         """Test decision making when energy is low."""
         self.robot.energy = 5.0  # Low energy
@@ -112,6 +140,57 @@ class TestRuleBasedBrain(unittest.TestCase):
         
         self.assertEqual(action, 0)  # Should do nothing to conserve energy
 
+    def test_decide_actions_batch(self):
+        """Test batched decisions match the single-robot rules."""
+        observations = np.array([
+            [5.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0],
+            [-5.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.0, 0.0, 5.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.0, 0.0, -5.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.0, 5.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.0, -5.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.05, 0.0, 0.0],
+        ])
+        energies = np.array([50.0, 50.0, 50.0, 50.0, 50.0, 50.0, 5.0])
+        
+        actions = RuleBasedBrain.decide_actions_batch(observations, energies)
+        
+        self.assertEqual(actions.tolist(), [1, 2, 3, 4, 5, 6, 0])
+
+    def test_decide_actions_for_uses_robot_energies(self):
+        """Test batch decisions for brains read their robots' energy."""
+        resting, robotless = RuleBasedBrain(), RuleBasedBrain()
+        resting.robot = Mock(energy=5.0)
+        observations = np.zeros((2, 9))
+        
+        with patch.object(RuleBasedBrain, 'decide_actions_batch', return_value=np.array([0, 1])) as batch:
+            actions = RuleBasedBrain.decide_actions_for([resting, robotless], observations)
+        
+        self.assertEqual(actions.tolist(), [0, 1])
+        self.assertEqual(batch.call_args[0][1].tolist(), [5.0, np.inf])
+
+    def test_decide_actions_batch_random_walk(self):
+        """Test batched decisions fall back to a random horizontal move."""
+        observations = np.zeros((20, 9))
+        energies = np.full(20, 50.0)
+        
+        actions = RuleBasedBrain.decide_actions_batch(observations, energies)
+        
+        self.assertEqual(actions.shape, (20,))
+        self.assertTrue(set(actions.tolist()) <= {0, 1, 2, 3, 4})
+
+    def test_decide_actions_batch_random_walk_follows_random_seed(self):
+        """Test random.seed makes batched random moves reproducible."""
+        observations = np.zeros((20, 9))
+        energies = np.full(20, 50.0)
+        
+        runs = []
+        for _ in range(2):
+            random.seed(3)
+            runs.append(RuleBasedBrain.decide_actions_batch(observations, energies).tolist())
+        
+        self.assertEqual(runs[0], runs[1])
+
     def test_export(self):
         """Test RuleBasedBrain export."""
         export_data = self.brain.export()
@@ -122,20 +201,39 @@ class TestRuleBasedBrain(unittest.TestCase):
 class TestRLBrain(unittest.TestCase):
     """Test cases for the RLBrain class."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build one brain for the class; setUp resets it between tests."""
+        # torch and RLBrain are imported here so rule-based-only test runs
+        # do not load them
+        import torch
+        from vbe_3d.brain.rl_brain import RLBrain
+        cls.torch = torch
+        cls.RLBrain = RLBrain
+        # The networks under test are tiny; extra intra-op threads only add overhead
+        torch.set_num_threads(1)
+        cls._template = RLBrain(observation_dim=9, action_dim=7)
+        cls._init_state = copy.deepcopy(cls._template.model.state_dict())
+        cls._max_memory_size = cls._template.max_memory_size
+
     def setUp(self):
         """Set up test fixtures."""
-        self.brain = RLBrain(observation_dim=9, action_dim=7)
+        self.brain = self._template
+        self.brain.model.load_state_dict(self._init_state)
+        self.brain.optimizer = self.torch.optim.Adam(self.brain.model.parameters(), lr=1e-3)
+        self.brain.memory.clear()
+        self.brain.max_memory_size = self._max_memory_size
         self.robot = Mock()
         self.brain.robot = self.robot
 
     def test_init(self):
         """Test RLBrain initialization."""
-        self.assertIsInstance(self.brain, RLBrain)
+        self.assertIsInstance(self.brain, self.RLBrain)
         self.assertIsInstance(self.brain, RobotBrain)
         self.assertEqual(self.brain.observation_dim, 9)
         self.assertEqual(self.brain.action_dim, 7)
-        self.assertIsInstance(self.brain.model, torch.nn.Module)
-        self.assertIsInstance(self.brain.optimizer, torch.optim.Adam)
+        self.assertIsInstance(self.brain.model, self.torch.nn.Module)
+        self.assertIsInstance(self.brain.optimizer, self.torch.optim.Adam)
         self.assertEqual(len(self.brain.memory), 0)
 
     def test_decide_action(self):
@@ -149,6 +247,120 @@ class TestRLBrain(unittest.TestCase):
         self.assertGreaterEqual(action, 0)
         self.assertLess(action, 7)
 
+    def test_decide_action_matches_network(self):
+        """Test the NumPy forward pass picks the network's own argmax."""
+        observations = np.random.default_rng(0).normal(size=(20, 9)).astype(np.float32)
+
+        def network_actions():
+            with self.torch.no_grad():
+                return self.brain.model(self.torch.from_numpy(observations)).argmax(dim=1).tolist()
+
+        self.assertEqual([self.brain.decide_action(o) for o in observations], network_actions())
+
+        # The NumPy views follow training updates and loaded weights
+        for _ in range(32):
+            self.brain.learn(observations[0].tolist(), 1, 1.0, observations[1].tolist())
+        other = self.RLBrain()
+        self.brain.model.load_state_dict(other.model.state_dict())
+        self.assertEqual([self.brain.decide_action(o) for o in observations], network_actions())
+        self.assertEqual([self.brain.decide_action(o.tolist()) for o in observations],
+                         [other.decide_action(o) for o in observations])
+
+    def test_decide_action_other_layers_use_torch(self):
+        """Test models with layers other than Linear and ReLU run through torch."""
+        brain = self.RLBrain()
+        brain.model = self.torch.nn.Sequential(brain.model, self.torch.nn.Tanh())
+        observation = np.arange(9, dtype=np.float64)
+
+        with patch.object(brain.model, 'forward', wraps=brain.model.forward) as forward:
+            action = brain.decide_action(observation)
+
+        forward.assert_called_once()
+        self.assertIn(action, range(7))
+
+    def test_decide_action_low_precision(self):
+        """Test choosing actions with a bfloat16 copy of the network."""
+        brain = self.RLBrain(observation_dim=9, action_dim=7, inference_dtype=self.torch.bfloat16)
+        observation = np.linspace(-1, 1, 9, dtype=np.float32)
+        
+        action = brain.decide_action(observation)
+        
+        self.assertIn(action, range(7))
+        self.assertEqual(next(brain._infer_model.parameters()).dtype, self.torch.bfloat16)
+        self.assertEqual(next(brain.model.parameters()).dtype, self.torch.float32)
+        self.assertEqual(self.RLBrain.decide_actions_batch([brain, brain], np.stack([observation] * 2)).tolist(), [action] * 2)
+        
+        # A training update invalidates the low-precision copy
+        stale = brain._infer_model
+        for _ in range(32):
+            brain.learn(observation.tolist(), 0, 1.0, observation.tolist())
+        brain.decide_action(observation)
+        self.assertIsNot(brain._infer_model, stale)
+
+    def test_low_precision_follows_shared_training(self):
+        """Test training through one shared brain refreshes another's low-precision copy."""
+        self.RLBrain.clear_shared_models()
+        self.addCleanup(self.RLBrain.clear_shared_models)
+        trainer = self.RLBrain(shared=True)
+        follower = self.RLBrain(inference_dtype=self.torch.bfloat16, shared=True)
+        observation = np.linspace(-1, 1, 9, dtype=np.float32)
+        follower.decide_action(observation)
+        stale = follower._infer_model
+
+        follower.decide_action(observation)
+        self.assertIs(follower._infer_model, stale)
+        for _ in range(32):
+            trainer.learn(observation.tolist(), 0, 1.0, observation.tolist())
+        follower.decide_action(observation)
+
+        self.assertIsNot(follower._infer_model, stale)
+        self.assertTrue(self.torch.equal(follower._infer_model[0].weight,
+                                         trainer.model[0].weight.to(self.torch.bfloat16)))
+
+    def test_decide_actions_batch(self):
+        """Test that batched decisions match per-brain decide_action calls."""
+        brains = [self.brain] + [self.RLBrain(observation_dim=9, action_dim=7) for _ in range(3)]
+        observations = np.random.default_rng(0).standard_normal((4, 9)).astype(np.float32)
+        
+        actions = self.RLBrain.decide_actions_batch(brains, observations)
+        
+        self.assertEqual(actions.shape, (4,))
+        self.assertEqual(actions.tolist(), [b.decide_action(o) for b, o in zip(brains, observations)])
+
+    def test_decide_actions_batch_shared_model(self):
+        """Test batched decisions for brains sharing one network."""
+        observations = np.random.default_rng(1).standard_normal((3, 9)).astype(np.float32)
+        
+        actions = self.RLBrain.decide_actions_batch([self.brain] * 3, observations)
+        
+        self.assertEqual(actions.tolist(), [self.brain.decide_action(o) for o in observations])
+
+    def test_decide_actions_for_mixed_precision(self):
+        """Test brains of different inference dtypes are decided for in one call."""
+        brains = [self.RLBrain(), self.RLBrain(inference_dtype=self.torch.bfloat16), self.RLBrain()]
+        observations = np.random.default_rng(2).standard_normal((3, 9)).astype(np.float32)
+
+        actions = self.RLBrain.decide_actions_for(brains, observations)
+
+        self.assertEqual(actions.tolist(), [b.decide_action(o) for b, o in zip(brains, observations)])
+
+    def test_decide_actions_batch_wrong_dimension(self):
+        """Test batched decisions reject observations of the wrong width."""
+        with self.assertRaises(ValueError):
+            self.RLBrain.decide_actions_batch([self.brain], np.zeros((1, 3)))
+
+    def test_warmup(self):
+        """Test warmup runs a forward pass without touching the weights."""
+        weights = [p.clone() for p in self.brain.model.parameters()]
+        
+        with patch.object(self.brain.model, 'forward', wraps=self.brain.model.forward) as forward:
+            self.brain.warmup()
+        
+        forward.assert_called_once()
+        self.assertEqual(forward.call_args[0][0].shape, (1, 9))
+        for before, after in zip(weights, self.brain.model.parameters()):
+            self.assertTrue(self.torch.equal(before, after))
+
     def test_decide_action_wrong_dimension(self):
         """Test RLBrain with wrong observation dimension."""
         observation = [1.0, 2.0, 3.0]  # Wrong dimension
@@ -156,6 +368,55 @@ class TestRLBrain(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.brain.decide_action(observation)
 
+    def test_clone(self):
+        """Test cloning copies the weights but not memory or robot."""
+        self.brain.learn([1.0] * 9, 0, 1.0, [1.0] * 9)
+        
+        cloned = self.brain.clone()
+        
+        self.assertIsInstance(cloned, self.RLBrain)
+        self.assertIsNone(cloned.robot)
+        self.assertEqual(len(cloned.memory), 0)
+        self.assertIsNot(cloned.optimizer, self.brain.optimizer)
+        for (name, original), copied in zip(self.brain.model.state_dict().items(), cloned.model.state_dict().values()):
+            with self.subTest(name=name):
+                self.assertTrue(self.torch.equal(original, copied))
+                self.assertNotEqual(original.data_ptr(), copied.data_ptr())
+
+    def test_average(self):
+        """Test averaging takes the mean of both parents' weights."""
+        other = self.RLBrain()
+
+        child = self.RLBrain.average(self.brain, other)
+
+        first, second = self.brain.model.state_dict(), other.model.state_dict()
+        for name, averaged in child.model.state_dict().items():
+            with self.subTest(name=name):
+                self.assertTrue(self.torch.equal(averaged, (first[name] + second[name]) / 2.0))
+
+    def test_shared_model(self):
+        """Test shared brains use one network and optimizer per shape."""
+        self.RLBrain.clear_shared_models()
+        self.addCleanup(self.RLBrain.clear_shared_models)
+        first = self.RLBrain(shared=True)
+        second = self.RLBrain(shared=True)
+        other_shape = self.RLBrain(observation_dim=4, shared=True)
+        
+        self.assertIs(first.model, second.model)
+        self.assertIs(first.optimizer, second.optimizer)
+        self.assertIsNot(other_shape.model, first.model)
+        self.assertIsNot(self.brain.model, first.model)
+        self.assertEqual(len(self.RLBrain._MODEL_REGISTRY), 2)
+        
+        self.assertIs(first.clone().model, first.model)
+        diverged = first.clone(diverge=True)
+        self.assertFalse(diverged.shared)
+        self.assertIsNot(diverged.model, first.model)
+        self.assertTrue(self.torch.equal(diverged.model[0].weight, first.model[0].weight))
+        
+        self.RLBrain.clear_shared_models()
+        self.assertIsNot(self.RLBrain(shared=True).model, first.model)
+
     def test_learn(self):
         """Test RLBrain learning."""
         obs = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 0.5, 0.1, 0.2]
@@ -165,28 +426,39 @@ class TestRLBrain(unittest.TestCase):
         
         self.brain.learn(obs, action, reward, next_obs)
         
-        # Memory should contain the experience
+        # Memory should contain the experience, stored as float32
         self.assertEqual(len(self.brain.memory), 1)
-        self.assertEqual(self.brain.memory[0]["obs"], obs)
+        np.testing.assert_allclose(self.brain.memory[0]["obs"], obs, rtol=1e-6)
         self.assertEqual(self.brain.memory[0]["action"], action)
         self.assertEqual(self.brain.memory[0]["reward"], reward)
-        self.assertEqual(self.brain.memory[0]["next_obs"], next_obs)
+        np.testing.assert_allclose(self.brain.memory[0]["next_obs"], next_obs, rtol=1e-6)
 
     def test_learn_memory_limit(self):
         """Test RLBrain memory limit."""
-        # Add more experiences than memory limit
-        for i in range(self.brain.max_memory_size + 10):
-            obs = [float(i)] * 9
+        # Add more experiences than memory limit; row i of the batch is [i] * 9
+        count = self.brain.max_memory_size + 10
+        obs_batch = np.broadcast_to(np.arange(count, dtype=np.float64)[:, None], (count, 9))
+        for obs in obs_batch.tolist():
             self.brain.learn(obs, 0, 1.0, obs)
         
         # Memory should be limited
         self.assertEqual(len(self.brain.memory), self.brain.max_memory_size)
 
+    def test_max_memory_size_shrink(self):
+        """Test shrinking the memory keeps the newest experiences."""
+        for i in range(5):
+            self.brain.learn([float(i)] * 9, 0, 1.0, [float(i)] * 9)
+        
+        self.brain.max_memory_size = 2
+        
+        self.assertEqual(len(self.brain.memory), 2)
+        self.assertEqual([self.brain.memory[i]["obs"][0] for i in range(2)], [3.0, 4.0])
+
     def test_update_network(self):
         """Test neural network update."""
         # Add enough experiences to trigger learning
-        for i in range(32):
-            obs = [float(i)] * 9
+        obs_batch = np.broadcast_to(np.arange(32, dtype=np.float64)[:, None], (32, 9))
+        for obs in obs_batch.tolist():
             self.brain.learn(obs, 0, 1.0, obs)
         
         # Network should be updated
@@ -201,7 +473,7 @@ class TestRLBrain(unittest.TestCase):
         # At least some parameters should have changed
         param_changed = False
         for name in initial_params:
-            if not torch.equal(initial_params[name], current_params[name]):
+            if not self.torch.equal(initial_params[name], current_params[name]):
                 param_changed = True
                 break
         
@@ -214,24 +486,132 @@ class TestRLBrain(unittest.TestCase):
         self.assertEqual(params["type"], "RLBrain")
         self.assertEqual(params["observation_dim"], 9)
         self.assertEqual(params["action_dim"], 7)
-        self.assertIn("weights", params)
+        self.assertIsInstance(params["weights_b64"], str)
 
     def test_from_params(self):
         """Test RLBrain creation from parameters."""
         params = self.brain.export_params()
-        new_brain = RLBrain.from_params(params)
+        new_brain = self.RLBrain.from_params(params)
         
         self.assertEqual(new_brain.observation_dim, 9)
         self.assertEqual(new_brain.action_dim, 7)
         
         # Test that the networks produce similar outputs
-        test_input = torch.randn(1, 9)
-        with torch.no_grad():
+        test_input = self.torch.randn(1, 9)
+        with self.torch.inference_mode():
             output1 = self.brain.model(test_input)
             output2 = new_brain.model(test_input)
         
         # Outputs should be identical since weights are the same
-        self.assertTrue(torch.equal(output1, output2))
+        self.assertTrue(self.torch.equal(output1, output2))
+
+
+    def test_from_params_shared(self):
+        """Test loading shared brains never overwrites a live shared network."""
+        self.RLBrain.clear_shared_models()
+        self.addCleanup(self.RLBrain.clear_shared_models)
+        params = self.brain.export_params()
+        params["shared"] = True
+        
+        # With no shared network yet, the loaded weights become it
+        first = self.RLBrain.from_params(params)
+        second = self.RLBrain.from_params(params)
+        self.assertTrue(first.shared and second.shared)
+        self.assertIs(second.model, first.model)
+        self.assertIs(self.RLBrain(shared=True).model, first.model)
+        
+        # Different weights get a network of their own
+        live = copy.deepcopy(first.model.state_dict())
+        other = self.RLBrain().export_params()
+        other["shared"] = True
+        loaded = self.RLBrain.from_params(other)
+        
+        self.assertFalse(loaded.shared)
+        self.assertIsNot(loaded.model, first.model)
+        for name, value in first.model.state_dict().items():
+            with self.subTest(name=name):
+                self.assertTrue(self.torch.equal(value, live[name]))
+
+    def test_from_params_list_weights(self):
+        """Test loading parameters saved as per-tensor lists."""
+        state = self.brain.model.state_dict()
+        params = {
+            "type": "RLBrain",
+            "observation_dim": 9,
+            "action_dim": 7,
+            "weights": {k: v.tolist() for k, v in state.items()},
+        }
+        
+        new_brain = self.RLBrain.from_params(params)
+        
+        for k, v in new_brain.model.state_dict().items():
+            self.assertTrue(self.torch.equal(v, state[k]))
+
+    def test_from_params_wrong_size(self):
+        """Test loading weights that do not fit the network."""
+        params = self.brain.export_params()
+        params["action_dim"] = 5
+        
+        with self.assertRaises(ValueError):
+            self.RLBrain.from_params(params)
+
+
+class TestReplayBuffer(unittest.TestCase):
+    """Test cases for the ReplayBuffer class."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Imported here so rule-based-only test runs do not load torch
+        from vbe_3d.brain.replay_buffer import ReplayBuffer
+        cls.ReplayBuffer = ReplayBuffer
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.buffer = self.ReplayBuffer(capacity=100, observation_dim=3)
+        for i in range(5):
+            self.buffer.append([i] * 3, i % 7, float(i), [i + 1] * 3)
+
+    def test_append_and_index(self):
+        """Test experiences read back in insertion order."""
+        self.assertEqual(len(self.buffer), 5)
+        self.assertEqual(self.buffer[0], {'obs': [0.0] * 3, 'action': 0, 'reward': 0.0, 'next_obs': [1.0] * 3})
+        self.assertEqual(self.buffer[-1]["obs"], [4.0] * 3)
+        with self.assertRaises(IndexError):
+            self.buffer[5]
+
+    def test_wraps_around_when_full(self):
+        """Test a full buffer overwrites its oldest experiences in place."""
+        buffer = self.ReplayBuffer(capacity=4, observation_dim=3)
+        for i in range(7):
+            buffer.append([i] * 3, 0, float(i), [i] * 3)
+        
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual([buffer[i]["reward"] for i in range(4)], [3.0, 4.0, 5.0, 6.0])
+        # The tensors never grow past the capacity
+        self.assertEqual(len(buffer._actions), 4)
+
+    def test_sample(self):
+        """Test sampled batches have one row per distinct experience drawn."""
+        obs, actions, rewards, next_obs = self.buffer.sample(4)
+        
+        self.assertEqual(tuple(obs.shape), (4, 3))
+        self.assertEqual(tuple(next_obs.shape), (4, 3))
+        self.assertEqual(tuple(actions.shape), (4,))
+        # Each row is one stored experience, none drawn twice
+        np.testing.assert_array_equal(obs[:, 0].numpy(), rewards.numpy())
+        np.testing.assert_array_equal(next_obs[:, 0].numpy(), rewards.numpy() + 1)
+        self.assertEqual(len(set(rewards.tolist())), 4)
+        self.assertEqual(sorted(self.buffer.sample(5)[2].tolist()), [0.0, 1.0, 2.0, 3.0, 4.0])
+
+    def test_sample_more_than_stored(self):
+        """Test sampling more experiences than stored is an error."""
+        with self.assertRaises(ValueError):
+            self.buffer.sample(6)
+
+    def test_clear(self):
+        """Test clearing the buffer."""
+        self.buffer.clear()
+        self.assertEqual(len(self.buffer), 0)
 
 
 class TestBrainFactory(unittest.TestCase):
@@ -239,6 +619,7 @@ class TestBrainFactory(unittest.TestCase):
 
     def test_brain_from_export_rl(self):
         """Test factory with RLBrain export."""
+        from vbe_3d.brain.rl_brain import RLBrain
         brain = RLBrain()
         export_data = brain.export()
         
@@ -265,5 +646,44 @@ class TestBrainFactory(unittest.TestCase):
         self.assertIsInstance(created_brain, RuleBasedBrain)
 
 
+    def test_brain_from_export_rl_params(self):
+        """Test factory restores RLBrain weights from export_params output."""
+        from vbe_3d.brain.rl_brain import RLBrain
+        brain = RLBrain()
+        
+        created_brain = brain_from_export(brain.export_params())
+        
+        self.assertTrue(brain.model[0].weight.equal(created_brain.model[0].weight))
+
+    def test_register_brain(self):
+        """Test registering a constructor for a new brain type."""
+        custom = RuleBasedBrain()
+        with patch.dict(factory._BRAIN_REGISTRY):
+            register_brain("CustomBrain", lambda data: custom)
+            created_brain = brain_from_export({"type": "CustomBrain"})
+        
+        self.assertIs(created_brain, custom)
+        self.assertNotIn("CustomBrain", factory._BRAIN_REGISTRY)
+
+    def test_rule_based_use_does_not_import_torch(self):
+        """Test torch is only imported once an RLBrain is asked for."""
+        code = (
+            "import sys\n"
+            "from unittest.mock import Mock\n"
+            "import vbe_3d\n"
+            "from vbe_3d.brain.factory import brain_from_export\n"
+            "world = vbe_3d.World(Mock())\n"
+            "world.add_robots([vbe_3d.Robot(position=(i, 0, 0)) for i in range(3)])\n"
+            "brain_from_export({'type': 'RuleBasedBrain'})\n"
+            "world.step()\n"
+            "world.step_batched()\n"
+            "assert 'torch' not in sys.modules\n"
+            "vbe_3d.RLBrain\n"
+            "assert 'torch' in sys.modules\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        
+        self.assertEqual(result.returncode, 0, result.stderr)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
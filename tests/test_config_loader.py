@@ -0,0 +1,38 @@
+"""Unit tests for the example ConfigLoader."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples'))
+from config_loader import ConfigLoader  # noqa: E402
+
+
+class TestConfigLoader(unittest.TestCase):
+    """Test cases for the ConfigLoader class."""
+
+    def setUp(self):
+        """Write a small configuration file."""
+        handle, self.path = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(handle, 'w') as f:
+            json.dump({"robots": [{"position": [0, 0, 0]}], "static_elements": []}, f)
+        self.addCleanup(os.remove, self.path)
+        self.addCleanup(ConfigLoader.clear_cache)
+
+    def test_load_config_returns_independent_copies(self):
+        """Test that changing one loaded config does not change later loads."""
+        config = ConfigLoader.load_config(self.path)
+        config["robots"][0]["position"][0] = 99
+        config["robots"].append({})
+        config["extra"] = True
+
+        reloaded = ConfigLoader.load_config(self.path)
+
+        self.assertEqual(reloaded, {"robots": [{"position": [0, 0, 0]}], "static_elements": []})
+        self.assertEqual(next(ConfigLoader.load_config_fields(self.path)["robots"]), {"position": [0, 0, 0]})
+
+
+if __name__ == '__main__':
+    unittest.main()
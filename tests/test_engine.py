@@ -1,10 +1,16 @@
 """Unit tests for the engine module."""
 
 import unittest
-from unittest.mock import Mock, patch
+import asyncio
+import collections
+from unittest.mock import AsyncMock, Mock, patch
+import numpy as np
+from vbe_3d.engine import webgl_engine
 from vbe_3d.engine.base import BaseEngine
+from vbe_3d.engine.webgl_engine import WebGLEngine, POSITION_RECORD
 from vbe_3d.core.robot import Robot
 from vbe_3d.core.static_element import StaticElement
+from vbe_3d.core.world import World
 
 
 class MockEngine(BaseEngine):
@@ -12,16 +18,19 @@ class MockEngine(BaseEngine):
     
     def __init__(self):
         self.objects = []
-        self.updated_objects = []
+        self._ids = set()  # id() of every object in self.objects
+        self.updated_objects = collections.deque()
         self.removed_objects = []
         self.running = False
         
     def add_object(self, obj):
+        self._ids.add(id(obj))
         self.objects.append(obj)
         
     def remove_object(self, obj):
         self.removed_objects.append(obj)
-        if obj in self.objects:
+        if id(obj) in self._ids:
+            self._ids.discard(id(obj))
             self.objects.remove(obj)
             
     def update_object(self, obj):
@@ -55,7 +64,7 @@ class TestMockEngine(unittest.TestCase):
     def test_init(self):
         """Test MockEngine initialization."""
         self.assertEqual(self.engine.objects, [])
-        self.assertEqual(self.engine.updated_objects, [])
+        self.assertEqual(list(self.engine.updated_objects), [])
         self.assertEqual(self.engine.removed_objects, [])
         self.assertFalse(self.engine.running)
 
@@ -68,6 +77,12 @@ class TestMockEngine(unittest.TestCase):
         self.assertIn(self.static_element, self.engine.objects)
         self.assertEqual(len(self.engine.objects), 2)
 
+    def test_add_objects(self):
+        """Test the default bulk add falls back to add_object."""
+        self.engine.add_objects([self.robot, self.static_element])
+        
+        self.assertEqual(self.engine.objects, [self.robot, self.static_element])
+
     def test_remove_object(self):
         """Test removing objects from the engine."""
         self.engine.add_object(self.robot)
@@ -95,6 +110,12 @@ class TestMockEngine(unittest.TestCase):
         self.assertIn(self.robot, self.engine.updated_objects)
         self.assertEqual(len(self.engine.updated_objects), 1)
 
+    def test_update_objects(self):
+        """Test the default bulk update falls back to update_object."""
+        self.engine.update_objects([self.robot, self.static_element])
+        
+        self.assertEqual(list(self.engine.updated_objects), [self.robot, self.static_element])
+
     def test_run(self):
         """Test running the engine."""
         world = Mock()
@@ -175,5 +196,75 @@ class TestEngineIntegration(unittest.TestCase):
         self.assertEqual(len(self.engine.removed_objects), 2)
 
 
+class TestWebGLEngineSync(unittest.TestCase):
+    """Test cases for the messages a WebGLEngine queues per simulation tick."""
+
+    def setUp(self):
+        """Set up an engine without servers whose queued messages are recorded."""
+        with patch.object(webgl_engine, 'Path'), patch.object(webgl_engine, 'WebSocketServer'), \
+                patch.object(webgl_engine.threading, 'Thread'), \
+                patch.object(webgl_engine.asyncio, 'get_event_loop'), \
+                patch.object(WebGLEngine, '_process_messages', Mock()):
+            self.engine = WebGLEngine()
+        self.world = World(self.engine)
+        self.world.add_robots([Robot(position=(12.0 * i, 0, 0)) for i in range(100)])
+
+    def _queued(self):
+        """Messages queued since the last call."""
+        calls = self.engine.loop.call_soon_threadsafe
+        messages = [c.args[1] for c in calls.call_args_list]
+        calls.reset_mock()
+        return messages
+
+    def _assert_one_position_frame(self, step):
+        self._queued()
+        before = np.array([tuple(r.position) for r in self.world.robots], dtype=np.float32)
+
+        step()
+        self.engine.update_objects(self.engine.entity_list)
+
+        messages = self._queued()
+        self.assertEqual(len(messages), 1)
+        records = np.frombuffer(messages[0], dtype=POSITION_RECORD)
+        after = np.array([tuple(r.position) for r in self.world.robots], dtype=np.float32)
+        moved = np.flatnonzero((before != after).any(axis=1))
+        self.assertGreater(len(moved), 0)
+        slots = [self.engine.entities[self.world.robots[i]]['slot'] for i in moved]
+        self.assertEqual(records['slot'].tolist(), slots)
+        np.testing.assert_array_equal(np.stack([records['x'], records['y'], records['z']], axis=1), after[moved])
+
+    def test_step_then_update_objects(self):
+        """Test a step leaves the position sync to the per-tick update_objects."""
+        self._assert_one_position_frame(self.world.step)
+
+    def test_step_batched_then_update_objects(self):
+        """Test the demo loop's tick sends the moved robots in one binary frame."""
+        self._assert_one_position_frame(self.world.step_batched)
+
+        self.engine.update_objects(self.engine.entity_list)
+
+        self.assertEqual(self._queued(), [])
+
+    def test_messages_sent(self):
+        """Test the messages_sent future completes after the earlier messages went out."""
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        self.engine.loop = loop
+        self.engine.ws_server = Mock(clients=[Mock()], broadcast=AsyncMock())
+
+        async def tick():
+            sender = loop.create_task(self.engine._process_messages())
+            self.engine.send_positions_binary(np.array([0]), np.zeros((1, 3)))
+            sent = self.engine.messages_sent()
+            await asyncio.wait_for(sent, timeout=5)
+            sender.cancel()
+            await asyncio.gather(sender, return_exceptions=True)
+
+        loop.run_until_complete(tick())
+
+        self.engine.ws_server.broadcast.assert_awaited_once()
+        self.assertIsInstance(self.engine.ws_server.broadcast.await_args.args[0], bytes)
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -1,46 +1,68 @@
 """Unit tests for the Robot class."""
 
+import copy
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import patch
+import numpy as np
 from vbe_3d.core.robot import Robot, RobotState, ConnectionLevel, RobotStats
+from vbe_3d.core.static_element import ResourceType
 from vbe_3d.brain.rule_based import RuleBasedBrain
-from vbe_3d.brain.rl_brain import RLBrain
+from tests import fixtures
+
+
+def _fingerprint(robot):
+    """Tuple of the robot attributes that a serialization round trip keeps."""
+    return (
+        robot.id,
+        robot.position.x, robot.position.y, robot.position.z,
+        robot.color,
+        robot.energy,
+        robot.max_energy,
+        robot.state,
+    )
 
 
 class TestRobot(unittest.TestCase):
     """Test cases for the Robot class."""
 
+    # Expected position change of each action, as (action, (dx, dy, dz))
+    _ACTION_DELTAS = (
+        (0, (0, 0, 0)),
+        (1, (1, 0, 0)),
+        (2, (-1, 0, 0)),
+        (3, (0, 0, 1)),
+        (4, (0, 0, -1)),
+        (5, (0, 1, 0)),
+        (6, (0, -1, 0)),
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        """Pick up the shared templates."""
+        cls.position = fixtures.ROBOT_POSITION
+        cls.color = fixtures.ROBOT_COLOR
+        cls._other_template = fixtures.other_robot_template()
+        cls._world_template = fixtures.world_mock()
+
+    def _other_robot(self):
+        """Return a counterparty robot for connection and reproduction tests.
+        
+        A shallow copy of a shared template with fresh connections and
+        stats; the tests only rebind its other attributes.
+        """
+        other = copy.copy(self._other_template)
+        other.connections = {}
+        other.stats = RobotStats()
+        return other
+
     def setUp(self):
         """Set up test fixtures."""
-        self.position = (1.0, 2.0, 3.0)
-        self.color = (0.5, 0.5, 0.5)
-        self.brain = RuleBasedBrain()
-        self.robot = Robot(
-            position=self.position,
-            color=self.color,
-            brain=self.brain,
-            max_energy=100.0,
-            movement_cost=1.0,
-            reproduction_threshold=20.0
-        )
-
-    def test_init(self):
-        """Test Robot initialization."""
-        self.assertEqual(self.robot.position.x, 1.0)
-        self.assertEqual(self.robot.position.y, 2.0)
-        self.assertEqual(self.robot.position.z, 3.0)
-        self.assertEqual(self.robot.color, self.color)
-        self.assertEqual(self.robot.energy, 100.0)
-        self.assertEqual(self.robot.max_energy, 100.0)
-        self.assertEqual(self.robot.movement_cost, 1.0)
-        self.assertEqual(self.robot.reproduction_threshold, 20.0)
-        self.assertEqual(self.robot.state, RobotState.IDLE)
-        self.assertEqual(self.robot.connections, {})
-        self.assertEqual(self.robot.brain, self.brain)
-        self.assertEqual(self.robot.brain.robot, self.robot)
+        # Building a robot is much cheaper than deep-copying the template
+        self.robot = fixtures.make_robot()
+        self.brain = self.robot.brain
 
     def test_init_with_defaults(self):
-        """Test Robot initialization with default values."""
+        """Test Robot initialization with default values, including the brain."""
         robot = Robot()
         self.assertEqual(robot.position.x, 0.0)
         self.assertEqual(robot.position.y, 0.0)
@@ -51,12 +73,7 @@ class TestRobot(unittest.TestCase):
         self.assertEqual(robot.movement_cost, 1.0)
         self.assertEqual(robot.reproduction_threshold, 20.0)
         self.assertIsInstance(robot.brain, RuleBasedBrain)
-
-    def test_init_without_brain(self):
-        """Test Robot initialization without providing a brain."""
-        robot = Robot(position=(0, 0, 0))
-        self.assertIsInstance(robot.brain, RuleBasedBrain)
-        self.assertEqual(robot.brain.robot, robot)
+        self.assertIs(robot.brain.robot, robot)
 
     def test_act_no_op(self):
         """Test robot action with no-op."""
@@ -78,33 +95,25 @@ class TestRobot(unittest.TestCase):
         
         self.robot.act(1)  # Move +X
         
-        self.assertEqual(self.robot.position.x, initial_position.x + 1.0)
-        self.assertEqual(self.robot.position.y, initial_position.y)
-        self.assertEqual(self.robot.position.z, initial_position.z)
+        np.testing.assert_allclose(
+            (self.robot.position.x, self.robot.position.y, self.robot.position.z),
+            (initial_position.x + 1.0, initial_position.y, initial_position.z),
+            rtol=0, atol=1e-6
+        )
         self.assertEqual(self.robot.energy, initial_energy - self.robot.movement_cost)
         self.assertEqual(self.robot.state, RobotState.MOVING)
 
-    def test_act_all_directions(self):
-        """Test robot movement in all directions."""
-        # Test -X
-        self.robot.act(2)
-        self.assertEqual(self.robot.position.x, 0.0)
-        
-        # Test +Z
-        self.robot.act(3)
-        self.assertEqual(self.robot.position.z, 4.0)
-        
-        # Test -Z
-        self.robot.act(4)
-        self.assertEqual(self.robot.position.z, 3.0)
-        
-        # Test +Y
-        self.robot.act(5)
-        self.assertEqual(self.robot.position.y, 3.0)
-        
-        # Test -Y
-        self.robot.act(6)
-        self.assertEqual(self.robot.position.y, 2.0)
+    def test_act_table(self):
+        """Test the position change of every action."""
+        for action, delta in self._ACTION_DELTAS:
+            with self.subTest(action=action):
+                robot = fixtures.make_robot()
+                robot.act(action)
+                np.testing.assert_allclose(
+                    (robot.position.x, robot.position.y, robot.position.z),
+                    np.add(self.position, delta),
+                    rtol=0, atol=1e-6
+                )
 
     def test_act_death(self):
         """Test robot death when energy reaches zero."""
@@ -117,7 +126,7 @@ class TestRobot(unittest.TestCase):
 
     def test_connect(self):
         """Test robot connection formation."""
-        other_robot = Robot(position=(0, 0, 0))
+        other_robot = self._other_robot()
         
         self.robot.connect(other_robot)
         
@@ -127,7 +136,7 @@ class TestRobot(unittest.TestCase):
 
     def test_connect_strengthening(self):
         """Test connection strengthening."""
-        other_robot = Robot(position=(0, 0, 0))
+        other_robot = self._other_robot()
         
         # Initial connection
         self.robot.connect(other_robot)
@@ -139,7 +148,7 @@ class TestRobot(unittest.TestCase):
 
     def test_disconnect(self):
         """Test robot disconnection."""
-        other_robot = Robot(position=(0, 0, 0))
+        other_robot = self._other_robot()
         
         # Form connection
         self.robot.connect(other_robot)
@@ -156,7 +165,7 @@ class TestRobot(unittest.TestCase):
 
     def test_disconnect_permanent(self):
         """Test that permanent connections cannot be broken."""
-        other_robot = Robot(position=(0, 0, 0))
+        other_robot = self._other_robot()
         
         # Form permanent connection
         self.robot.connections[other_robot] = ConnectionLevel.PERMANENT.value
@@ -170,7 +179,7 @@ class TestRobot(unittest.TestCase):
 
     def test_reproduce_insufficient_energy(self):
         """Test reproduction with insufficient energy."""
-        other_robot = Robot(position=(0, 0, 0))
+        other_robot = self._other_robot()
         self.robot.energy = 10.0  # Below threshold
         
         child = self.robot.reproduce(other_robot)
@@ -179,7 +188,7 @@ class TestRobot(unittest.TestCase):
 
     def test_reproduce_success(self):
         """Test successful reproduction."""
-        other_robot = Robot(position=(0, 0, 0))
+        other_robot = self._other_robot()
         other_robot.color = (1.0, 0.0, 0.0)  # Red
         self.robot.energy = 50.0  # Above threshold
         other_robot.energy = 50.0  # Above threshold
@@ -190,41 +199,49 @@ class TestRobot(unittest.TestCase):
         self.assertIsInstance(child, Robot)
         self.assertEqual(child.position, self.robot.position)
         # Color should be averaged
-        expected_color = tuple((a + b) / 2.0 for a, b in zip(self.robot.color, other_robot.color))
-        self.assertEqual(child.color, expected_color)
+        expected_color = (np.asarray(self.robot.color) + np.asarray(other_robot.color)) / 2.0
+        np.testing.assert_allclose(child.color, expected_color, atol=1e-12)
         self.assertEqual(self.robot.state, RobotState.REPRODUCING)
         self.assertEqual(self.robot.stats.offspring_produced, 1)
 
-    def test_collect_resource(self):
-        """Test resource collection."""
-        initial_energy = self.robot.energy
-        resource_value = 25.0
-        
-        self.robot.collect_resource(resource_value)
-        
-        self.assertEqual(self.robot.energy, min(initial_energy + resource_value, self.robot.max_energy))
-        self.assertEqual(self.robot.state, RobotState.COLLECTING)
-        self.assertEqual(self.robot.stats.resources_collected, 1)
-
-    def test_collect_resource_max_energy(self):
-        """Test resource collection with energy cap."""
-        self.robot.energy = 95.0
-        resource_value = 25.0
+    def test_reproduce_shared_brains(self):
+        """Test parents on one shared network pass it to the child."""
+        from vbe_3d.brain.rl_brain import RLBrain
+        RLBrain.clear_shared_models()
+        self.addCleanup(RLBrain.clear_shared_models)
+        self.robot.brain = RLBrain(shared=True)
+        other_robot = self._other_robot()
+        other_robot.brain = RLBrain(shared=True)
+        self.robot.energy = other_robot.energy = 50.0
         
-        self.robot.collect_resource(resource_value)
+        child = self.robot.reproduce(other_robot)
         
-        self.assertEqual(self.robot.energy, self.robot.max_energy)  # Should be capped
-
-    @patch('vbe_3d.core.robot.math.dist')
-    def test_perceive(self, mock_dist):
+        self.assertTrue(child.brain.shared)
+        self.assertIs(child.brain.model, self.robot.brain.model)
+
+    def test_collect_resource_table(self):
+        """Test resource collection, including the energy cap."""
+        # (starting energy, resource value, expected energy) with max_energy 100
+        cases = [
+            (100.0, 25.0, 100.0),
+            (95.0, 25.0, 100.0),
+            (0.0, 25.0, 25.0),
+            (50.0, 0.0, 50.0),
+        ]
+        for start, value, expected in cases:
+            with self.subTest(start=start, value=value):
+                robot = fixtures.make_robot()
+                robot.energy = start
+                
+                robot.collect_resource(value)
+                
+                self.assertEqual(robot.energy, expected)
+                self.assertEqual(robot.state, RobotState.COLLECTING)
+                self.assertEqual(robot.stats.resources_collected, 1)
+
+    def test_perceive(self):
         """Test robot perception."""
-        mock_world = Mock()
-        mock_world.static_elements = []
-        mock_world.robots = []
-        mock_world._get_nearby_objects = Mock(return_value=[])  # Mock the spatial index method
-        
-        # Mock distance calculation
-        mock_dist.return_value = 5.0
+        mock_world = copy.copy(self._world_template)
         
         observation = self.robot.perceive(mock_world)
         
@@ -234,9 +251,55 @@ class TestRobot(unittest.TestCase):
         self.assertEqual(observation[6], 1.0)  # Normalized energy (100/100)
         self.assertEqual(observation[7], 0.0)  # Normalized connections (0/10)
 
+    def test_perceive_returns_ndarray_contract(self):
+        """Test that perceive returns a (9,) float32 array."""
+        observation = self.robot.perceive(copy.copy(self._world_template))
+        
+        self.assertIsInstance(observation, np.ndarray)
+        self.assertEqual(observation.dtype, np.float32)
+        self.assertEqual(observation.shape, (9,))
+
+    def test_perceive_out_buffer(self):
+        """Test that perceive fills a caller-provided buffer in place."""
+        out = np.full(9, np.nan, dtype=np.float32)
+        
+        observation = self.robot.perceive(copy.copy(self._world_template), out=out)
+        
+        self.assertIs(observation, out)
+        self.assertFalse(np.isnan(out).any())
+        self.assertEqual(out[6], 1.0)
+
+
+class TestRobotTemplate(unittest.TestCase):
+    """Test cases that only read a robot, run against the shared template."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Pick up the shared template and its serialization."""
+        cls.position = fixtures.ROBOT_POSITION
+        cls.color = fixtures.ROBOT_COLOR
+        cls.robot = fixtures.robot_template()
+        cls.brain = cls.robot.brain
+        cls._template_dict = cls.robot.to_dict()
+
+    def test_init(self):
+        """Test Robot initialization."""
+        self.assertEqual(self.robot.position.x, 1.0)
+        self.assertEqual(self.robot.position.y, 2.0)
+        self.assertEqual(self.robot.position.z, 3.0)
+        self.assertEqual(self.robot.color, self.color)
+        self.assertEqual(self.robot.energy, 100.0)
+        self.assertEqual(self.robot.max_energy, 100.0)
+        self.assertEqual(self.robot.movement_cost, 1.0)
+        self.assertEqual(self.robot.reproduction_threshold, 20.0)
+        self.assertEqual(self.robot.state, RobotState.IDLE)
+        self.assertEqual(self.robot.connections, {})
+        self.assertEqual(self.robot.brain, self.brain)
+        self.assertEqual(self.robot.brain.robot, self.robot)
+
     def test_to_dict(self):
         """Test robot serialization."""
-        data = self.robot.to_dict()
+        data = self._template_dict
         
         self.assertEqual(data["id"], self.robot.id)
         self.assertEqual(data["pos"], self.position)
@@ -252,39 +315,46 @@ class TestRobot(unittest.TestCase):
 
     def test_from_dict(self):
         """Test robot deserialization."""
-        original_data = self.robot.to_dict()
-        new_robot = Robot.from_dict(original_data)
-        
-        self.assertEqual(new_robot.id, self.robot.id)
-        self.assertEqual(new_robot.position, self.robot.position)
-        self.assertEqual(new_robot.color, self.robot.color)
-        self.assertEqual(new_robot.energy, self.robot.energy)
-        self.assertEqual(new_robot.max_energy, self.robot.max_energy)
-        self.assertEqual(new_robot.state, self.robot.state)
-
-
-class TestRobotState(unittest.TestCase):
-    """Test cases for the RobotState enum."""
-
-    def test_enum_values(self):
-        """Test that RobotState enum has expected values."""
-        self.assertEqual(RobotState.IDLE.value, 1)
-        self.assertEqual(RobotState.MOVING.value, 2)
-        self.assertEqual(RobotState.COLLECTING.value, 3)
-        self.assertEqual(RobotState.REPRODUCING.value, 4)
-        self.assertEqual(RobotState.DEAD.value, 5)
-
-
-class TestConnectionLevel(unittest.TestCase):
-    """Test cases for the ConnectionLevel enum."""
+        new_robot = Robot.from_dict(self._template_dict)  # does not modify its input
+        
+        self.assertEqual(_fingerprint(new_robot), _fingerprint(self.robot))
+
+    def test_from_dict_rejects_missing_keys(self):
+        """Test that deserialization fails up front on a missing required key."""
+        data = dict(self._template_dict)
+        del data["id"]
+        
+        with patch('vbe_3d.brain.factory.brain_from_export') as brain_from_export:
+            with self.assertRaises(KeyError):
+                Robot.from_dict(data)
+        brain_from_export.assert_not_called()
+
+
+class TestEnums(unittest.TestCase):
+    """Test cases for the RobotState, ConnectionLevel and ResourceType enums."""
+
+    # (enum class, member name, expected value)
+    ENUM_CASES = [
+        (RobotState, "IDLE", 1),
+        (RobotState, "MOVING", 2),
+        (RobotState, "COLLECTING", 3),
+        (RobotState, "REPRODUCING", 4),
+        (RobotState, "DEAD", 5),
+        (ConnectionLevel, "NONE", 0),
+        (ConnectionLevel, "WEAK", 1),
+        (ConnectionLevel, "MEDIUM", 2),
+        (ConnectionLevel, "STRONG", 3),
+        (ConnectionLevel, "PERMANENT", 4),
+        (ResourceType, "ENERGY", 1),
+        (ResourceType, "MATERIAL", 2),
+        (ResourceType, "SPECIAL", 3),
+    ]
 
     def test_enum_values(self):
-        """Test that ConnectionLevel enum has expected values."""
-        self.assertEqual(ConnectionLevel.NONE.value, 0)
-        self.assertEqual(ConnectionLevel.WEAK.value, 1)
-        self.assertEqual(ConnectionLevel.MEDIUM.value, 2)
-        self.assertEqual(ConnectionLevel.STRONG.value, 3)
-        self.assertEqual(ConnectionLevel.PERMANENT.value, 4)
+        """Test that the enums have the expected values."""
+        for enum_cls, name, value in self.ENUM_CASES:
+            with self.subTest(cls=enum_cls.__name__, name=name):
+                self.assertEqual(enum_cls[name].value, value)
 
 
 class TestRobotStats(unittest.TestCase):
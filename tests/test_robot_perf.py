@@ -0,0 +1,42 @@
+"""Performance regression tests for the Robot class.
+
+These time real work and depend on the machine, so they only run when
+VBE_PERF_TESTS=1 is set, e.g. in a dedicated CI stage.
+"""
+
+import os
+import time
+import unittest
+from vbe_3d.core.robot import Robot
+
+
+# Calls to Robot.act per timed run
+ACT_CALLS = 10_000
+
+# Budget for ACT_CALLS calls, in seconds. The pure-Python act() takes about
+# 1 us per call; tighten this if act() moves to a compiled path.
+ACT_BUDGET = 0.02
+
+
+@unittest.skipUnless(os.environ.get('VBE_PERF_TESTS') == '1', 'set VBE_PERF_TESTS=1 to run performance tests')
+class TestRobotPerf(unittest.TestCase):
+    """Timing budgets for the per-step robot methods."""
+
+    def test_act_perf(self):
+        """Test that act() stays within its per-call budget."""
+        robot = Robot(max_energy=1e12)  # stays alive for the whole run
+        
+        # Best of several runs, to filter out scheduler noise
+        best = float('inf')
+        for _ in range(5):
+            start = time.perf_counter()
+            for _ in range(ACT_CALLS // 2):
+                robot.act(1)
+                robot.act(2)
+            best = min(best, time.perf_counter() - start)
+        
+        self.assertLess(best, ACT_BUDGET, f"{ACT_CALLS} act() calls took {best * 1e3:.1f} ms")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+"""Unit tests for the SpatialHashGrid class."""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+from vbe_3d.core import spatial_grid
+from vbe_3d.core.spatial_grid import SpatialHashGrid, morton3
+
+
+class TestSpatialHashGrid(unittest.TestCase):
+    """Test cases for the SpatialHashGrid class."""
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        cls.points = rng.uniform(-30, 30, size=(500, 3))
+        cls.objects = [SimpleNamespace(position=tuple(p)) for p in cls.points]
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.grid = SpatialHashGrid(cell_size=2.0)
+        self.grid.rebuild(self.objects)
+
+    def _brute_force(self, center, radius):
+        d2 = ((self.points.astype(np.float32) - np.float32(center)) ** 2).sum(axis=1)
+        return np.flatnonzero(d2 <= radius * radius)
+
+    def test_empty(self):
+        """Test queries on an empty grid."""
+        grid = SpatialHashGrid()
+        self.assertEqual(len(grid), 0)
+        self.assertEqual(grid.query((0, 0, 0), 5.0), [])
+        grid.rebuild([])
+        self.assertEqual(grid.query((0, 0, 0), 5.0), [])
+
+    def test_query_matches_brute_force(self):
+        """Test that queries find exactly the objects within the radius."""
+        for center, radius in [((0, 0, 0), 1.0), ((3.5, -7.2, 10), 2.0), ((-29, 29, 0), 4.5), ((0, 0, 0), 10.0)]:
+            with self.subTest(center=center, radius=radius):
+                np.testing.assert_array_equal(self.grid.query_indices(center, radius), self._brute_force(center, radius))
+
+    def test_neighbors_search_radius(self):
+        """Test neighbors returns squared distances and honours the search radius."""
+        indices, dist_sq = self.grid.neighbors((2, 2, 2), 3.0, search_radius=5.0)
+        
+        np.testing.assert_array_equal(indices, self._brute_force((2, 2, 2), 3.0))
+        expected = ((self.points[indices].astype(np.float32) - np.float32(2)) ** 2).sum(axis=1)
+        np.testing.assert_allclose(dist_sq, expected, rtol=1e-5)
+
+    @unittest.skipIf(spatial_grid._neighbors is None, "numba is not installed")
+    def test_neighbors_compiled_matches_numpy(self):
+        """Test the numba neighbour scan against the NumPy fallback."""
+        for center, radius in [((0, 0, 0), 2.0), ((10, -5, 3), 3.0), ((0, 0, 0), 12.0)]:
+            with self.subTest(center=center, radius=radius):
+                compiled = self.grid.neighbors(center, radius, search_radius=radius + 1)
+                with patch.object(spatial_grid, '_neighbors', None):
+                    fallback = self.grid.neighbors(center, radius, search_radius=radius + 1)
+                np.testing.assert_array_equal(compiled[0], fallback[0])
+                np.testing.assert_allclose(compiled[1], fallback[1], rtol=1e-6)
+
+    def test_neighbors_results_survive_later_queries(self):
+        """Test results are not overwritten by the next query's scratch use."""
+        for count in (len(self.objects), 200):
+            grid = SpatialHashGrid(cell_size=2.0)
+            grid.rebuild(self.objects[:count])
+            with self.subTest(count=count):
+                indices, dist_sq = grid.neighbors((0, 0, 0), 10.0)
+                kept = indices.copy(), dist_sq.copy()
+                grid.neighbors((20, 20, 20), 10.0)
+                np.testing.assert_array_equal(indices, kept[0])
+                np.testing.assert_array_equal(dist_sq, kept[1])
+                np.testing.assert_array_equal(grid.neighbors((0, 0, 0), 10.0)[0], kept[0])
+
+    def _nearest_brute_force(self, point, radius, candidates, exclude):
+        in_range = set(self._brute_force(point, radius).tolist())
+        dist_sq = ((self.points.astype(np.float32).astype(np.float64) - np.float32(point)) ** 2).sum(axis=1)
+        best = -1
+        for i in range(len(self.points)):
+            if i in in_range and candidates[i] and i != exclude and (best < 0 or dist_sq[i] < dist_sq[best]):
+                best = i
+        return best
+
+    def test_nearest_matches_brute_force(self):
+        """Test the batched nearest query against a scan over every object."""
+        candidates = np.arange(len(self.points)) % 3 != 0
+        queries = self.points[:40]
+        exclude = np.arange(40)
+        for radius in (2.0, 5.0, 20.0):
+            with self.subTest(radius=radius):
+                nearest, dist_sq = self.grid.nearest(queries, radius, candidates, exclude)
+                expected = [self._nearest_brute_force(q, radius, candidates, i) for i, q in enumerate(queries)]
+                self.assertEqual(nearest.tolist(), expected)
+                self.assertTrue(np.all(np.isinf(dist_sq[nearest < 0])))
+                with patch.object(spatial_grid, '_nearest', None):
+                    fallback = self.grid.nearest(queries, radius, candidates, exclude)
+                np.testing.assert_array_equal(fallback[0], nearest)
+                np.testing.assert_array_equal(fallback[1], dist_sq)
+
+    def test_nearest_ties_go_to_lowest_index(self):
+        """Test equally near candidates resolve to the lowest index."""
+        grid = SpatialHashGrid()
+        grid.rebuild([SimpleNamespace(position=p) for p in [(2, 0, 0), (-1, 0, 0), (1, 0, 0), (0, 0, 0)]])
+
+        nearest, dist_sq = grid.nearest(np.zeros((1, 3)), 5.0, np.ones(4, dtype=bool), np.array([3]))
+
+        self.assertEqual(nearest.tolist(), [1])
+        self.assertEqual(dist_sq.tolist(), [1.0])
+
+    def test_nearest_by_kind_matches_nearest(self):
+        """Test one query over several kinds against a nearest query per kind."""
+        kinds = (np.arange(len(self.points)) % 4 - 1).astype(np.int8)
+        queries = self.points[:40]
+        exclude = np.arange(40)
+        for compiled in (True, False):
+            with self.subTest(compiled=compiled), \
+                    patch.object(spatial_grid, '_nearest', spatial_grid._nearest if compiled else None):
+                nearest, dist_sq = self.grid.nearest_by_kind(queries, 5.0, kinds, 3, exclude)
+                self.assertEqual(nearest.shape, (40, 3))
+                for k in range(3):
+                    expected = self.grid.nearest(queries, 5.0, kinds == k, exclude)
+                    np.testing.assert_array_equal(nearest[:, k], expected[0])
+                    np.testing.assert_array_equal(dist_sq[:, k], expected[1])
+
+    def test_query_returns_objects(self):
+        """Test that query maps indices back to the indexed objects."""
+        expected = [self.objects[i] for i in self._brute_force((1, 1, 1), 3.0)]
+        self.assertEqual(self.grid.query((1, 1, 1), 3.0), expected)
+
+    def test_rebuild_uses_new_positions(self):
+        """Test that moved objects are found at their new position after a rebuild."""
+        obj = SimpleNamespace(position=(0.0, 0.0, 0.0))
+        self.grid.rebuild([obj])
+        obj.position = (100.0, 0.0, 0.0)
+        self.assertEqual(self.grid.query((0, 0, 0), 1.0), [obj])
+        self.grid.rebuild([obj])
+        self.assertEqual(self.grid.query((0, 0, 0), 1.0), [])
+        self.assertEqual(self.grid.query((100, 0, 0), 1.0), [obj])
+
+    def test_rebuild_rebuckets_few_moved_objects(self):
+        """Test that a partial re-bucketing answers queries like a full rebuild."""
+        objects = [SimpleNamespace(position=tuple(p)) for p in self.points]
+        self.grid.rebuild(objects)
+        order = self.grid._order
+        for obj in objects[::50]:
+            obj.position = (obj.position[0] + 7.0, obj.position[1], obj.position[2] - 3.0)
+        
+        self.grid.rebuild(objects)
+        fresh = SpatialHashGrid(cell_size=2.0)
+        fresh.rebuild(objects)
+        
+        self.assertIsNot(self.grid._order, order)
+        np.testing.assert_array_equal(self.grid._counts, fresh._counts)
+        for obj in objects[::25]:
+            with self.subTest(position=obj.position):
+                np.testing.assert_array_equal(self.grid.query_indices(obj.position, 3.0),
+                                              fresh.query_indices(obj.position, 3.0))
+
+    def test_rebuild_keeps_buckets_when_nothing_changed_cell(self):
+        """Test that moves within a cell only update the positions."""
+        objects = [SimpleNamespace(position=(0.5, 0.5, 0.5)), SimpleNamespace(position=(4.5, 0.5, 0.5))]
+        self.grid.rebuild(objects)
+        order = self.grid._order
+        objects[0].position = (1.5, 0.5, 0.5)
+        
+        self.grid.rebuild(objects)
+        
+        self.assertIs(self.grid._order, order)
+        np.testing.assert_array_equal(self.grid.positions[0], [1.5, 0.5, 0.5])
+
+
+class TestMorton3(unittest.TestCase):
+    """Test cases for the morton3 function."""
+
+    def test_interleaves_bits(self):
+        """Test that x, y and z bits land in positions 3k, 3k + 1 and 3k + 2."""
+        bias = 1 << 20
+        cells = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1], [2, 0, 0]]) - bias
+        np.testing.assert_array_equal(morton3(cells), [1, 2, 4, 8])
+
+    def test_orders_negative_cells(self):
+        """Test that negative cells sort before positive ones on every axis."""
+        for axis in range(3):
+            with self.subTest(axis=axis):
+                cells = np.zeros((2, 3), dtype=np.int64)
+                cells[0, axis], cells[1, axis] = -1, 0
+                keys = morton3(cells)
+                self.assertLess(keys[0], keys[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
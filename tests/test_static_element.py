@@ -1,7 +1,6 @@
 """Unit tests for the StaticElement class."""
 
 import unittest
-from unittest.mock import Mock
 from vbe_3d.core.static_element import StaticElement, ResourceType, ResourceProperties
 
 
@@ -132,15 +131,28 @@ class TestStaticElement(unittest.TestCase):
         self.assertEqual(new_element.resource_value, self.element.resource_value)
         self.assertEqual(new_element.resource_type, self.element.resource_type)
 
-
-class TestResourceType(unittest.TestCase):
-    """Test cases for the ResourceType enum."""
-
-    def test_enum_values(self):
-        """Test that ResourceType enum has expected values."""
-        self.assertEqual(ResourceType.ENERGY.value, 1)
-        self.assertEqual(ResourceType.MATERIAL.value, 2)
-        self.assertEqual(ResourceType.SPECIAL.value, 3)
+    def test_from_config_dict(self):
+        """Test creation from a world configuration entry."""
+        config = {
+            "position": [5, 0, 0],
+            "color": [0.9, 0.6, 0.1],
+            "resource_value": 30.0,
+            "resource_type": "MATERIAL",
+            "max_uses": 3,
+            "is_obstacle": True
+        }
+        
+        element = StaticElement.from_config_dict(config)
+        
+        self.assertEqual(element.position.x, 5.0)
+        self.assertEqual(element.color, (0.9, 0.6, 0.1))
+        self.assertEqual(element.resource_value, 30.0)
+        self.assertEqual(element.resource_type, ResourceType.MATERIAL)
+        self.assertEqual(element.properties.max_uses, 3)
+        self.assertEqual(element.properties.decay_rate, 0.0)
+        self.assertIsNone(element.properties.respawn_time)
+        self.assertTrue(element.is_obstacle)
+        self.assertTrue(element.is_collectible)
 
 
 class TestResourceProperties(unittest.TestCase):
@@ -1,48 +1,40 @@
 """Unit tests for the utils module."""
 
 import unittest
-from vbe_3d.utils.geometry import add_vec
+import numpy as np
+from vbe_3d.utils.geometry import add_vec, add_vec_njit
 from vbe_3d.utils.id_manager import next_id
+from vbe_3d.utils.json_codec import dumps, loads
 
 
 class TestGeometry(unittest.TestCase):
     """Test cases for the geometry utility functions."""
 
-    def test_add_vec(self):
-        """Test vector addition."""
-        a = (1.0, 2.0, 3.0)
-        b = (4.0, 5.0, 6.0)
-        
-        result = add_vec(a, b)
-        
-        self.assertEqual(result, [5.0, 7.0, 9.0])
-
-    def test_add_vec_negative(self):
-        """Test vector addition with negative values."""
-        a = (1.0, -2.0, 3.0)
-        b = (-4.0, 5.0, -6.0)
-        
-        result = add_vec(a, b)
-        
-        self.assertEqual(result, [-3.0, 3.0, -3.0])
+    # (a, b) pairs: positive, mixed-sign, zero and fractional components
+    _ADD_VEC_CASES = np.array([
+        [(1.0, 2.0, 3.0), (4.0, 5.0, 6.0)],
+        [(1.0, -2.0, 3.0), (-4.0, 5.0, -6.0)],
+        [(0.0, 0.0, 0.0), (1.0, 2.0, 3.0)],
+        [(1.5, 2.7, 3.2), (4.1, 5.3, 6.8)],
+    ], dtype=np.float64)
 
-    def test_add_vec_zero(self):
-        """Test vector addition with zero vectors."""
-        a = (0.0, 0.0, 0.0)
-        b = (1.0, 2.0, 3.0)
-        
-        result = add_vec(a, b)
+    def test_add_vec_batch(self):
+        """Test vector addition against NumPy on a table of inputs."""
+        expected = self._ADD_VEC_CASES[:, 0] + self._ADD_VEC_CASES[:, 1]
         
-        self.assertEqual(result, [1.0, 2.0, 3.0])
+        for (a, b), exp in zip(self._ADD_VEC_CASES, expected):
+            with self.subTest(a=tuple(a), b=tuple(b)):
+                result = add_vec(tuple(a), tuple(b))
+                np.testing.assert_allclose(result, exp, rtol=0, atol=1e-9)
 
-    def test_add_vec_float(self):
-        """Test vector addition with float values."""
-        a = (1.5, 2.7, 3.2)
-        b = (4.1, 5.3, 6.8)
+    def test_add_vec_njit_parity(self):
+        """Test that the array variant matches add_vec on random inputs."""
+        rng = np.random.default_rng(0)
+        A = rng.standard_normal((1000, 3))
+        B = rng.standard_normal((1000, 3))
         
-        result = add_vec(a, b)
-        
-        self.assertEqual(result, [5.6, 8.0, 10.0])
+        for a, b in zip(A, B):
+            np.testing.assert_allclose(add_vec_njit(a, b), np.asarray(add_vec(tuple(a), tuple(b))))
 
 
 class TestIdManager(unittest.TestCase):
@@ -58,22 +50,36 @@ class TestIdManager(unittest.TestCase):
         self.assertEqual(id3, id2 + 1)
 
     def test_next_id_unique(self):
-        """Test that IDs are unique."""
-        ids = set()
-        for _ in range(100):
-            new_id = next_id()
-            self.assertNotIn(new_id, ids)
-            ids.add(new_id)
+        """Test that IDs are unique and non-negative."""
+        ids = np.fromiter((next_id() for _ in range(100)), dtype=np.int64, count=100)
+        
+        self.assertEqual(np.unique(ids).size, ids.size)
+        self.assertTrue((ids >= 0).all())
 
     def test_next_id_type(self):
         """Test that IDs are integers."""
         new_id = next_id()
         self.assertIsInstance(new_id, int)
 
-    def test_next_id_positive(self):
-        """Test that IDs are non-negative."""
-        new_id = next_id()
-        self.assertGreaterEqual(new_id, 0)
+
+class TestJsonCodec(unittest.TestCase):
+    """Test cases for the JSON codec helpers."""
+
+    def test_dumps_returns_str(self):
+        """Test that dumps produces text, not bytes."""
+        self.assertIsInstance(dumps({'type': 'update'}), str)
+
+    def test_round_trip(self):
+        """Test that tuples come back as lists after a round trip."""
+        message = {'id': 1, 'position': (1.0, 2.5, -3.0), 'color': [0.2, 0.8, 0.2]}
+        
+        result = loads(dumps(message))
+        
+        self.assertEqual(result, {'id': 1, 'position': [1.0, 2.5, -3.0], 'color': [0.2, 0.8, 0.2]})
+
+    def test_loads_bytes(self):
+        """Test that loads accepts bytes."""
+        self.assertEqual(loads(b'{"robots": []}'), {'robots': []})
 
 
 if __name__ == '__main__':
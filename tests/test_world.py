@@ -7,9 +7,21 @@ import json
 from unittest.mock import Mock, patch
 from vbe_3d.core.world import World, WorldStats, InteractionType, Interaction
 from vbe_3d.core.robot import Robot, RobotState
-from vbe_3d.core.static_element import StaticElement, ResourceType
+from vbe_3d.core.static_element import StaticElement
+from vbe_3d.brain.base_brain import RobotBrain
 from vbe_3d.brain.rule_based import RuleBasedBrain
-import math
+import numpy as np
+
+
+class _FixedActionBrain(RobotBrain):
+    """Brain that always picks the same action; cheaper to call than a Mock."""
+
+    def __init__(self, action: int):
+        super().__init__()
+        self.action = action
+
+    def decide_action(self, observation):
+        return self.action
 
 
 class TestWorld(unittest.TestCase):
@@ -30,7 +42,7 @@ class TestWorld(unittest.TestCase):
         self.assertIsInstance(self.world.stats, WorldStats)
         self.assertEqual(self.world.time_step, 0)
         self.assertEqual(self.world._interaction_cache, {})
-        self.assertEqual(self.world._spatial_index, {})
+        self.assertEqual(len(self.world._spatial_index), 0)
 
     def test_add_robot(self):
         """Test adding a robot to the world."""
@@ -41,6 +53,16 @@ class TestWorld(unittest.TestCase):
         self.mock_engine.add_object.assert_called_once_with(self.robot)
         self.assertEqual(self.world.stats.robots_created, 1)
 
+    def test_add_robots(self):
+        """Test adding several robots in one call."""
+        other = Robot(position=(3, 0, 0))
+        self.world.add_robots([self.robot, other])
+        
+        self.assertEqual(self.world.robots, [self.robot, other])
+        self.assertEqual(other.world, self.world)
+        self.mock_engine.add_objects.assert_called_once_with([self.robot, other])
+        self.assertEqual(self.world.stats.robots_created, 2)
+
     def test_remove_robot(self):
         """Test removing a robot from the world."""
         self.world.add_robot(self.robot)
@@ -65,6 +87,15 @@ class TestWorld(unittest.TestCase):
         self.assertEqual(self.static_element.world, self.world)
         self.mock_engine.add_object.assert_called_once_with(self.static_element)
 
+    def test_add_statics(self):
+        """Test adding several static elements in one call."""
+        other = StaticElement(position=(-5, 0, 0))
+        self.world.add_statics(iter([self.static_element, other]))
+        
+        self.assertEqual(self.world.static_elements, [self.static_element, other])
+        self.assertEqual(other.world, self.world)
+        self.mock_engine.add_objects.assert_called_once_with([self.static_element, other])
+
     def test_remove_static(self):
         """Test removing a static element from the world."""
         self.world.add_static(self.static_element)
@@ -86,14 +117,53 @@ class TestWorld(unittest.TestCase):
         
         self.world._update_spatial_index()
         
-        # Check that objects are indexed by their grid positions
-        robot_grid_pos = (int(self.robot.position.x), int(self.robot.position.y), int(self.robot.position.z))
-        static_grid_pos = (int(self.static_element.position.x), int(self.static_element.position.y), int(self.static_element.position.z))
+        # Check that objects are indexed with a snapshot of their positions
+        index = self.world._spatial_index
+        self.assertEqual(index.objects, [self.robot, self.static_element])
+        np.testing.assert_array_equal(index.positions, [[0, 0, 0], [5, 0, 0]])
+        self.assertEqual(index.positions.dtype, np.float32)
+
+    def test_update_spatial_index_reorder(self):
+        """Test that reordering sorts robots and statics by grid cell Z-order."""
+        far = Robot(position=(50, 50, 50))
+        near = Robot(position=(1, 0, 0))
+        self.world.add_robots([far, self.robot, near])
+        self.world.add_static(self.static_element)
+        robots = self.world.robots
+        
+        self.world._update_spatial_index(reorder=True)
+        
+        self.assertIs(self.world.robots, robots)
+        self.assertEqual(self.world.robots, [self.robot, near, far])
+        self.assertEqual(self.world._spatial_index.objects, [self.robot, near, far, self.static_element])
+
+    def test_update_spatial_index_caches_static_positions(self):
+        """Test static positions are gathered again only when the statics change."""
+        self.world.add_static(self.static_element)
+        self.world._update_spatial_index()
+        cached = self.world._static_positions()
+        self.world.add_robot(self.robot)
+        
+        self.world._update_spatial_index()
+        self.assertIs(self.world._static_positions(), cached)
         
-        self.assertIn(robot_grid_pos, self.world._spatial_index)
-        self.assertIn(static_grid_pos, self.world._spatial_index)
-        self.assertIn(self.robot, self.world._spatial_index[robot_grid_pos])
-        self.assertIn(self.static_element, self.world._spatial_index[static_grid_pos])
+        other = StaticElement(position=(-5, 0, 0))
+        self.world.add_static(other)
+        self.world._update_spatial_index()
+        self.assertEqual(self.world._spatial_index.objects, [self.robot, self.static_element, other])
+        np.testing.assert_array_equal(self.world._spatial_index.positions[2], [-5, 0, 0])
+
+    def test_positions_follow_robots_through_step(self):
+        """Test the positions array matches the robots after a step."""
+        self.robot.brain = _FixedActionBrain(1)
+        self.world.add_robot(self.robot)
+        self.world.add_static(self.static_element)
+
+        self.world.step()
+
+        self.assertEqual(self.world.positions.dtype, np.float32)
+        np.testing.assert_array_equal(self.world.positions, [tuple(self.robot.position), [5, 0, 0]])
+        self.assertNotEqual(tuple(self.robot.position), (0, 0, 0))
 
     def test_get_nearby_objects(self):
         """Test getting nearby objects."""
@@ -105,6 +175,19 @@ class TestWorld(unittest.TestCase):
         
         self.assertIn(self.robot, nearby)
         self.assertIn(self.static_element, nearby)
+        self.assertEqual(self.world._get_nearby_objects((0, 0, 0), 4.0), [self.robot])
+
+    def test_warmup_brains(self):
+        """Test warming up the brains of all robots."""
+        robots = [Robot(position=(0, 0, 0)), Robot(position=(5, 0, 0))]
+        for robot in robots:
+            robot.brain.warmup = Mock()
+        self.world.add_robots(robots)
+        
+        self.world.warmup_brains()
+        
+        for robot in robots:
+            robot.brain.warmup.assert_called_once_with()
 
     def test_step_robot_death(self):
         """Test world step with robot death."""
@@ -121,8 +204,8 @@ class TestWorld(unittest.TestCase):
         """Test world step with robot action."""
         self.world.add_robot(self.robot)
         
-        # Mock the brain to return a specific action
-        self.robot.brain.decide_action = Mock(return_value=1)  # Move +X
+        # Give the robot a brain that returns a specific action
+        self.robot.brain = _FixedActionBrain(1)  # Move +X
         
         initial_position = self.robot.position
         initial_energy = self.robot.energy
@@ -134,6 +217,117 @@ class TestWorld(unittest.TestCase):
         # Energy should be consumed for movement
         self.assertEqual(self.robot.energy, initial_energy - self.robot.movement_cost)
 
+    def test_step_rulebased_batch(self):
+        """Test batched world step with rule-based robots."""
+        robot1 = Robot(position=(0, 0, 0))
+        robot2 = Robot(position=(10, 0, 0))
+        self.world.add_robots([robot1, robot2])
+        
+        with patch.object(RuleBasedBrain, 'decide_actions_batch', return_value=np.array([1, 0])) as decide:
+            self.world.step_rulebased_batch()
+        
+        decide.assert_called_once()
+        observations, energies = decide.call_args[0]
+        self.assertEqual(observations.shape, (2, 9))
+        self.assertEqual(energies.tolist(), [robot1.energy + robot1.movement_cost, robot2.energy])
+        self.assertEqual(robot1.position.x, 1.0)
+        self.assertEqual(robot2.position.x, 10.0)
+        self.assertEqual(self.world.stats.steps, 1)
+
+    def test_step_rulebased_batch_fallback(self):
+        """Test batched world step falls back to step() for other brains."""
+        self.world.add_robot(self.robot)
+        self.robot.brain = Mock()
+        
+        with patch.object(self.world, 'step') as step:
+            self.world.step_rulebased_batch()
+        
+        step.assert_called_once_with()
+
+    def test_step_batched_rl(self):
+        """Test batched world step routes RL and rule-based robots to their batch calls."""
+        from vbe_3d.brain.rl_brain import RLBrain
+        rl_robot = Robot(position=(0, 0, 0), brain=RLBrain())
+        rule_robot = Robot(position=(10, 0, 0))
+        self.world.add_robots([rl_robot, rule_robot])
+        
+        with patch.object(RLBrain, 'decide_actions_batch', return_value=np.array([1])) as rl_decide, \
+                patch.object(RuleBasedBrain, 'decide_actions_batch', return_value=np.array([0])) as rule_decide:
+            self.world.step_batched()
+        
+        brains, observations = rl_decide.call_args[0]
+        self.assertEqual(brains, [rl_robot.brain])
+        self.assertEqual(observations.shape, (1, 9))
+        self.assertEqual(rule_decide.call_args[0][0].shape, (1, 9))
+        self.assertEqual(rl_robot.position.x, 1.0)
+        self.assertEqual(rule_robot.position.x, 10.0)
+
+    def test_perceive_batch_matches_perceive(self):
+        """Test batched perception gives every robot its own perceive() result."""
+        rng = np.random.default_rng(1)
+        # Integer positions give robots equally near neighbours
+        robots = [Robot(position=tuple(p)) for p in rng.integers(-15, 15, size=(300, 3))]
+        robots[1].position = robots[0].position
+        robots[2].energy = 40.0
+        self.world.add_robots(robots)
+        self.world.add_statics([StaticElement(position=tuple(p)) for p in rng.uniform(-15, 15, size=(60, 3))])
+        self.world._update_spatial_index()
+
+        observations = np.empty((len(robots), 9), dtype=np.float32)
+        self.world._perceive_batch(robots, observations)
+
+        expected = np.stack([robot.perceive(self.world) for robot in robots])
+        np.testing.assert_array_equal(observations, expected)
+        self.assertTrue(np.any(observations[:, 3:6] == 0) and np.any(observations[:, 0:3] != 0))
+
+    def test_perceive_indexed_matches_perceive(self):
+        """Test the indexed perception step() uses gives perceive()'s result."""
+        rng = np.random.default_rng(2)
+        robots = [Robot(position=tuple(p)) for p in rng.integers(-8, 8, size=(40, 3))]
+        self.world.add_robots(robots)
+        self.world.add_statics([StaticElement(position=tuple(p)) for p in rng.uniform(-8, 8, size=(10, 3))])
+        self.world._update_spatial_index()
+
+        for i, robot in enumerate(self.world.robots):
+            np.testing.assert_array_equal(self.world._perceive_indexed(i, robot), robot.perceive(self.world))
+
+    def test_step_batched_other_brains(self):
+        """Test batched world step decides for other brain types in one call per type."""
+        robots = [Robot(position=(0, 0, 0), brain=_FixedActionBrain(1)), Robot(position=(10, 0, 0)),
+                  Robot(position=(20, 0, 0), brain=_FixedActionBrain(2))]
+        self.world.add_robots(robots)
+        
+        with patch.object(_FixedActionBrain, 'decide_actions_for', wraps=_FixedActionBrain.decide_actions_for) as decide, \
+                patch.object(RuleBasedBrain, 'decide_actions_batch', return_value=np.array([0])):
+            self.world.step_batched()
+        
+        decide.assert_called_once()
+        self.assertEqual(decide.call_args[0][0], [robots[0].brain, robots[2].brain])
+        self.assertEqual([r.position.x for r in robots], [1.0, 10.0, 19.0])
+
+    def test_step_batched_fallback(self):
+        """Test batched world step falls back to step() for other brains."""
+        self.world.add_robot(self.robot)
+        self.robot.brain = Mock()
+        
+        with patch.object(self.world, 'step') as step:
+            self.world.step_batched()
+        
+        step.assert_called_once_with()
+
+    def test_step_steers_to_resource(self):
+        """Test rule-based robots perceive a resource in range and move toward it."""
+        for step in ('step', 'step_batched'):
+            with self.subTest(step=step):
+                world = World(self.mock_engine)
+                robot = Robot(position=(0, 0, 0))
+                world.add_robot(robot)
+                world.add_static(StaticElement(position=(5, 0, 0)))
+                
+                getattr(world, step)()
+                
+                self.assertEqual(tuple(robot.position), (1.0, 0.0, 0.0))
+
     def test_step_resource_collection(self):
         """Test world step with resource collection."""
         self.world.add_robot(self.robot)
@@ -146,8 +340,8 @@ class TestWorld(unittest.TestCase):
         self.robot.energy = 80.0
         initial_energy = self.robot.energy
         
-        # Mock brain to return no-op to avoid movement energy consumption
-        self.robot.brain.decide_action = Mock(return_value=0)
+        # No-op brain to avoid movement energy consumption
+        self.robot.brain = _FixedActionBrain(0)
         
         self.world.step()
         
@@ -161,9 +355,9 @@ class TestWorld(unittest.TestCase):
         robot1 = Robot(position=(0, 0, 0))
         robot2 = Robot(position=(1.5, 0, 0))  # Within 2 units
         
-        # Mock brains to return no-op to avoid movement
-        robot1.brain.decide_action = Mock(return_value=0)
-        robot2.brain.decide_action = Mock(return_value=0)
+        # No-op brains to avoid movement
+        robot1.brain = _FixedActionBrain(0)
+        robot2.brain = _FixedActionBrain(0)
         
         self.world.add_robot(robot1)
         self.world.add_robot(robot2)
@@ -176,6 +370,46 @@ class TestWorld(unittest.TestCase):
         # Note: connections are made for both robots, so count is 2
         self.assertEqual(self.world.stats.connections_made, 2)
 
+    def test_interaction_thresholds(self):
+        """Test the squared interaction distances and that they are strict."""
+        self.assertEqual((World._R2_CONNECT, World._R2_REPRO, World._R2_RESOURCE), (4.0, 1.0, 1.0))
+        self.assertEqual(World._INTERACTION_RADIUS, 2.0)
+        
+        robot = Robot(position=(0, 0, 0))
+        at_limit = Robot(position=(0, 2, 0))
+        inside = Robot(position=(0, 0, -1.99))
+        self.world.add_robots([robot, at_limit, inside])
+        self.world._update_spatial_index()
+        
+        self.world._resolve_interactions(robot)
+        
+        self.assertEqual(list(robot.connections), [inside])
+
+    def test_step_interactions_use_current_positions(self):
+        """Test interactions with robots that moved or were added this step."""
+        # Enough far away robots that the spatial index hashes cells
+        filler = [Robot(position=(100 + 3 * (i % 20), 3 * (i // 20), 0)) for i in range(300)]
+        still = Robot(position=(-0.1, 0, 0))
+        mover = Robot(position=(2.05, 0, 0))  # Moves to 1.05, within 2 units
+        for robot in filler + [still]:
+            robot.brain = _FixedActionBrain(0)
+        mover.brain = _FixedActionBrain(2)  # -x
+        self.world.add_robots(filler + [mover, still])
+        
+        self.world.step()
+        
+        # Both robots see each other, even though the mover's grid cell was
+        # out of reach from the still robot when the index was updated
+        self.assertIn(mover, still.connections)
+        self.assertEqual(len(mover.connections), 1)
+        self.assertEqual(self.world.stats.connections_made, 2)
+        
+        # A robot added after the index update is still found
+        newcomer = Robot(position=(-0.1, 1.5, 0))
+        self.world.add_robot(newcomer)
+        self.world._resolve_interactions(still)
+        self.assertIn(newcomer, still.connections)
+
     def test_step_robot_reproduction_simple(self):
         """Test world step with robot reproduction - simplified version."""
         print("🔄 Setting up reproduction test...")
@@ -187,9 +421,9 @@ class TestWorld(unittest.TestCase):
         robot1.energy = 50.0
         robot2.energy = 50.0
         
-        # Mock brains to return no-op to avoid movement
-        robot1.brain.decide_action = Mock(return_value=0)
-        robot2.brain.decide_action = Mock(return_value=0)
+        # No-op brains to avoid movement
+        robot1.brain = _FixedActionBrain(0)
+        robot2.brain = _FixedActionBrain(0)
         
         print("🔄 Adding robots to world...")
         self.world.add_robot(robot1)
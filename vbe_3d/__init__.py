@@ -4,10 +4,17 @@ from .engine import BaseEngine, UrsinaEngine, WebGLEngine
 from .core.robot import Robot, RobotState
 from .core.static_element import StaticElement
 from .core.world import World, WorldStats
-from .brain.rl_brain import RLBrain
 
 __version__ = '0.1.0'
 
+
+def __getattr__(name):
+    # RLBrain pulls in torch, so it is only imported when first asked for
+    if name == 'RLBrain':
+        from .brain.rl_brain import RLBrain
+        return RLBrain
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = [
     'BaseEngine',
     'UrsinaEngine',
@@ -1,3 +1,23 @@
+import sys
+from typing import Optional, Type
+
 from .base_brain import RobotBrain
 from .rule_based import RuleBasedBrain
-from .rl_brain import RLBrain
+
+
+def __getattr__(name):
+    # RLBrain pulls in torch, so it is only imported when first asked for
+    if name == "RLBrain":
+        from .rl_brain import RLBrain
+        return RLBrain
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def loaded_rl_brain_class() -> Optional[Type[RobotBrain]]:
+    """Return RLBrain if its module is already imported, else None.
+
+    No RLBrain can exist before its module is imported, so type checks
+    against it can be skipped without importing torch.
+    """
+    module = sys.modules.get(__name__ + ".rl_brain")
+    return module.RLBrain if module is not None else None
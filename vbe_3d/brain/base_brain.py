@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List, TYPE_CHECKING
+from typing import List, Sequence, TYPE_CHECKING
+
+import numpy as np
 
 if TYPE_CHECKING:
     from vbe_3d.core.robot import Robot
@@ -18,6 +20,32 @@ class RobotBrain(ABC):
         """Choose an action for the robot based on observation."""
         pass
 
+    @classmethod
+    def decide_actions_for(cls, brains: Sequence["RobotBrain"], observations) -> np.ndarray:
+        """Decide actions for several brains of this type in one call.
+        
+        World.step_batched calls this once per brain type and step. The
+        default asks each brain in turn; brain types that can decide for
+        many robots at once override it.
+        
+        Args:
+            brains: The brains to decide for, all of this type.
+            observations: (N, observation_dim) array, row i for brains[i].
+            
+        Returns:
+            (N,) int64 array of chosen actions.
+        """
+        return np.fromiter((brain.decide_action(obs) for brain, obs in zip(brains, observations)),
+                           dtype=np.int64, count=len(brains))
+
+    def warmup(self) -> None:
+        """Prepare the brain for its first decision (no-op by default).
+        
+        Brains with lazily initialised backends override this so that the
+        one-off setup cost is paid before the simulation loop starts rather
+        than inside the first step.
+        """
+
     def clone(self) -> "RobotBrain":
         """Return a deep copy of the brain (for reproduction)."""
         import copy
@@ -1,9 +1,33 @@
+from typing import Callable, Dict, TYPE_CHECKING
+
+from .base_brain import RobotBrain
 from .rule_based import RuleBasedBrain
-from .rl_brain import RLBrain
+
+if TYPE_CHECKING:
+    from .rl_brain import RLBrain
+
+
+def _rl_brain_from_export(data: dict) -> "RLBrain":
+    from .rl_brain import RLBrain
+    # Plain export() output has no weights; export_params() output does
+    if "weights_b64" in data or "weights" in data:
+        return RLBrain.from_params(data)
+    return RLBrain()
+
+
+# Brain constructors by exported "type"
+_BRAIN_REGISTRY: Dict[str, Callable[[dict], RobotBrain]] = {
+    "RLBrain": _rl_brain_from_export,
+    "RuleBasedBrain": lambda data: RuleBasedBrain(),
+}
+
+
+def register_brain(name: str, ctor: Callable[[dict], RobotBrain]) -> None:
+    """Make brain_from_export build exports of type ``name`` with ``ctor``."""
+    _BRAIN_REGISTRY[name] = ctor
 
 
-def brain_from_export(data: dict):
-    t = data["type"]
-    if t == "RLBrain":
-        return RLBrain()
-    return RuleBasedBrain()
+def brain_from_export(data: dict) -> RobotBrain:
+    """Build a brain from exported data; unknown types get a RuleBasedBrain."""
+    ctor = _BRAIN_REGISTRY.get(data["type"])
+    return ctor(data) if ctor is not None else RuleBasedBrain()
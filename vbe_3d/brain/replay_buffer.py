@@ -0,0 +1,91 @@
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+import torch
+
+# Rows allocated by the first append
+_MIN_ROWS = 64
+
+
+class ReplayBuffer:
+    """Fixed-size experience replay memory stored in tensors.
+
+    Experiences go into one tensor per field (observations, actions,
+    rewards, next observations) at a write position that wraps around, so
+    once the buffer is full each new experience overwrites the oldest one.
+    The tensors grow by doubling up to the capacity, so brains that never
+    learn much do not hold a full-size buffer.
+    """
+
+    def __init__(self, capacity: int, observation_dim: int):
+        """Initialize an empty buffer.
+
+        Args:
+            capacity: Maximum number of experiences kept.
+            observation_dim: Size of each observation vector.
+        """
+        self.capacity = capacity
+        self.observation_dim = observation_dim
+        self._obs = torch.empty((0, observation_dim), dtype=torch.float32)
+        self._next_obs = torch.empty((0, observation_dim), dtype=torch.float32)
+        self._actions = torch.empty(0, dtype=torch.long)
+        self._rewards = torch.empty(0, dtype=torch.float32)
+        self._ptr = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        """Return the experience at index, counted from the oldest one."""
+        if not -self._size <= index < self._size:
+            raise IndexError("replay buffer index out of range")
+        slot = (self._ptr - self._size + index % self._size) % self.capacity
+        return {
+            'obs': self._obs[slot].tolist(),
+            'action': int(self._actions[slot]),
+            'reward': float(self._rewards[slot]),
+            'next_obs': self._next_obs[slot].tolist(),
+        }
+
+    def append(self, obs: Sequence[float], action: int, reward: float, next_obs: Sequence[float]) -> None:
+        """Store an experience, overwriting the oldest one if the buffer is full."""
+        slot = self._ptr
+        if slot == len(self._actions):
+            self._grow()
+        self._obs[slot] = torch.as_tensor(np.asarray(obs, dtype=np.float32))
+        self._next_obs[slot] = torch.as_tensor(np.asarray(next_obs, dtype=np.float32))
+        self._actions[slot] = action
+        self._rewards[slot] = reward
+        self._ptr = (slot + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def _grow(self) -> None:
+        """Double the allocated rows, up to the capacity."""
+        rows = min(self.capacity, max(_MIN_ROWS, 2 * len(self._actions)))
+        extra = rows - len(self._actions)
+        self._obs = torch.cat([self._obs, self._obs.new_empty((extra, self.observation_dim))])
+        self._next_obs = torch.cat([self._next_obs, self._next_obs.new_empty((extra, self.observation_dim))])
+        self._actions = torch.cat([self._actions, self._actions.new_empty(extra)])
+        self._rewards = torch.cat([self._rewards, self._rewards.new_empty(extra)])
+
+    def clear(self) -> None:
+        """Forget all stored experiences."""
+        self._ptr = 0
+        self._size = 0
+
+    def sample(self, batch_size: int) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Draw a random batch of distinct experiences, without replacement.
+
+        Returns:
+            Tuple of (observations, actions, rewards, next observations)
+            tensors, each with batch_size rows.
+
+        Raises:
+            ValueError: If batch_size is larger than the number of stored
+                experiences.
+        """
+        if batch_size > self._size:
+            raise ValueError(f"Cannot sample {batch_size} experiences from a buffer of {self._size}")
+        indices = torch.randperm(self._size)[:batch_size]
+        return self._obs[indices], self._actions[indices], self._rewards[indices], self._next_obs[indices]
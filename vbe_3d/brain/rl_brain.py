@@ -1,9 +1,14 @@
-from typing import List, Dict, Any
+import base64
+import copy
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 import numpy as np
 import torch
 import torch.nn as nn
+from torch.func import functional_call, vmap
 
 from .base_brain import RobotBrain
+from .replay_buffer import ReplayBuffer
 
 
 # class _MLP(nn.Module):
@@ -15,6 +20,16 @@ from .base_brain import RobotBrain
 #         return self.net(x)
 
 
+@dataclass
+class _Network:
+    """A network, its optimizer and a count of changes to its weights."""
+    model: nn.Module
+    optimizer: torch.optim.Optimizer
+    # Bumped whenever the weights change, so low-precision copies of the
+    # model know to refresh
+    generation: int = 0
+
+
 class RLBrain(RobotBrain):
     """A brain controlled by a neural network for reinforcement learning.
     
@@ -23,7 +38,12 @@ class RLBrain(RobotBrain):
     is chosen.
     """
     
-    def __init__(self, observation_dim: int = 9, action_dim: int = 7):
+    # Networks and optimizers shared by brains created with shared=True, by
+    # (observation_dim, action_dim)
+    _MODEL_REGISTRY: Dict[Tuple[int, int], _Network] = {}
+    
+    def __init__(self, observation_dim: int = 9, action_dim: int = 7,
+                 inference_dtype: Optional[torch.dtype] = None, shared: bool = False):
         """Initialize the RL brain.
         
         Args:
@@ -33,14 +53,54 @@ class RLBrain(RobotBrain):
                                                            connection count (1) +
                                                            state (1))
             action_dim: Number of possible discrete actions (default: 7 for no-op + 6 movement directions)
+            inference_dtype: Optional lower precision such as torch.bfloat16 to
+                choose actions in. Training stays in float32 and the
+                low-precision copy of the model is refreshed after learn,
+                average or from_params change its weights.
+                Near-tied Q-values may then pick a different action, and for
+                this small network it is only faster on CPUs with native
+                bfloat16/float16 matrix units.
+            shared: Use the one network and optimizer shared by all shared
+                brains of the same dimensions instead of owning them. Every
+                shared brain then follows, and trains, the same policy.
         """
         super().__init__()
         self.observation_dim = observation_dim
         self.action_dim = action_dim
+        self.shared = shared
+        
+        if shared:
+            key = (observation_dim, action_dim)
+            if key not in self._MODEL_REGISTRY:
+                self._MODEL_REGISTRY[key] = self._new_network(observation_dim, action_dim)
+            self._network = self._MODEL_REGISTRY[key]
+        else:
+            self._network = self._new_network(observation_dim, action_dim)
+        self.model = self._network.model
+        # Optimizer for learning
+        self.optimizer = self._network.optimizer
+        
+        # Low-precision copy of the model for decide_action, built on demand
+        self.inference_dtype = inference_dtype
+        self._infer_model: Optional[nn.Module] = None
+        self._infer_generation = 0
+        
+        # NumPy views of the float32 model for decide_action, built on demand
+        self._np_layers: Optional[Tuple[nn.Module, List[Tuple[torch.Tensor, int]], List[Any]]] = None
         
+        # Reused input row for decide_action; the tensor shares the array's memory
+        self._obs_scratch_np = np.empty(observation_dim, dtype=np.float32)
+        self._obs_scratch_t = torch.from_numpy(self._obs_scratch_np).unsqueeze(0)
+        
+        # Experience replay buffer
+        self.memory = ReplayBuffer(10000, observation_dim)
+    
+    @staticmethod
+    def _build_model(observation_dim: int, action_dim: int) -> nn.Module:
+        """Build and initialize the Q-network."""
         # Define a simple neural network (multilayer perceptron)
         hidden_dim = 32
-        self.model = nn.Sequential(
+        model = nn.Sequential(
             nn.Linear(observation_dim, hidden_dim),
             nn.ReLU(),
             nn.Linear(hidden_dim, hidden_dim),
@@ -49,23 +109,49 @@ class RLBrain(RobotBrain):
         )
         
         # Initialize weights with small values
-        for layer in self.model:
+        for layer in model:
             if isinstance(layer, nn.Linear):
                 nn.init.xavier_uniform_(layer.weight)
                 nn.init.zeros_(layer.bias)
+        return model
+    
+    @classmethod
+    def _new_network(cls, observation_dim: int, action_dim: int) -> _Network:
+        """Build a Q-network together with its optimizer."""
+        model = cls._build_model(observation_dim, action_dim)
+        return _Network(model, torch.optim.Adam(model.parameters(), lr=1e-3))
+    
+    @classmethod
+    def clear_shared_models(cls) -> None:
+        """Forget the shared networks, e.g. between tests.
         
-        # Optimizer for learning
-        self.optimizer = torch.optim.Adam(self.model.parameters(), lr=1e-3)
-        
-        # Placeholder for experience replay buffer
-        self.memory: List[Dict[str, Any]] = []
-        self.max_memory_size = 10000
+        Existing shared brains keep the network they have; shared brains
+        created afterwards start a new one.
+        """
+        cls._MODEL_REGISTRY.clear()
+    
+    @property
+    def max_memory_size(self) -> int:
+        """Number of experiences the replay memory keeps."""
+        return self.memory.capacity
+
+    @max_memory_size.setter
+    def max_memory_size(self, size: int) -> None:
+        if size == self.memory.capacity:
+            return
+        # Reallocate, keeping the newest experiences that still fit
+        old = self.memory
+        self.memory = ReplayBuffer(size, self.observation_dim)
+        for i in range(max(0, len(old) - size), len(old)):
+            exp = old[i]
+            self.memory.append(exp['obs'], exp['action'], exp['reward'], exp['next_obs'])
     
-    def decide_action(self, observation: List[float]) -> int:
+    def decide_action(self, observation: Sequence[float]) -> int:
         """Decide which action to take based on the current observation.
         
         Args:
-            observation: List of observations about the environment.
+            observation: Observations about the environment, as a list or
+                the array returned by Robot.perceive.
             
         Returns:
             Integer representing the chosen action.
@@ -74,17 +160,167 @@ class RLBrain(RobotBrain):
         if len(observation) != self.observation_dim:
             raise ValueError(f"Expected observation dimension {self.observation_dim}, got {len(observation)}")
             
-        # Convert observation to tensor
-        obs_tensor = torch.tensor(observation, dtype=torch.float32).unsqueeze(0)  # Add batch dimension
+        # Copy the observation into the reused (1, observation_dim) input
+        self._obs_scratch_np[:] = observation
+        
+        # A single row is cheaper through NumPy than through torch's per-op dispatch
+        layers = self._numpy_layers() if self.inference_dtype is None else None
+        if layers is not None:
+            x = self._obs_scratch_np
+            for layer in layers:
+                if layer is None:
+                    np.maximum(x, 0.0, out=x)
+                else:
+                    x = x @ layer[0]
+                    x += layer[1]
+            return int(x.argmax())
+        obs_tensor = self._obs_scratch_t
         
         # Forward pass through the neural network
-        with torch.no_grad():
-            q_values = self.model(obs_tensor)
+        with torch.inference_mode():
+            model = self._inference_model()
+            if self.inference_dtype is not None:
+                obs_tensor = obs_tensor.to(self.inference_dtype)
+            q_values = model(obs_tensor)
             
         # Choose action with highest Q-value (greedy)
         action_index = int(torch.argmax(q_values).item())
         return action_index
 
+    @staticmethod
+    def decide_actions_batch(brains: Sequence['RLBrain'], observations) -> np.ndarray:
+        """Decide actions for several RL brains with one batched forward pass.
+        
+        Brains sharing one model run it once on the whole batch. Otherwise
+        the brains' parameters are stacked and the network is vmapped over
+        them, so row i of observations only ever sees brains[i]'s weights.
+        Equivalent to calling decide_action on each brain.
+        
+        Args:
+            brains: The brains to decide for; all must have the same
+                network shape and inference dtype.
+            observations: (N, observation_dim) array, row i for brains[i].
+            
+        Returns:
+            (N,) int64 array of chosen actions.
+        """
+        obs = torch.from_numpy(np.ascontiguousarray(observations, dtype=np.float32))
+        if obs.ndim != 2 or obs.shape[1] != brains[0].observation_dim:
+            raise ValueError(f"Expected observations of shape (N, {brains[0].observation_dim}), got {tuple(obs.shape)}")
+        
+        models = [brain._inference_model() for brain in brains]
+        base = models[0]
+        if brains[0].inference_dtype is not None:
+            obs = obs.to(brains[0].inference_dtype)
+        with torch.inference_mode():
+            if all(model is base for model in models):
+                q_values = base(obs)
+            else:
+                names = [name for name, _ in base.named_parameters()]
+                per_model = zip(*(tuple(model.parameters()) for model in models))
+                params = {name: torch.stack(tensors) for name, tensors in zip(names, per_model)}
+                q_values = vmap(lambda p, x: functional_call(base, p, (x,)))(params, obs)
+        return q_values.argmax(dim=1).numpy()
+
+    @classmethod
+    def decide_actions_for(cls, brains: Sequence['RLBrain'], observations) -> np.ndarray:
+        """Decide for several RL brains with a decide_actions_batch call per inference dtype."""
+        dtypes = {brain.inference_dtype for brain in brains}
+        if len(dtypes) == 1:
+            return cls.decide_actions_batch(brains, observations)
+        actions = np.empty(len(brains), dtype=np.int64)
+        for dtype in dtypes:
+            rows = [i for i, brain in enumerate(brains) if brain.inference_dtype == dtype]
+            actions[rows] = cls.decide_actions_batch([brains[i] for i in rows], np.asarray(observations)[rows])
+        return actions
+
+    def _inference_model(self) -> nn.Module:
+        """The model actions are chosen with: the model or its low-precision copy."""
+        if self.inference_dtype is None:
+            return self.model
+        # The generation lives with the network, so it also moves when another
+        # brain trains a shared model
+        generation = self._network.generation
+        if self._infer_model is None or generation != self._infer_generation:
+            self._infer_model = copy.deepcopy(self.model).to(dtype=self.inference_dtype).eval()
+            self._infer_generation = generation
+        return self._infer_model
+
+    def _numpy_layers(self) -> Optional[List[Any]]:
+        """The float32 model as NumPy views, for single-row forward passes.
+        
+        Each Linear layer becomes a (transposed weight, bias) pair of views
+        sharing memory with the parameters, so optimizer steps and
+        load_state_dict show through; each ReLU becomes None. The views are
+        made again if a parameter gets new storage.
+        
+        Returns:
+            The layers in order, or None if the model has other kinds of
+            layers and must run through torch.
+        """
+        cached = self._np_layers
+        if cached is not None and cached[0] is self.model and all(p.data_ptr() == ptr for p, ptr in cached[1]):
+            return cached[2]
+        layers: Optional[List[Any]] = []
+        modules = self.model if isinstance(self.model, nn.Sequential) else [self.model]
+        for module in modules:
+            if type(module) is nn.Linear and module.bias is not None and module.weight.dtype == torch.float32:
+                layers.append((module.weight.detach().numpy().T, module.bias.detach().numpy()))
+            elif type(module) is nn.ReLU:
+                layers.append(None)
+            else:
+                layers = None
+                break
+        params = list(self.model.parameters())
+        self._np_layers = (self.model, [(p, p.data_ptr()) for p in params], layers)
+        return layers
+
+    def warmup(self) -> None:
+        """Run one dummy forward pass so torch's first-call setup happens now."""
+        with torch.inference_mode():
+            dtype = self.inference_dtype or torch.float32
+            self._inference_model()(torch.zeros(1, self.observation_dim, dtype=dtype))
+
+    def clone(self, diverge: bool = False) -> 'RLBrain':
+        """Return a copy of the brain with the same network weights.
+        
+        A shared brain's clone shares the same network unless diverge is set.
+        Otherwise the weights are copied through the state dict instead of
+        deep-copying the whole brain. Either way the clone starts with an
+        empty replay memory.
+        
+        Args:
+            diverge: Give the clone its own copy of a shared network.
+        """
+        if self.shared and not diverge:
+            cloned = RLBrain(self.observation_dim, self.action_dim, inference_dtype=self.inference_dtype, shared=True)
+        else:
+            cloned = RLBrain(self.observation_dim, self.action_dim, inference_dtype=self.inference_dtype)
+            cloned.model.load_state_dict({k: v.detach().clone() for k, v in self.model.state_dict().items()})
+        cloned.max_memory_size = self.max_memory_size
+        return cloned
+
+    @classmethod
+    def average(cls, first: 'RLBrain', second: 'RLBrain') -> 'RLBrain':
+        """Return a new brain whose network weights are the mean of two brains'.
+        
+        The parameters are averaged in place with torch's multi-tensor
+        (_foreach) ops, a few calls for the whole network instead of an add
+        and a divide per state dict entry.
+        
+        Args:
+            first: One parent brain.
+            second: The other parent brain, with the same network layout.
+        """
+        child = cls(first.observation_dim, first.action_dim)
+        params = list(child.model.parameters())
+        with torch.no_grad():
+            torch._foreach_copy_(params, list(first.model.parameters()))
+            torch._foreach_add_(params, list(second.model.parameters()))
+            torch._foreach_mul_(params, 0.5)
+        child._network.generation += 1
+        return child
+
     def learn(self, obs: List[float], action: int, reward: float, next_obs: List[float]) -> None:
         """Update the neural network using experience replay.
         
@@ -94,17 +330,8 @@ class RLBrain(RobotBrain):
             reward: Reward received
             next_obs: Next observation
         """
-        # Store experience in memory
-        self.memory.append({
-            'obs': obs,
-            'action': action,
-            'reward': reward,
-            'next_obs': next_obs
-        })
-        
-        # Limit memory size
-        if len(self.memory) > self.max_memory_size:
-            self.memory.pop(0)
+        # Store experience in memory; the oldest one is dropped once it is full
+        self.memory.append(obs, action, reward, next_obs)
             
         # If we have enough samples, perform a learning step
         if len(self.memory) >= 32:  # Batch size
@@ -114,14 +341,7 @@ class RLBrain(RobotBrain):
         """Update the neural network using a batch of experiences."""
         # Sample random batch from memory
         batch_size = min(32, len(self.memory))
-        indices = np.random.choice(len(self.memory), batch_size, replace=False)
-        batch = [self.memory[i] for i in indices]
-        
-        # Prepare batch data
-        obs_batch = torch.tensor([exp['obs'] for exp in batch], dtype=torch.float32)
-        action_batch = torch.tensor([exp['action'] for exp in batch], dtype=torch.long)
-        reward_batch = torch.tensor([exp['reward'] for exp in batch], dtype=torch.float32)
-        next_obs_batch = torch.tensor([exp['next_obs'] for exp in batch], dtype=torch.float32)
+        obs_batch, action_batch, reward_batch, next_obs_batch = self.memory.sample(batch_size)
         
         # Compute current Q-values
         current_q_values = self.model(obs_batch)
@@ -138,40 +358,80 @@ class RLBrain(RobotBrain):
         self.optimizer.zero_grad()
         loss.backward()
         self.optimizer.step()
+        self._network.generation += 1
 
-    def export_params(self) -> Dict[str, List[float]]:
+    def export_params(self) -> Dict[str, Any]:
         """Export network parameters for saving.
         
+        The weights are written as one base64 string of little-endian
+        float32 values, the state dict tensors flattened and concatenated in
+        order. The network shape follows from the dimensions, so no
+        per-tensor keys or shapes are stored.
+        
         Returns:
             Dictionary containing the network parameters.
         """
-        state = self.model.state_dict()
+        flat = torch.cat([v.detach().reshape(-1) for v in self.model.state_dict().values()])
         return {
             'type': 'RLBrain',
             'observation_dim': self.observation_dim,
             'action_dim': self.action_dim,
-            'weights': {k: v.tolist() for k, v in state.items()}
+            'shared': self.shared,
+            'weights_b64': base64.b64encode(flat.numpy().astype('<f4').tobytes()).decode('ascii')
         }
     
     @classmethod
     def from_params(cls, params: Dict[str, Any]) -> 'RLBrain':
         """Create a brain from saved parameters.
         
+        Accepts both the base64 weights written by export_params and the
+        older per-tensor lists under 'weights'. A shared brain joins the
+        shared network of its dimensions if there is none yet or it holds the
+        same weights; otherwise it gets its own network, so that loading
+        never changes the policy of live shared brains.
+        
         Args:
             params: Dictionary containing the network parameters.
             
         Returns:
             A new RLBrain instance with the saved parameters.
+            
+        Raises:
+            ValueError: If the weights do not fit the network shape.
         """
         brain = cls(
             observation_dim=params['observation_dim'],
             action_dim=params['action_dim']
         )
         
-        # Convert weights back to tensors
-        state_dict = {
-            k: torch.tensor(v) for k, v in params['weights'].items()
-        }
+        if 'weights_b64' in params:
+            flat = np.frombuffer(base64.b64decode(params['weights_b64']), dtype='<f4')
+            template = brain.model.state_dict()
+            expected = sum(v.numel() for v in template.values())
+            if flat.size != expected:
+                raise ValueError(f"Expected {expected} weights, got {flat.size}")
+            # Split the flat buffer back into tensors of the model's shapes
+            flat = torch.from_numpy(flat.astype(np.float32))
+            state_dict = {}
+            offset = 0
+            for k, v in template.items():
+                state_dict[k] = flat[offset:offset + v.numel()].view_as(v)
+                offset += v.numel()
+        else:
+            # Convert weights back to tensors
+            state_dict = {
+                k: torch.tensor(v) for k, v in params['weights'].items()
+            }
         brain.model.load_state_dict(state_dict)
+        brain._network.generation += 1
+        
+        if params.get('shared', False):
+            key = (brain.observation_dim, brain.action_dim)
+            network = cls._MODEL_REGISTRY.get(key)
+            if network is None:
+                cls._MODEL_REGISTRY[key] = brain._network
+                brain.shared = True
+            elif all(torch.equal(v, state_dict[k]) for k, v in network.model.state_dict().items()):
+                brain = cls(brain.observation_dim, brain.action_dim, shared=True)
         
         return brain
@@ -1,11 +1,74 @@
 import random
 from typing import List
 
+import numpy as np
+
 from .base_brain import RobotBrain
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _decide_actions_kernel(observations, energies, random_actions):
+    """Rule-based policy for a batch of robots (see RuleBasedBrain.decide_action)."""
+    n = observations.shape[0]
+    actions = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        res_dx = observations[i, 0]
+        res_dy = observations[i, 1]
+        res_dz = observations[i, 2]
+        adx = abs(res_dx)
+        ady = abs(res_dy)
+        adz = abs(res_dz)
+        if adx > 0.1 or adz > 0.1 or ady > 0.1:
+            if adx >= max(ady, adz):
+                actions[i] = 1 if res_dx > 0 else 2
+            elif adz >= max(adx, ady):
+                actions[i] = 3 if res_dz > 0 else 4
+            else:
+                actions[i] = 5 if res_dy > 0 else 6
+        elif energies[i] < 10:
+            actions[i] = 0
+        else:
+            actions[i] = random_actions[i]
+    return actions
+
+
+def _decide_actions_numpy(observations, energies, random_actions):
+    """Vectorized NumPy equivalent of _decide_actions_kernel."""
+    res_dx, res_dy, res_dz = observations[:, 0], observations[:, 1], observations[:, 2]
+    adx, ady, adz = np.abs(res_dx), np.abs(res_dy), np.abs(res_dz)
+    return np.select(
+        [
+            (adx > 0.1) | (adz > 0.1) | (ady > 0.1),
+            energies < 10,
+        ],
+        [
+            np.select(
+                [adx >= np.maximum(ady, adz), adz >= np.maximum(adx, ady)],
+                [np.where(res_dx > 0, 1, 2), np.where(res_dz > 0, 3, 4)],
+                np.where(res_dy > 0, 5, 6),
+            ),
+            0,
+        ],
+        random_actions,
+    ).astype(np.int64)
+
+
+if njit is not None:
+    _decide_actions = njit(cache=True)(_decide_actions_kernel)
+else:
+    _decide_actions = _decide_actions_numpy
+
 
 class RuleBasedBrain(RobotBrain):
     """A simple hard-coded logic for the robot."""
+    
+    # Random walk moves (not using vertical in random to keep on ground for simplicity)
+    _ACTIONS = (0, 1, 2, 3, 4)
+    
     def __init__(self):
         super().__init__()
         # we could add parameters for the behavior, but for now it's static rules.
@@ -15,16 +78,48 @@ class RuleBasedBrain(RobotBrain):
         # simple strategy:
         # if a resource is very close (within 1 unit), move towards it.
         res_dx, res_dy, res_dz = observation[0], observation[1], observation[2]
+        adx, ady, adz = abs(res_dx), abs(res_dy), abs(res_dz)
         # if resource is nearby in any direction significantly, head that way:
-        if abs(res_dx) > 0.1 or abs(res_dz) > 0.1 or abs(res_dy) > 0.1:
+        if adx > 0.1 or adz > 0.1 or ady > 0.1:
             # move in direction of resource (choose the axis with largest distance)
-            if abs(res_dx) >= max(abs(res_dy), abs(res_dz)):
+            if adx >= ady and adx >= adz:
                 return 1 if res_dx > 0 else 2  # move +x if resource is positive dx away, else -x
-            elif abs(res_dz) >= max(abs(res_dx), abs(res_dy)):
+            if adz >= ady:
                 return 3 if res_dz > 0 else 4  # move in z towards resource
-            elif abs(res_dy) >= max(abs(res_dx), abs(res_dz)):
-                return 5 if res_dy > 0 else 6  # move in y (vertical) towards resource
+            return 5 if res_dy > 0 else 6  # move in y (vertical) towards resource
         # otherwise, if no immediate resource target, do a random walk (or stay put if energy low)
         if self.robot and self.robot.energy < 10:
             return 0  # if energy is very low, do nothing to conserve (as a simple rule)
-        return random.choice([0,1,2,3,4])  # randomly move (not using vertical in random to keep on ground for simplicity)
+        return random.choice(self._ACTIONS)  # randomly move
+
+    def clone(self) -> "RuleBasedBrain":
+        """Return a new brain; the rules hold no state worth copying."""
+        return RuleBasedBrain()
+
+    @classmethod
+    def decide_actions_for(cls, brains, observations) -> np.ndarray:
+        """Decide for several rule-based brains with decide_actions_batch."""
+        # Brains without a robot never rest, as in decide_action
+        energies = np.fromiter((b.robot.energy if b.robot else np.inf for b in brains),
+                               dtype=np.float64, count=len(brains))
+        return cls.decide_actions_batch(observations, energies)
+
+    @staticmethod
+    def decide_actions_batch(observations, energies) -> np.ndarray:
+        """Apply the rules of decide_action to many robots at once.
+        
+        Uses a Numba-compiled kernel when numba is installed and a vectorized
+        NumPy implementation otherwise. Random moves come from the random
+        module, like decide_action's, so random.seed() covers both.
+        
+        Args:
+            observations: (N, 9) array of observations as built by Robot.perceive.
+            energies: (N,) array of the robots' raw energy levels.
+            
+        Returns:
+            (N,) int64 array of actions.
+        """
+        observations = np.asarray(observations, dtype=np.float64).reshape(-1, 9)
+        energies = np.asarray(energies, dtype=np.float64)
+        random_actions = np.array(random.choices(RuleBasedBrain._ACTIONS, k=len(observations)), dtype=np.int64)
+        return _decide_actions(observations, energies, random_actions)
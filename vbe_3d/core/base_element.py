@@ -8,6 +8,10 @@ if TYPE_CHECKING:
 class BaseElement:
     """Base class for any object in the world (robot or static element). """
 
+    # Whether the element can change position; the world indexes the
+    # positions of fixed elements once instead of every step
+    moves = True
+
     def __init__(self, position: Tuple[float, float, float], color: Tuple[float, float, float]) -> None:
         self.position = Vec3(*position)  # using Vec3 for better 3D vector handling
         self.color = color # color stored as (r,g,b) 0-1
@@ -1,16 +1,17 @@
 from __future__ import annotations
 
 import math
-from typing import Dict, List, Tuple, Optional, Set, TYPE_CHECKING
+from typing import Dict, Tuple, Optional, Set, TYPE_CHECKING
 import itertools
 from enum import Enum, auto
 from dataclasses import dataclass
+import numpy as np
 from ursina import Vec3
 
 from vbe_3d.utils.id_manager import next_id
 from vbe_3d.core.base_element import BaseElement
 from vbe_3d.brain.base_brain import RobotBrain
-from vbe_3d.brain.rl_brain import RLBrain
+from vbe_3d.brain import loaded_rl_brain_class
 from vbe_3d.brain.rule_based import RuleBasedBrain
 from vbe_3d.utils.geometry import add_vec
 
@@ -46,6 +47,25 @@ class RobotStats:
 # global counter for robot IDs
 _robot_id_counter = itertools.count()
 
+# Distance covered by one movement action
+_STEP = 1.0
+
+# Position offset for each movement action (1-6: +x, -x, +z, -z, +y, -y)
+_MOVE_OFFSETS = {
+    1: Vec3(_STEP, 0, 0),
+    2: Vec3(-_STEP, 0, 0),
+    3: Vec3(0, 0, _STEP),
+    4: Vec3(0, 0, -_STEP),
+    5: Vec3(0, _STEP, 0),
+    6: Vec3(0, -_STEP, 0),
+}
+
+# Number of robot states, to normalize the state observation
+_STATE_COUNT = len(RobotState)
+
+# Keys Robot.from_dict cannot do without; the rest have defaults
+_REQUIRED_KEYS = frozenset({"id", "pos", "col", "energy", "state", "brain"})
+
 class Robot(BaseElement):
     """A robot (active agent) in the world.
     
@@ -61,6 +81,9 @@ class Robot(BaseElement):
         reproduction_threshold: Minimum energy required for reproduction
     """
     
+    # Distance within which perceive looks for resources and robots
+    PERCEPTION_RADIUS = 10.0
+    
     def __init__(
         self,
         position: Tuple[float, float, float] = (0, 0, 0),
@@ -88,86 +111,84 @@ class Robot(BaseElement):
             self.brain = brain
         self.brain.robot = self
 
-    def perceive(self, world: 'World') -> List[float]:
+    def perceive(self, world: 'World', out: Optional[np.ndarray] = None) -> np.ndarray:
         """Gather observations about the world to feed into the brain.
         
         Args:
             world: The world to perceive.
+            out: Optional float32 array of shape (9,) to write the
+                observations into, e.g. a row of a per-step buffer. A new
+                array is allocated if not given.
             
         Returns:
-            List of observations including:
+            Array of 9 float32 observations (``out`` if given):
             - Relative position to nearest resource
             - Relative position to nearest robot
             - Current energy level (normalized)
             - Number of connections
             - Current state
         """
-        obs = []
+        obs = np.empty(9, dtype=np.float32) if out is None else out
+        # Bound once; every distance below is measured from here
+        pos = self.position
+        dist = math.dist
         
         # Find nearest resource using spatial indexing if available
         nearest_res = None
         min_dist = float('inf')
+        nearby = None
         
         if hasattr(world, '_get_nearby_objects'):
-            nearby = world._get_nearby_objects(self.position, 10.0)  # Look within 10 units
-            for e in nearby:
-                if hasattr(e, 'resource_value'):
-                    dist = math.dist(self.position, e.position)
-                    if dist < min_dist:
-                        min_dist = dist
-                        nearest_res = e
+            nearby = world._get_nearby_objects(pos, self.PERCEPTION_RADIUS)
+            candidates = nearby
         else:
-            for e in world.static_elements:
-                if hasattr(e, 'resource_value'):
-                    dist = math.dist(self.position, e.position)
-                    if dist < min_dist:
-                        min_dist = dist
-                        nearest_res = e
+            candidates = world.static_elements
+        for e in candidates:
+            if hasattr(e, 'resource_value'):
+                d = dist(pos, e.position)
+                if d < min_dist:
+                    min_dist = d
+                    nearest_res = e
                         
         if nearest_res:
-            obs.extend([
-                nearest_res.position[0] - self.position[0],
-                nearest_res.position[1] - self.position[1],
-                nearest_res.position[2] - self.position[2]
-            ])
+            res_pos = nearest_res.position
+            obs[0] = res_pos[0] - pos[0]
+            obs[1] = res_pos[1] - pos[1]
+            obs[2] = res_pos[2] - pos[2]
         else:
-            obs.extend([0.0, 0.0, 0.0])
+            obs[0:3] = 0.0
             
         # Find nearest robot
         nearest_bot = None
         min_dist = float('inf')
         
-        if hasattr(world, '_get_nearby_objects'):
-            nearby = world._get_nearby_objects(self.position, 10.0)
+        if nearby is not None:
             for r in nearby:
                 if isinstance(r, Robot) and r is not self:
-                    dist = math.dist(self.position, r.position)
-                    if dist < min_dist:
-                        min_dist = dist
+                    d = dist(pos, r.position)
+                    if d < min_dist:
+                        min_dist = d
                         nearest_bot = r
         else:
             for r in world.robots:
                 if r is not self:
-                    dist = math.dist(self.position, r.position)
-                    if dist < min_dist:
-                        min_dist = dist
+                    d = dist(pos, r.position)
+                    if d < min_dist:
+                        min_dist = d
                         nearest_bot = r
                         
         if nearest_bot:
-            obs.extend([
-                nearest_bot.position[0] - self.position[0],
-                nearest_bot.position[1] - self.position[1],
-                nearest_bot.position[2] - self.position[2]
-            ])
+            bot_pos = nearest_bot.position
+            obs[3] = bot_pos[0] - pos[0]
+            obs[4] = bot_pos[1] - pos[1]
+            obs[5] = bot_pos[2] - pos[2]
         else:
-            obs.extend([0.0, 0.0, 0.0])
+            obs[3:6] = 0.0
             
         # Add additional observations
-        obs.extend([
-            self.energy / self.max_energy,  # Normalized energy
-            len(self.connections) / 10.0,   # Normalized connection count
-            self.state.value / len(RobotState)  # Normalized state
-        ])
+        obs[6] = self.energy / self.max_energy  # Normalized energy
+        obs[7] = len(self.connections) / 10.0   # Normalized connection count
+        obs[8] = self.state.value / _STATE_COUNT  # Normalized state
         
         return obs
 
@@ -184,31 +205,16 @@ class Robot(BaseElement):
             return
             
         self.state = RobotState.MOVING
-        step = 1.0
         
-        # Store old position
-        old_pos = self.position
-        
-        # Movement actions
-        x, y, z = self.position
-        if action == 1:
-            x += step
-        elif action == 2:
-            x -= step
-        elif action == 3:
-            z += step
-        elif action == 4:
-            z -= step
-        elif action == 5:
-            y += step
-        elif action == 6:
-            y -= step
-            
-        # Update position - convert back to Vec3
-        self.position = Vec3(x, y, z)
+        # Movement actions: one Vec3 addition instead of unpacking the
+        # position and rebuilding it component by component. The offset goes
+        # first so positions assigned as plain tuples still become a Vec3.
+        offset = _MOVE_OFFSETS.get(action)
+        if offset is not None:
+            self.position = offset + self.position
+            self.stats.distance_traveled += _STEP
             
         # Update statistics
-        self.stats.distance_traveled += math.dist(old_pos, self.position)
         self.stats.energy_consumed += self.movement_cost
         self.stats.lifetime += 1
         
@@ -291,16 +297,14 @@ class Robot(BaseElement):
         child_color = tuple((a+b)/2.0 for a, b in zip(self.color, partner.color))
         
         # Handle brain inheritance
-        if isinstance(self.brain, RLBrain) and isinstance(partner.brain, RLBrain):
-            child_brain = RLBrain()
+        RLBrain = loaded_rl_brain_class()
+        both_rl = RLBrain is not None and isinstance(self.brain, RLBrain) and isinstance(partner.brain, RLBrain)
+        if both_rl and self.brain.model is partner.brain.model:
+            # Parents on one shared network pass it on unchanged
+            child_brain = self.brain.clone()
+        elif both_rl:
             # Average the neural network parameters
-            self_params = self.brain.model.state_dict()
-            partner_params = partner.brain.model.state_dict()
-            child_params = {
-                k: (self_params[k] + partner_params[k]) / 2.0
-                for k in self_params.keys()
-            }
-            child_brain.model.load_state_dict(child_params)
+            child_brain = RLBrain.average(self.brain, partner.brain)
         else:
             child_brain = RuleBasedBrain()
             
@@ -350,7 +354,16 @@ class Robot(BaseElement):
 
     @classmethod
     def from_dict(cls, data: dict) -> "Robot":
-        """Create a robot from serialized data."""
+        """Create a robot from serialized data.
+        
+        Raises:
+            KeyError: If any of the required keys ("id", "pos", "col",
+                "energy", "state", "brain") is missing. This is checked
+                before the brain is rebuilt.
+        """
+        if not data.keys() >= _REQUIRED_KEYS:
+            raise KeyError(f"Robot data is missing keys: {sorted(_REQUIRED_KEYS - data.keys())}")
+        
         from vbe_3d.brain.factory import brain_from_export
 
         brain = brain_from_export(data["brain"])
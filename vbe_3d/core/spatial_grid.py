@@ -0,0 +1,462 @@
+"""Hashed uniform grid for proximity queries over world objects."""
+import math
+import operator
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Teschner et al. spatial hashing primes
+_PRIMES = (73856093, 19349663, 83492791)
+
+# Rebuilds where fewer than this fraction of the objects changed cell update
+# those objects' buckets instead of re-sorting everything
+_REBUCKET_FRACTION = 0.1
+
+# Below this many objects a plain distance check over all of them is faster
+# than gathering grid buckets
+_BRUTE_FORCE_LIMIT = 256
+
+# Rough cost of visiting one grid cell in a batched nearest query, counted in
+# per-object distance checks; fewer objects than that over all cells around
+# a point are scanned directly
+_CELL_VISIT_COST = 8
+
+
+def gather_positions(objects: Sequence[Any]) -> np.ndarray:
+    """Positions of the given objects as an (N, 3) float32 array."""
+    count = len(objects)
+    flat = np.fromiter((c for obj in objects for c in obj.position), dtype=np.float32, count=3 * count)
+    return flat.reshape(count, 3)
+
+
+def _hash_cells(cells: np.ndarray, mask: int) -> np.ndarray:
+    """Hash integer cell coordinates of shape (N, 3) into [0, mask]."""
+    return ((cells[:, 0] * _PRIMES[0]) ^ (cells[:, 1] * _PRIMES[1]) ^ (cells[:, 2] * _PRIMES[2])) & mask
+
+
+def _neighbors_kernel(positions, order, counts, ends, mask, cell, reach, center, radius_sq, brute,
+                      found, dist_sq, seen):
+    """Indices and squared distances of the objects within a radius of center.
+
+    Scans the buckets of the (2 * reach + 1)^3 cells around ``cell``, each
+    bucket once, or every object if ``brute`` is set. ``found`` and
+    ``dist_sq`` are scratch arrays with one entry per object and ``seen``
+    one all-False flag per bucket, left all False again on return; the
+    results are fresh arrays. Written to compile under numba; see
+    SpatialHashGrid.neighbors.
+    """
+    count = 0
+    if brute:
+        for i in range(positions.shape[0]):
+            dx = positions[i, 0] - center[0]
+            dy = positions[i, 1] - center[1]
+            dz = positions[i, 2] - center[2]
+            d2 = dx * dx + dy * dy + dz * dz
+            if d2 <= radius_sq:
+                found[count] = i
+                dist_sq[count] = d2
+                count += 1
+        return found[:count].copy(), dist_sq[:count].copy()
+    for ox in range(-reach, reach + 1):
+        hx = (cell[0] + ox) * 73856093
+        for oy in range(-reach, reach + 1):
+            hy = (cell[1] + oy) * 19349663
+            for oz in range(-reach, reach + 1):
+                h = (hx ^ hy ^ ((cell[2] + oz) * 83492791)) & mask
+                if seen[h]:
+                    continue
+                seen[h] = True
+                for j in range(ends[h] - counts[h], ends[h]):
+                    i = order[j]
+                    dx = positions[i, 0] - center[0]
+                    dy = positions[i, 1] - center[1]
+                    dz = positions[i, 2] - center[2]
+                    d2 = dx * dx + dy * dy + dz * dz
+                    if d2 <= radius_sq:
+                        found[count] = i
+                        dist_sq[count] = d2
+                        count += 1
+    for ox in range(-reach, reach + 1):
+        hx = (cell[0] + ox) * 73856093
+        for oy in range(-reach, reach + 1):
+            hy = (cell[1] + oy) * 19349663
+            for oz in range(-reach, reach + 1):
+                seen[(hx ^ hy ^ ((cell[2] + oz) * 83492791)) & mask] = False
+    by_index = np.argsort(found[:count])
+    return found[:count][by_index], dist_sq[:count][by_index]
+
+
+def _nearest_kernel(positions, order, counts, ends, mask, points, inv_cell_size, reach, radius_sq,
+                    brute, kinds, kind_count, exclude):
+    """Index and squared distance of the nearest object of each kind to each point.
+
+    Objects are within range under the same float32 test as
+    _neighbors_kernel; among them the smallest float64 distance wins, ties
+    going to the lowest index. Objects of kind -1 are skipped, and kinds
+    with no object in range get -1. One walk over the buckets serves every
+    kind. Written to compile under numba; see SpatialHashGrid.nearest_by_kind.
+    """
+    nearest = np.full((points.shape[0], kind_count), -1, dtype=np.int64)
+    best_sq = np.full((points.shape[0], kind_count), np.inf)
+    seen = np.zeros(mask + 1, dtype=np.bool_)
+    side = 2 * reach + 1
+    visited = np.empty(side ** 3, dtype=np.int64)
+    starts = np.empty(side ** 3, dtype=np.int64)
+    stops = np.empty(side ** 3, dtype=np.int64)
+    for q in range(points.shape[0]):
+        px = points[q, 0]
+        py = points[q, 1]
+        pz = points[q, 2]
+        # Slices of order to scan: every object, or each distinct bucket once
+        spans = 0
+        if brute:
+            starts[0] = 0
+            stops[0] = positions.shape[0]
+            spans = 1
+        else:
+            # Same float32 arithmetic as SpatialHashGrid.cell_of
+            cx = np.int64(np.floor(px * inv_cell_size))
+            cy = np.int64(np.floor(py * inv_cell_size))
+            cz = np.int64(np.floor(pz * inv_cell_size))
+            for ox in range(-reach, reach + 1):
+                hx = (cx + ox) * 73856093
+                for oy in range(-reach, reach + 1):
+                    hy = (cy + oy) * 19349663
+                    for oz in range(-reach, reach + 1):
+                        h = (hx ^ hy ^ ((cz + oz) * 83492791)) & mask
+                        if seen[h]:
+                            continue
+                        seen[h] = True
+                        visited[spans] = h
+                        starts[spans] = ends[h] - counts[h]
+                        stops[spans] = ends[h]
+                        spans += 1
+            for v in range(spans):
+                seen[visited[v]] = False
+        for s in range(spans):
+            for j in range(starts[s], stops[s]):
+                i = j if brute else order[j]
+                k = kinds[i]
+                if k < 0 or i == exclude[q]:
+                    continue
+                dx = positions[i, 0] - px
+                dy = positions[i, 1] - py
+                dz = positions[i, 2] - pz
+                if dx * dx + dy * dy + dz * dz > radius_sq:
+                    continue
+                ddx = np.float64(positions[i, 0]) - np.float64(px)
+                ddy = np.float64(positions[i, 1]) - np.float64(py)
+                ddz = np.float64(positions[i, 2]) - np.float64(pz)
+                d = ddx * ddx + ddy * ddy + ddz * ddz
+                if d < best_sq[q, k] or (d == best_sq[q, k] and i < nearest[q, k]):
+                    nearest[q, k] = i
+                    best_sq[q, k] = d
+    return nearest, best_sq
+
+
+# Compiled neighbour scans; without numba queries use NumPy array operations
+_neighbors = njit(cache=True)(_neighbors_kernel) if njit is not None else None
+_nearest = njit(cache=True)(_nearest_kernel) if njit is not None else None
+
+
+def _spread_bits(v: np.ndarray) -> np.ndarray:
+    """Spread the low 21 bits of each uint64 so two zero bits follow each one."""
+    v = v & np.uint64(0x1FFFFF)
+    v = (v | (v << np.uint64(32))) & np.uint64(0x1F00000000FFFF)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x1F0000FF0000FF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x100F00F00F00F00F)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x10C30C30C30C30C3)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x1249249249249249)
+    return v
+
+
+def morton3(cells: np.ndarray) -> np.ndarray:
+    """Z-order (Morton) keys for integer cell coordinates of shape (N, 3).
+
+    Coordinates are biased by 2**20 so negative cells keep their order; each
+    axis uses 21 bits.
+    """
+    biased = (np.asarray(cells, dtype=np.int64) + (1 << 20)).astype(np.uint64)
+    return (_spread_bits(biased[:, 0])
+            | (_spread_bits(biased[:, 1]) << np.uint64(1))
+            | (_spread_bits(biased[:, 2]) << np.uint64(2)))
+
+
+class SpatialHashGrid:
+    """Objects bucketed by grid cell in flat arrays.
+
+    ``rebuild`` snapshots the object positions into one float32 array and
+    sorts the object indices by cell hash, so every hash bucket is a
+    contiguous slice of ``order`` (a CSR layout). Queries gather the slices
+    of the cells around a point and filter them by distance. Different cells
+    may share a bucket; the distance filter removes the extra candidates.
+    """
+
+    def __init__(self, cell_size: float = 2.0):
+        """Initialize an empty grid.
+
+        Args:
+            cell_size: Edge length of a grid cell.
+        """
+        self.cell_size = cell_size
+        # Cells are computed with a multiply rather than a division
+        self._inv_cell_size = 1.0 / cell_size
+        self.objects: List[Any] = []
+        self.positions = np.empty((0, 3), dtype=np.float32)
+        self._mask = 0
+        self._cells = np.empty((0, 3), dtype=np.int64)
+        self._hashes = np.empty(0, dtype=np.int64)
+        self._order = np.empty(0, dtype=np.intp)
+        self._counts = np.zeros(1, dtype=np.intp)
+        self._ends = np.zeros(1, dtype=np.intp)
+        self._neighbor_offsets: Dict[int, np.ndarray] = {}
+        self._scratch = np.empty((0, 3), dtype=np.float32)
+        # Scratch arrays for the compiled neighbour scan, sized on first use
+        # after each rebuild instead of allocated per query
+        self._neighbor_buffers: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    def rebuild(self, objects: Iterable[Any], positions: Optional[np.ndarray] = None) -> None:
+        """Index the current positions of the given objects.
+
+        When the objects are the same as in the last rebuild, only those that
+        changed cell are re-bucketed, and the bucket layout is left alone if
+        none did.
+
+        Args:
+            objects: Objects with a 3-component ``position``.
+            positions: The objects' positions as an (N, 3) array, if the
+                caller already has them.
+        """
+        objects = list(objects)
+        positions = gather_positions(objects) if positions is None else np.asarray(positions, dtype=np.float32)
+        cells = self.cell_of(positions)
+        same = len(objects) == len(self.objects) and all(map(operator.is_, objects, self.objects))
+        self.objects = objects
+        self.positions = positions
+        if same:
+            moved = np.flatnonzero((cells != self._cells).any(axis=1))
+            if len(moved) < _REBUCKET_FRACTION * len(objects):
+                self._rebucket(moved, cells)
+                return
+        # Power-of-two table with at least two buckets per object
+        table_size = max(64, 1 << (2 * len(objects) - 1).bit_length())
+        self._mask = table_size - 1
+        self._cells = cells
+        self._hashes = _hash_cells(cells, self._mask)
+        self._order = np.argsort(self._hashes, kind='stable')
+        self._counts = np.bincount(self._hashes, minlength=table_size)
+        self._ends = np.cumsum(self._counts)
+
+    def _rebucket(self, moved: np.ndarray, cells: np.ndarray) -> None:
+        """Move the objects at the given indices to the buckets of their new cells."""
+        self._cells = cells
+        if not len(moved):
+            return
+        old_hashes = self._hashes[moved]
+        new_hashes = _hash_cells(cells[moved], self._mask)
+        self._hashes[moved] = new_hashes
+        np.subtract.at(self._counts, old_hashes, 1)
+        np.add.at(self._counts, new_hashes, 1)
+        self._ends = np.cumsum(self._counts)
+        # Take the moved objects out of order and insert each at the end of its new bucket
+        is_moved = np.zeros(len(self.objects), dtype=bool)
+        is_moved[moved] = True
+        kept = self._order[~is_moved[self._order]]
+        self._order = np.insert(kept, np.searchsorted(self._hashes[kept], new_hashes, side='right'), moved)
+
+    def cell_of(self, positions: np.ndarray) -> np.ndarray:
+        """Integer cell coordinates for an (N, 3) array of positions."""
+        return np.floor(positions * self._inv_cell_size).astype(np.int64)
+
+    def morton_order(self, positions: np.ndarray) -> np.ndarray:
+        """Permutation that sorts positions of shape (N, 3) by cell Z-order."""
+        return np.argsort(morton3(self.cell_of(positions)), kind='stable')
+
+    def candidate_indices(self, position: Tuple[float, float, float], radius: float) -> np.ndarray:
+        """Indices of the objects in the grid cells within radius of position.
+
+        The candidates are not filtered by distance, so they include objects
+        up to about one cell further away than radius.
+
+        Args:
+            position: The center position to search around.
+            radius: The search radius.
+
+        Returns:
+            Array of object indices, in index order.
+        """
+        if not self.objects:
+            return np.empty(0, dtype=np.intp)
+        offsets = self._offsets(math.ceil(radius / self.cell_size))
+        if len(self.objects) <= _BRUTE_FORCE_LIMIT or len(offsets) > self._mask:
+            # Few objects, or the cells around the point cover about every bucket
+            return np.arange(len(self.objects))
+        center = np.array([[position[0], position[1], position[2]]], dtype=np.float32)
+        buckets = np.unique(_hash_cells(self.cell_of(center) + offsets, self._mask))
+        counts = self._counts[buckets]
+        buckets, counts = buckets[counts > 0], counts[counts > 0]
+        # Concatenate the bucket slices of order without a Python loop
+        starts = self._ends[buckets] - counts
+        shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        return np.sort(self._order[shift + np.arange(counts.sum())])
+
+    def squared_distances(self, indices: np.ndarray, position: Tuple[float, float, float]) -> np.ndarray:
+        """Squared distances from position to the indexed objects at indices.
+
+        The offsets are computed in a scratch buffer that is reused between
+        calls.
+        """
+        count = len(indices)
+        if len(self._scratch) < count:
+            self._scratch = np.empty((max(count, 2 * len(self._scratch)), 3), dtype=np.float32)
+        delta = np.take(self.positions, indices, axis=0, out=self._scratch[:count])
+        delta -= np.array([position[0], position[1], position[2]], dtype=np.float32)
+        return np.einsum('ij,ij->i', delta, delta)
+
+    def neighbors(self, position: Tuple[float, float, float], radius: float,
+                  search_radius: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices and squared distances of the objects within radius of position.
+
+        Args:
+            position: The center position to search around.
+            radius: The search radius.
+            search_radius: Radius of the grid cells to scan, if wider than
+                radius, e.g. because objects moved since the rebuild.
+
+        Returns:
+            Tuple of (indices, squared distances) arrays, in index order.
+        """
+        if not self.objects:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+        search_radius = radius if search_radius is None else max(radius, search_radius)
+        if _neighbors is None:
+            candidates = self.candidate_indices(position, search_radius)
+            dist_sq = self.squared_distances(candidates, position)
+            within = dist_sq <= radius * radius
+            return candidates[within], dist_sq[within]
+        center = np.array([position[0], position[1], position[2]], dtype=np.float32)
+        reach = math.ceil(search_radius / self.cell_size)
+        brute = len(self.objects) <= _BRUTE_FORCE_LIMIT or (2 * reach + 1) ** 3 > self._mask
+        cell = self.cell_of(center[None, :])[0]
+        buffers = self._neighbor_buffers
+        if buffers is None or len(buffers[0]) != len(self.objects) or len(buffers[2]) != self._mask + 1:
+            buffers = self._neighbor_buffers = (np.empty(len(self.objects), dtype=np.int64),
+                                                np.empty(len(self.objects), dtype=np.float32),
+                                                np.zeros(self._mask + 1, dtype=np.bool_))
+        return _neighbors(self.positions, self._order, self._counts, self._ends, self._mask,
+                          cell, reach, center, np.float32(radius * radius), brute, *buffers)
+
+    def nearest(self, points: np.ndarray, radius: float, candidates: np.ndarray,
+                exclude: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Nearest candidate object within radius of each point, for many points at once.
+
+        Range is tested like ``neighbors``; among the objects in range the
+        nearest is picked by float64 distance, ties going to the lowest
+        index.
+
+        Args:
+            points: (Q, 3) array of positions to search around.
+            radius: The search radius.
+            candidates: Boolean array with one entry per object; only
+                objects marked True are considered.
+            exclude: Optional (Q,) array of an object index to skip for
+                each point, e.g. the index of the object at the point.
+
+        Returns:
+            Tuple of (indices, squared distances) arrays of shape (Q,);
+            points with no candidate in range get index -1 and distance inf.
+        """
+        kinds = np.where(candidates, 0, -1).astype(np.int8)
+        nearest, best_sq = self.nearest_by_kind(points, radius, kinds, 1, exclude)
+        return nearest[:, 0], best_sq[:, 0]
+
+    def nearest_by_kind(self, points: np.ndarray, radius: float, kinds: np.ndarray, kind_count: int,
+                        exclude: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Nearest object of each kind within radius of each point.
+
+        Like ``nearest`` with one candidate set per kind, but the buckets
+        around each point are walked once for all kinds.
+
+        Args:
+            points: (Q, 3) array of positions to search around.
+            radius: The search radius.
+            kinds: Integer array with one entry per object, the object's
+                kind in ``range(kind_count)`` or -1 to skip it.
+            kind_count: The number of kinds.
+            exclude: Optional (Q,) array of an object index to skip for
+                each point, e.g. the index of the object at the point.
+
+        Returns:
+            Tuple of (indices, squared distances) arrays of shape
+            (Q, kind_count); kinds with no object in range get index -1 and
+            distance inf.
+        """
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+        if exclude is None:
+            exclude = np.full(len(points), -1, dtype=np.int64)
+        nearest = np.full((len(points), kind_count), -1, dtype=np.int64)
+        best_sq = np.full((len(points), kind_count), np.inf)
+        if not self.objects or not len(points):
+            return nearest, best_sq
+        if _nearest is None:
+            for q, point in enumerate(points):
+                found, _ = self.neighbors(point, radius)
+                found = found[found != exclude[q]]
+                delta = self.positions[found].astype(np.float64) - point.astype(np.float64)
+                dist_sq = np.einsum('ij,ij->i', delta, delta)
+                found_kinds = kinds[found]
+                for k in range(kind_count):
+                    of_kind = found_kinds == k
+                    if of_kind.any():
+                        best = np.argmin(dist_sq[of_kind])
+                        nearest[q, k], best_sq[q, k] = found[of_kind][best], dist_sq[of_kind][best]
+            return nearest, best_sq
+        reach = math.ceil(radius / self.cell_size)
+        cells = (2 * reach + 1) ** 3
+        brute = (len(self.objects) <= _BRUTE_FORCE_LIMIT or cells > self._mask
+                 or cells * _CELL_VISIT_COST > len(self.objects))
+        return _nearest(self.positions, self._order, self._counts, self._ends, self._mask,
+                        points, np.float32(self._inv_cell_size), reach, np.float32(radius * radius), brute,
+                        np.asarray(kinds, dtype=np.int8), kind_count, np.asarray(exclude, dtype=np.int64))
+
+    def query_indices(self, position: Tuple[float, float, float], radius: float) -> np.ndarray:
+        """Indices into ``objects`` of everything within radius of position.
+
+        Args:
+            position: The center position to search around.
+            radius: The search radius.
+
+        Returns:
+            Array of object indices, in index order.
+        """
+        return self.neighbors(position, radius)[0]
+
+    def move(self, index: int, position: Tuple[float, float, float]) -> None:
+        """Record a new position for the object at index.
+
+        The object keeps its bucket until the next rebuild, so callers must
+        widen later searches by the distance objects may have moved.
+        """
+        self.positions[index] = (position[0], position[1], position[2])
+
+    def query(self, position: Tuple[float, float, float], radius: float) -> List[Any]:
+        """Objects within radius of position, as of the last rebuild."""
+        objects = self.objects
+        return [objects[i] for i in self.query_indices(position, radius).tolist()]
+
+    def _offsets(self, reach: int) -> np.ndarray:
+        """Cell offsets of the (2 * reach + 1)^3 block around a cell."""
+        offsets = self._neighbor_offsets.get(reach)
+        if offsets is None:
+            steps = np.arange(-reach, reach + 1)
+            offsets = np.stack(np.meshgrid(steps, steps, steps, indexing='ij'), axis=-1).reshape(-1, 3)
+            self._neighbor_offsets[reach] = offsets
+        return offsets
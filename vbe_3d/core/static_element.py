@@ -12,6 +12,10 @@ class ResourceType(Enum):
     SPECIAL = auto()
 
 
+# Resource types by name, as used in configuration and save files
+_RESOURCE_TYPES: Dict[str, ResourceType] = dict(ResourceType.__members__)
+
+
 @dataclass
 class ResourceProperties:
     """Properties of a resource element."""
@@ -35,6 +39,8 @@ class StaticElement(BaseElement):
         respawn_timer: Timer for respawning after collection
     """
     
+    moves = False
+    
     def __init__(
         self,
         position: Tuple[float, float, float],
@@ -122,6 +128,28 @@ class StaticElement(BaseElement):
             "respawn_timer": self.respawn_timer
         }
 
+    @classmethod
+    def from_config_dict(cls, config: Dict[str, Any]) -> "StaticElement":
+        """Create a static element from a world configuration entry.
+        
+        Args:
+            config: Entry of a config file's "static_elements" list. Must have
+                "position", "color", "resource_value" and "resource_type";
+                the remaining fields are optional.
+        """
+        get = config.get
+        return cls(
+            config["position"],
+            tuple(config["color"]),
+            config["resource_value"],
+            _RESOURCE_TYPES[config["resource_type"]],
+            get("decay_rate", 0.0),
+            get("respawn_time"),
+            get("max_uses"),
+            get("is_obstacle", False),
+            get("is_collectible", True)
+        )
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "StaticElement":
         """Create a static element from serialized data."""
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
-import json
-import math
-from typing import List, Dict, Set, Optional, Tuple, TYPE_CHECKING, Any
+import operator
+from typing import Iterable, List, Dict, Optional, Tuple, TYPE_CHECKING, Any
 from dataclasses import dataclass, field
 from enum import Enum
+import numpy as np
 from ursina import Vec3
 
 from vbe_3d.engine.base import BaseEngine
-from vbe_3d.core.robot import Robot, RobotState
+from vbe_3d.core.robot import Robot, RobotState, _STEP
 from vbe_3d.core.static_element import StaticElement
-from vbe_3d.brain.rl_brain import RLBrain
+from vbe_3d.core.spatial_grid import SpatialHashGrid, gather_positions
+from vbe_3d.brain.base_brain import RobotBrain
 from vbe_3d.brain.rule_based import RuleBasedBrain
+from vbe_3d.utils import json_codec
 
 if TYPE_CHECKING:
     from vbe_3d.core.robot import Robot
@@ -46,6 +48,20 @@ class WorldStats:
 class World:
     """The main world container for robots and static elements."""
     
+    # Steps between re-sorting objects by grid cell Z-order
+    MORTON_SORT_INTERVAL = 32
+    
+    # Edge length of the spatial index cells
+    _CELL_SIZE = 2.0
+    
+    # Squared distances below which robots connect, reproduce and collect
+    # resources; interactions compare squared distances only. Reproduction
+    # partners are picked among connected ones, so _R2_REPRO <= _R2_CONNECT.
+    _R2_CONNECT = 4.0
+    _R2_REPRO = 1.0
+    _R2_RESOURCE = 1.0
+    _INTERACTION_RADIUS = max(_R2_CONNECT, _R2_REPRO, _R2_RESOURCE) ** 0.5
+    
     def __init__(self, engine: BaseEngine):
         """Initialize the world.
         
@@ -58,39 +74,74 @@ class World:
         self.stats = WorldStats()
         self.time_step = 0
         self._interaction_cache: Dict[Tuple[int, int], Interaction] = {}
-        self._spatial_index: Dict[Tuple[int, int, int], Set[Any]] = {}
-        
-    def _update_spatial_index(self) -> None:
-        """Update the spatial index for faster proximity queries."""
-        self._spatial_index.clear()
-        for obj in self.robots + self.static_elements:
-            # Convert position to grid coordinates
-            x, y, z = map(lambda p: int(p), obj.position)
-            key = (x, y, z)
-            if key not in self._spatial_index:
-                self._spatial_index[key] = set()
-            self._spatial_index[key].add(obj)
+        self._spatial_index = SpatialHashGrid(self._CELL_SIZE)
+        self._indexed_robot_count = 0
+        # Robots added since the last spatial index update
+        self._unindexed_robots: List[Robot] = []
+        self._static_position_cache: Optional[Tuple[List[StaticElement], np.ndarray]] = None
+        self._perception_kinds: Optional[Tuple[List[Any], np.ndarray]] = None
+
+    @property
+    def positions(self) -> np.ndarray:
+        """Float32 array of shape (N, 3) with one row per indexed object.
+
+        Rows follow the robots and then the static elements as of the last
+        spatial index update. The rows of robots that act during a step are
+        updated in place, so after a step they match the robots' positions.
+        Objects added since the last update have no row yet.
+        """
+        return self._spatial_index.positions
+
+    def _update_spatial_index(self, reorder: bool = False) -> None:
+        """Update the spatial index for faster proximity queries.
+        
+        Args:
+            reorder: First sort the robots and static elements in place by the
+                Z-order of their grid cell, so that objects close in space are
+                also close in the lists and in the index arrays.
+        """
+        if reorder:
+            self.robots[:] = self._in_morton_order(self.robots)
+            self.static_elements[:] = self._in_morton_order(self.static_elements)
+        positions = np.concatenate([gather_positions(self.robots), self._static_positions()])
+        self._spatial_index.rebuild(self.robots + self.static_elements, positions)
+        self._indexed_robot_count = len(self.robots)
+        self._unindexed_robots.clear()
+        
+    def _static_positions(self) -> np.ndarray:
+        """Positions of the static elements, gathered again only if they can change.
+        
+        The positions are cached while the static element list holds the
+        same elements and none of them moves.
+        """
+        statics = self.static_elements
+        cached = self._static_position_cache
+        if cached is not None and len(cached[0]) == len(statics) and all(map(operator.is_, cached[0], statics)):
+            return cached[1]
+        positions = gather_positions(statics)
+        self._static_position_cache = None if any(e.moves for e in statics) else (list(statics), positions)
+        return positions
+        
+    def _in_morton_order(self, objects: List[Any]) -> List[Any]:
+        """Return the objects sorted by the Z-order of their grid cell."""
+        if len(objects) < 2:
+            return list(objects)
+        return [objects[i] for i in self._spatial_index.morton_order(gather_positions(objects)).tolist()]
     
-    def _get_nearby_objects(self, position: Tuple[float, float, float], radius: float) -> Set[Any]:
+    def _get_nearby_objects(self, position: Tuple[float, float, float], radius: float) -> List[Any]:
         """Get all objects within radius of the given position.
         
+        Uses the positions from the last spatial index update, so objects that
+        moved or were added since then may be missed.
+        
         Args:
             position: The center position to search around.
             radius: The search radius.
             
         Returns:
-            Set of objects within the radius.
+            List of objects within the radius.
         """
-        x, y, z = position
-        nearby = set()
-        # Check surrounding grid cells
-        for dx in range(-int(radius), int(radius) + 1):
-            for dy in range(-int(radius), int(radius) + 1):
-                for dz in range(-int(radius), int(radius) + 1):
-                    key = (int(x) + dx, int(y) + dy, int(z) + dz)
-                    if key in self._spatial_index:
-                        nearby.update(self._spatial_index[key])
-        return nearby
+        return self._spatial_index.query(position, radius)
 
     def add_robot(self, robot: Robot) -> None:
         """Add a robot to the world.
@@ -99,10 +150,25 @@ class World:
             robot: The robot to add.
         """
         self.robots.append(robot)
+        self._unindexed_robots.append(robot)
         robot.world = self
         self.engine.add_object(robot)
         self.stats.robots_created += 1
         
+    def add_robots(self, robots: Iterable[Robot]) -> None:
+        """Add several robots to the world with one engine registration.
+        
+        Args:
+            robots: The robots to add.
+        """
+        robots = list(robots)
+        for robot in robots:
+            robot.world = self
+        self.robots.extend(robots)
+        self._unindexed_robots.extend(robots)
+        self.engine.add_objects(robots)
+        self.stats.robots_created += len(robots)
+        
     def remove_robot(self, robot: Robot) -> None:
         """Remove a robot from the world.
         
@@ -125,6 +191,18 @@ class World:
         element.world = self
         self.engine.add_object(element)
         
+    def add_statics(self, elements: Iterable[StaticElement]) -> None:
+        """Add several static elements to the world with one engine registration.
+        
+        Args:
+            elements: The static elements to add.
+        """
+        elements = list(elements)
+        for element in elements:
+            element.world = self
+        self.static_elements.extend(elements)
+        self.engine.add_objects(elements)
+        
     def remove_static(self, element: StaticElement) -> None:
         """Remove a static element from the world.
         
@@ -136,12 +214,26 @@ class World:
             element.world = None
             self.engine.remove_object(element)
             
+    def warmup_brains(self) -> None:
+        """Warm up every robot's brain before the first step."""
+        for robot in self.robots:
+            robot.brain.warmup()
+            
     def step(self) -> None:
-        """Advance the world simulation by one step."""
+        """Advance the world simulation by one step.
+        
+        The spatial index is rebuilt first, so robots perceive the resources
+        and robots around them as of the start of the step. Robots that move
+        are not pushed to the engine one by one; the caller
+        syncs the engine once per step, e.g. with
+        engine.update_objects(engine.entity_list).
+        """
         self.stats.steps += 1
+        self._update_spatial_index(reorder=self.stats.steps % self.MORTON_SORT_INTERVAL == 0)
         
         # Update robots
-        for robot in self.robots[:]:  # Copy list to allow removal during iteration
+        # Copy list to allow removal during iteration; it matches the index order
+        for i, robot in enumerate(self.robots[:]):
             if robot.state == RobotState.DEAD:
                 self.remove_robot(robot)
                 continue
@@ -150,46 +242,208 @@ class World:
             if hasattr(robot, 'reproduction_cooldown') and robot.reproduction_cooldown > 0:
                 robot.reproduction_cooldown -= 1
                 
-            # Get robot's perception of the world
-            obs = robot.perceive(self)
+            # Get robot's perception of the world; plain robots are looked up
+            # in the spatial index by their index
+            if type(robot) is Robot:
+                obs = self._perceive_indexed(i, robot)
+            else:
+                obs = robot.perceive(self)
             
             # Get action from brain
             action = robot.brain.decide_action(obs)
             
             # Execute action
             robot.act(action)
+            self._spatial_index.move(i, robot.position)
             
-            # Update visualization
-            self.engine.update_object(robot)
-            
-            # Check for resource collection
-            for element in self.static_elements:
-                if math.dist(robot.position, element.position) < 1.0:
-                    robot.collect_resource(element.resource_value)
-                    self.stats.resources_collected += 1
-                    self.engine.update_object(robot)
-                    
-            # Check for robot connections
-            for other in self.robots:
-                if other != robot and math.dist(robot.position, other.position) < 2.0:
-                    robot.connect(other)
-                    self.stats.connections_made += 1
-                    
-            # Check for reproduction - limit to prevent infinite loops
-            reproduction_count = 0
-            max_reproductions_per_step = 5  # Limit reproductions per step
-            
-            for other in self.robots:
-                if reproduction_count >= max_reproductions_per_step:
-                    break
-                    
-                if other != robot and math.dist(robot.position, other.position) < 1.0:
-                    child = robot.reproduce(other)
-                    if child:
-                        self.add_robot(child)
-                        self.stats.offspring_produced += 1
-                        reproduction_count += 1
+            self._resolve_interactions(robot)
                         
+    def step_rulebased_batch(self) -> None:
+        """Advance the world by one step, deciding all robots' actions at once.
+        
+        Every robot perceives the world first, then all actions are chosen by
+        RuleBasedBrain.decide_actions_batch in one call, and finally robots
+        act and interact in list order. Unlike step(), robots therefore see
+        the world as it was at the start of the step. Falls back to step()
+        if any robot does not have a RuleBasedBrain.
+        """
+        if not all(type(robot.brain) is RuleBasedBrain for robot in self.robots):
+            self.step()
+            return
+        self._step_batched()
+
+    def step_batched(self) -> None:
+        """Advance the world by one step with batched decisions per brain type.
+        
+        Like step_rulebased_batch, but for robots with any kind of brain:
+        the actions of all robots sharing a brain type come from one
+        decide_actions_for call per step, e.g. one RLBrain forward pass
+        instead of one per robot. Falls back to step() if a robot's brain
+        is not a RobotBrain.
+        """
+        if not all(isinstance(robot.brain, RobotBrain) for robot in self.robots):
+            self.step()
+            return
+        self._step_batched()
+
+    def _step_batched(self) -> None:
+        """Shared body of the batched steps; all brains are RobotBrains."""
+        self.stats.steps += 1
+        
+        for robot in self.robots[:]:
+            if robot.state == RobotState.DEAD:
+                self.remove_robot(robot)
+            elif robot.reproduction_cooldown > 0:
+                robot.reproduction_cooldown -= 1
+        
+        if not self.robots:
+            return
+        self._update_spatial_index(reorder=self.stats.steps % self.MORTON_SORT_INTERVAL == 0)
+        robots = self.robots[:]
+        observations = np.empty((len(robots), 9), dtype=np.float32)
+        if all(type(robot) is Robot for robot in robots):
+            self._perceive_batch(robots, observations)
+        else:
+            for i, robot in enumerate(robots):
+                robot.perceive(self, out=observations[i])
+        
+        groups: Dict[type, List[int]] = {}
+        for i, robot in enumerate(robots):
+            groups.setdefault(type(robot.brain), []).append(i)
+        if len(groups) == 1:
+            brain_type, = groups
+            actions = brain_type.decide_actions_for([robot.brain for robot in robots], observations)
+        else:
+            actions = np.empty(len(robots), dtype=np.int64)
+            for brain_type, members in groups.items():
+                rows = np.array(members)
+                actions[rows] = brain_type.decide_actions_for([robots[i].brain for i in members], observations[rows])
+        
+        for i, (robot, action) in enumerate(zip(robots, actions.tolist())):
+            robot.act(action)
+            self._spatial_index.move(i, robot.position)
+            self._resolve_interactions(robot)
+    
+    def _perception_candidates(self) -> np.ndarray:
+        """Kinds of the indexed objects for nearest_by_kind, made once per index update.
+        
+        Resources are kind 0, robots kind 1 and everything else -1.
+        """
+        index = self._spatial_index
+        cached = self._perception_kinds
+        if cached is not None and cached[0] is index.objects:
+            return cached[1]
+        count = self._indexed_robot_count
+        kinds = np.full(len(index.objects), -1, dtype=np.int8)
+        kinds[:count] = 1
+        kinds[count:][[hasattr(e, 'resource_value') for e in index.objects[count:]]] = 0
+        self._perception_kinds = (index.objects, kinds)
+        return kinds
+    
+    def _perceive_batch(self, robots: List[Robot], out: np.ndarray) -> None:
+        """Write every robot's Robot.perceive observation into a row of out.
+        
+        The nearest resources and robots of all robots come from one batched
+        spatial index query instead of a query and two Python loops per
+        robot. Requires robots to be the indexed robots in index order, none
+        of them moved since the index update.
+        
+        Args:
+            robots: The robots to perceive for.
+            out: (len(robots), 9) float32 array to write into.
+        """
+        index = self._spatial_index
+        count = len(robots)
+        positions = index.positions
+        own = positions[:count]
+        nearest, _ = index.nearest_by_kind(own, Robot.PERCEPTION_RADIUS, self._perception_candidates(), 2,
+                                           np.arange(count))
+        for kind, columns in enumerate((slice(0, 3), slice(3, 6))):
+            np.subtract(positions[nearest[:, kind]], own, out=out[:, columns])
+            out[nearest[:, kind] < 0, columns] = 0.0
+        states = len(RobotState)
+        rest = np.fromiter(
+            (v for r in robots for v in (r.energy / r.max_energy, len(r.connections) / 10.0, r.state.value / states)),
+            dtype=np.float32, count=3 * count)
+        out[:, 6:9] = rest.reshape(count, 3)
+    
+    def _perceive_indexed(self, i: int, robot: Robot) -> np.ndarray:
+        """Robot.perceive for the robot at index i of the spatial index.
+        
+        The nearest resource and robot come from one nearest_by_kind query
+        on the index, compiled with numba when available, instead of Python
+        loops of math.dist over the nearby objects. The robot's index
+        position must be current.
+        """
+        index = self._spatial_index
+        positions = index.positions
+        point = positions[i:i + 1]
+        res, bot = index.nearest_by_kind(point, Robot.PERCEPTION_RADIUS, self._perception_candidates(), 2,
+                                         np.array([i]))[0][0]
+        obs = np.empty(9, dtype=np.float32)
+        obs[0:3] = positions[res] - point[0] if res >= 0 else 0.0
+        obs[3:6] = positions[bot] - point[0] if bot >= 0 else 0.0
+        obs[6] = robot.energy / robot.max_energy
+        obs[7] = len(robot.connections) / 10.0
+        obs[8] = robot.state.value / len(RobotState)
+        return obs
+    
+    def _resolve_interactions(self, robot: Robot) -> None:
+        """Handle resource collection, connections and reproduction for a robot.
+        
+        Partners are looked up in the spatial index, which must have been
+        updated this step, with positions kept current as robots act.
+        Robots added since the update are checked one by one.
+        
+        Args:
+            robot: The robot that has just acted.
+        """
+        index = self._spatial_index
+        objects = index.objects
+        # Widen the cell search by one move, as the cells date from the update
+        candidates, dist_sq = index.neighbors(robot.position, self._INTERACTION_RADIUS,
+                                              search_radius=self._INTERACTION_RADIUS + _STEP)
+        is_robot = candidates < self._indexed_robot_count
+        
+        # Check for resource collection
+        for i in candidates[~is_robot & (dist_sq < self._R2_RESOURCE)].tolist():
+            element = objects[i]
+            robot.collect_resource(element.resource_value)
+            self.stats.resources_collected += 1
+                
+        # Check for robot connections
+        near = is_robot & (dist_sq < self._R2_CONNECT)
+        near_robots = [objects[i] for i in candidates[near].tolist()]
+        touching = {id(objects[i]) for i in candidates[near & (dist_sq < self._R2_REPRO)].tolist()}
+        x, y, z = robot.position[0], robot.position[1], robot.position[2]
+        for other in self._unindexed_robots:
+            dx, dy, dz = other.position[0] - x, other.position[1] - y, other.position[2] - z
+            d2 = dx * dx + dy * dy + dz * dz
+            if d2 < self._R2_CONNECT:
+                near_robots.append(other)
+                if d2 < self._R2_REPRO:
+                    touching.add(id(other))
+        near_robots = [other for other in near_robots if other is not robot and other.world is self]
+        
+        for other in near_robots:
+            robot.connect(other)
+            self.stats.connections_made += 1
+                
+        # Check for reproduction - limit to prevent infinite loops
+        reproduction_count = 0
+        max_reproductions_per_step = 5  # Limit reproductions per step
+        
+        for other in near_robots:
+            if reproduction_count >= max_reproductions_per_step:
+                break
+                
+            if id(other) in touching:
+                child = robot.reproduce(other)
+                if child:
+                    self.add_robot(child)
+                    self.stats.offspring_produced += 1
+                    reproduction_count += 1
+                    
     def to_dict(self) -> dict:
         """Convert world state to dictionary for serialization."""
         return {
@@ -286,7 +540,7 @@ class World:
                 data["static"].append(elem_data)
                 
             with open(filepath, 'w') as f:
-                json.dump(data, f, indent=4)
+                f.write(json_codec.dumps(data))
         except Exception as e:
             raise IOError(f"Failed to save world state: {e}")
     
@@ -301,8 +555,8 @@ class World:
             ValueError: If the file contains invalid data.
         """
         try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
+            with open(filepath, 'rb') as f:
+                data = json_codec.loads(f.read())
                 
             # Clear current world
             for r in list(self.robots):
@@ -342,6 +596,7 @@ class World:
                         
                     brain_type = rdata.get("brain_type", "RuleBasedBrain")
                     if brain_type == "RLBrain":
+                        from vbe_3d.brain.rl_brain import RLBrain
                         robot.brain = RLBrain()
                     else:
                         robot.brain = RuleBasedBrain()
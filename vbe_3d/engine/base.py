@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterable, Tuple
 
 # Engine interface abstraction
 class BaseEngine(ABC):
@@ -14,6 +14,18 @@ class BaseEngine(ABC):
         """
         pass
     
+    def add_objects(self, objs: Iterable[Any]) -> None:
+        """Create visual entities for several objects at once.
+        
+        Engines that can register objects in bulk should override this; the
+        default simply calls add_object for each object.
+        
+        Args:
+            objs: The objects to visualize.
+        """
+        for obj in objs:
+            self.add_object(obj)
+    
     @abstractmethod
     def remove_object(self, obj: Any) -> None:
         """Destroy the object's entity in the scene.
@@ -32,6 +44,18 @@ class BaseEngine(ABC):
         """
         pass
     
+    def update_objects(self, objs: Iterable[Any]) -> None:
+        """Update the visual entities of several objects at once.
+        
+        Engines that can push updates in bulk should override this; the
+        default simply calls update_object for each object.
+        
+        Args:
+            objs: The objects to update.
+        """
+        for obj in objs:
+            self.update_object(obj)
+    
     @abstractmethod
     def run(self, world: Any) -> None:
         """Start the visualization loop.
@@ -54,8 +54,7 @@ class WorldUpdater(Entity):
     def update(self):
         try:
             self.world.step()
-            for obj in list(self.engine.entities.keys()):
-                self.engine.update_object(obj)
+            self.engine.update_objects(self.engine.entity_list)
         except Exception as e:
             print(f"Error in simulation step: {e}")
 
@@ -80,6 +79,7 @@ class UrsinaEngine(BaseEngine):
         self.app = Ursina(borderless=borderless, development_mode=True)
         
         self.entities: Dict[Any, Entity] = {}
+        self._entity_list: List[Any] = []
         self.debug = debug
         self.world_updater: Optional[WorldUpdater] = None
         self.editor_camera: Optional[EditorCamera] = None
@@ -172,16 +172,27 @@ class UrsinaEngine(BaseEngine):
                 'model_type': model_type,
                 'scale': scale
             }
+            self._entity_list.append(obj)
 
         except Exception as e:
             raise RuntimeError(f"Failed to create entity for object: {e}")
 
+    @property
+    def entity_list(self) -> List[Any]:
+        """Objects that currently have an entity, in insertion order.
+        
+        Kept up to date by add_object/remove_object so the per-frame update
+        can iterate it without taking a snapshot; do not modify it.
+        """
+        return self._entity_list
+
     def remove_object(self, obj: Any) -> None:
         """Destroy the object's entity in the Ursina scene."""
         entity_data = self.entities.get(obj)
         if entity_data:
             destroy(entity_data['entity'])
             del self.entities[obj]
+            self._entity_list.remove(obj)
 
     def update_object(self, obj: Any) -> None:
         """Update the Ursina entity to match the object's state."""
@@ -229,6 +240,7 @@ class UrsinaEngine(BaseEngine):
         for entity_data in self.entities.values():
             destroy(entity_data['entity'])
         self.entities.clear()
+        self._entity_list.clear()
         if hasattr(self, 'world_updater') and self.world_updater:
             destroy(self.world_updater)
             self.world_updater = None
@@ -1,5 +1,5 @@
-from typing import Any, Dict, Optional, Union, Tuple
-import json
+from typing import Any, Dict, Iterable, List, Optional, Union, Tuple
+import numpy as np
 from pathlib import Path
 import http.server
 import socketserver
@@ -12,6 +12,9 @@ from .base import BaseEngine
 import os
 import time
 
+# Layout of one record in a binary position frame (little-endian, 16 bytes)
+POSITION_RECORD = np.dtype([('slot', '<u4'), ('x', '<f4'), ('y', '<f4'), ('z', '<f4')])
+
 def vec3_to_list(vec3_or_tuple):
     """Convert a Vec3 object or tuple to a list of coordinates."""
     if isinstance(vec3_or_tuple, (tuple, list)):
@@ -37,7 +40,13 @@ class WebGLEngine(BaseEngine):
         self.ws_port = ws_port
         self.enable_camera_controls = enable_camera_controls
         self.entities: Dict[Any, Dict] = {}
+        self._entity_list: List[Any] = []
         self.world_updater: Optional[Any] = None
+        # Last sent position of every entity as one (slots, 3) float32 array;
+        # each entity owns a slot, freed slots are reused by later additions.
+        self._positions = np.zeros((64, 3), dtype=np.float32)
+        self._slot_count = 0
+        self._free_slots: List[int] = []
         self.loop = asyncio.get_event_loop()
         self.message_queue = asyncio.Queue()
         
@@ -93,8 +102,15 @@ class WebGLEngine(BaseEngine):
         while True:
             message = await self.message_queue.get()
             try:
-                if self.ws_server.clients:
-                    print(f"Sending WebSocket message: {message}")
+                if isinstance(message, asyncio.Future):
+                    # Marker from messages_sent: everything before it has gone out
+                    if not message.done():
+                        message.set_result(None)
+                elif self.ws_server.clients:
+                    if isinstance(message, bytes):
+                        print(f"Sending WebSocket binary frame: {len(message)} bytes")
+                    else:
+                        print(f"Sending WebSocket message: {message}")
                     await self.ws_server.broadcast(message)
                 else:
                     print("No WebSocket clients connected, skipping message")
@@ -103,8 +119,19 @@ class WebGLEngine(BaseEngine):
             finally:
                 self.message_queue.task_done()
     
-    def add_object(self, obj: Any) -> None:
-        """Create a visual entity for the object in the WebGL scene."""
+    def _alloc_slot(self) -> int:
+        """Reserve a row of the position buffer for a new entity."""
+        if self._free_slots:
+            return self._free_slots.pop()
+        if self._slot_count == len(self._positions):
+            grown = np.zeros((2 * len(self._positions), 3), dtype=np.float32)
+            grown[:self._slot_count] = self._positions
+            self._positions = grown
+        self._slot_count += 1
+        return self._slot_count - 1
+
+    def _register_object(self, obj: Any) -> Dict[str, Any]:
+        """Track a new object and return the 'add' message describing it."""
         try:
             pos = vec3_to_list(obj.position)
             col = vec3_to_list(obj.color)
@@ -114,33 +141,64 @@ class WebGLEngine(BaseEngine):
         try:
             model_type = getattr(obj, 'model_type', 'cube')
             scale = getattr(obj, 'scale', (1, 1, 1))
+            slot = self._alloc_slot()
+            self._positions[slot] = pos
 
             self.entities[obj] = {
                 'id': id(obj),
-                'position': pos,
+                'slot': slot,
                 'color': col,
                 'model_type': model_type,
                 'scale': scale
             }
+            self._entity_list.append(obj)
 
-            # Queue add message
-            message = {
+            return {
                 'type': 'add',
                 'id': id(obj),
+                'slot': slot,
                 'position': pos,
                 'color': col,
                 'model_type': model_type,
                 'scale': scale
             }
-            print(f"Adding object: {message}")
-            self.loop.call_soon_threadsafe(
-                self.message_queue.put_nowait,
-                message
-            )
 
         except Exception as e:
             raise RuntimeError(f"Failed to create entity for object: {e}")
 
+    @property
+    def entity_list(self) -> List[Any]:
+        """Objects that currently have an entity, in insertion order.
+        
+        Kept up to date by add_object/remove_object so the per-tick update
+        can iterate it without taking a snapshot; do not modify it.
+        """
+        return self._entity_list
+
+    def add_object(self, obj: Any) -> None:
+        """Create a visual entity for the object in the WebGL scene."""
+        message = self._register_object(obj)
+        print(f"Adding object: {message}")
+        self.loop.call_soon_threadsafe(
+            self.message_queue.put_nowait,
+            message
+        )
+
+    def add_objects(self, objs: Iterable[Any]) -> None:
+        """Create visual entities for several objects with a single message."""
+        objects = [self._register_object(obj) for obj in objs]
+        if not objects:
+            return
+        message = {
+            'type': 'add_batch',
+            'objects': objects
+        }
+        print(f"Adding {len(objects)} objects")
+        self.loop.call_soon_threadsafe(
+            self.message_queue.put_nowait,
+            message
+        )
+
     def remove_object(self, obj: Any) -> None:
         """Destroy the object's entity in the WebGL scene."""
         if obj in self.entities:
@@ -154,7 +212,30 @@ class WebGLEngine(BaseEngine):
                 self.message_queue.put_nowait,
                 message
             )
-            del self.entities[obj]
+            self._free_slots.append(self.entities.pop(obj)['slot'])
+            self._entity_list.remove(obj)
+
+    def _refresh_object(self, obj: Any) -> Optional[Dict[str, Any]]:
+        """Sync the tracked state of an object and return its 'update' message."""
+        entity_data = self.entities[obj]
+        position = vec3_to_list(obj.position)
+        self._positions[entity_data['slot']] = position
+        entity_data['color'] = vec3_to_list(obj.color)
+
+        if hasattr(obj, 'rotation'):
+            entity_data['rotation'] = vec3_to_list(obj.rotation)
+
+        if hasattr(obj, 'scale'):
+            entity_data['scale'] = obj.scale
+
+        return {
+            'type': 'update',
+            'id': id(obj),
+            'position': position,
+            'color': entity_data['color'],
+            'rotation': entity_data.get('rotation'),
+            'scale': entity_data.get('scale')
+        }
 
     def update_object(self, obj: Any) -> None:
         """Update the WebGL entity to match the object's state."""
@@ -162,25 +243,7 @@ class WebGLEngine(BaseEngine):
             return
 
         try:
-            entity_data = self.entities[obj]
-            entity_data['position'] = vec3_to_list(obj.position)
-            entity_data['color'] = vec3_to_list(obj.color)
-
-            if hasattr(obj, 'rotation'):
-                entity_data['rotation'] = vec3_to_list(obj.rotation)
-
-            if hasattr(obj, 'scale'):
-                entity_data['scale'] = obj.scale
-
-            # Queue update message
-            message = {
-                'type': 'update',
-                'id': id(obj),
-                'position': entity_data['position'],
-                'color': entity_data['color'],
-                'rotation': entity_data.get('rotation'),
-                'scale': entity_data.get('scale')
-            }
+            message = self._refresh_object(obj)
             print(f"Updating object: {message}")
             self.loop.call_soon_threadsafe(
                 self.message_queue.put_nowait,
@@ -190,6 +253,80 @@ class WebGLEngine(BaseEngine):
         except Exception as e:
             print(f"Warning: Failed to update object visualization: {e}")
 
+    def update_objects(self, objs: Iterable[Any]) -> None:
+        """Update several WebGL entities at once.
+        
+        Positions of objects that moved since their position was last sent
+        are sent as a single binary frame (see send_positions_binary).
+        Objects whose color, rotation or scale changed are instead sent,
+        position included, in one 'update_batch' JSON message. Meant to be
+        called once per tick as the only sync of the moving objects; an
+        update_object call in between sends that object's position as JSON
+        instead, so the frame only has it if it moves again.
+        """
+        slots = []
+        positions = []
+        changed = []
+        for obj in objs:
+            entity_data = self.entities.get(obj)
+            if entity_data is None:
+                continue
+            try:
+                position = obj.position
+                positions.append((position[0], position[1], position[2]))
+                slots.append(entity_data['slot'])
+                if (vec3_to_list(obj.color) != entity_data['color']
+                        or hasattr(obj, 'rotation')
+                        or getattr(obj, 'scale', entity_data['scale']) != entity_data['scale']):
+                    changed.append(self._refresh_object(obj))
+            except Exception as e:
+                print(f"Warning: Failed to update object visualization: {e}")
+        if changed:
+            self.loop.call_soon_threadsafe(
+                self.message_queue.put_nowait,
+                {'type': 'update_batch', 'objects': changed}
+            )
+        if slots:
+            slots = np.array(slots, dtype=np.uint32)
+            positions = np.array(positions, dtype=np.float32)
+            moved = (self._positions[slots] != positions).any(axis=1)
+            if moved.any():
+                self._positions[slots[moved]] = positions[moved]
+                self.send_positions_binary(slots[moved], positions[moved])
+
+    def send_positions_binary(self, slots: np.ndarray, positions: np.ndarray) -> None:
+        """Queue a binary frame with new positions for the given entity slots.
+        
+        The frame is a packed array of POSITION_RECORD entries, one
+        (uint32 slot, float32 x, y, z) record of 16 bytes per entity.
+        
+        Args:
+            slots: (N,) array of entity slots, as sent in the 'add' messages.
+            positions: (N, 3) array of positions.
+        """
+        records = np.empty(len(slots), dtype=POSITION_RECORD)
+        records['slot'] = slots
+        records['x'] = positions[:, 0]
+        records['y'] = positions[:, 1]
+        records['z'] = positions[:, 2]
+        self.loop.call_soon_threadsafe(
+            self.message_queue.put_nowait,
+            records.tobytes()
+        )
+
+    def messages_sent(self) -> asyncio.Future:
+        """Return a future that is done once every message queued so far is sent.
+        
+        Lets a simulation loop keep going while earlier ticks' messages are
+        still being sent, and wait only when it gets too many ticks ahead.
+        """
+        marker = self.loop.create_future()
+        self.loop.call_soon_threadsafe(
+            self.message_queue.put_nowait,
+            marker
+        )
+        return marker
+
     def run(self, world: Any) -> None:
         """Start the visualization loop."""
         self.world_updater = world
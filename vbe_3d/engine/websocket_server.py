@@ -1,7 +1,8 @@
 import asyncio
 import websockets
-import json
-from typing import Set, Dict, Any
+from typing import Set, Dict, Any, Union
+
+from vbe_3d.utils.json_codec import dumps
 
 class WebSocketServer:
     """WebSocket server for real-time communication with WebGL clients."""
@@ -45,18 +46,24 @@ class WebSocketServer:
             self.clients.remove(websocket)
             print(f"WebSocket client disconnected. Remaining clients: {len(self.clients)}")
             
-    async def broadcast(self, message: Dict[str, Any]):
+    async def broadcast(self, message: Union[Dict[str, Any], bytes]):
         """Broadcast a message to all connected clients.
         
         Args:
-            message: The message to broadcast.
+            message: The message to broadcast. Dictionaries are sent as JSON
+                text frames (encoded with orjson when available), bytes are
+                sent unchanged as a binary frame.
         """
         if not self.clients:
             print("No WebSocket clients connected")
             return
             
-        message_str = json.dumps(message)
-        print(f"Broadcasting to {len(self.clients)} clients: {message_str}")
+        if isinstance(message, bytes):
+            message_str = message
+            print(f"Broadcasting {len(message)} bytes to {len(self.clients)} clients")
+        else:
+            message_str = dumps(message)
+            print(f"Broadcasting to {len(self.clients)} clients: {message_str}")
         await asyncio.gather(
             *[client.send(message_str) for client in self.clients]
         ) 
\ No newline at end of file
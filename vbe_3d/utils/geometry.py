@@ -1,5 +1,28 @@
 from typing import Tuple
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 
 def add_vec(a: Tuple[float, float, float], b: Tuple[float, float, float]):
     return [a[i] + b[i] for i in range(3)]
+
+
+def _add_vec_kernel(a, b):
+    """add_vec for float64[3] arrays, written to compile under numba."""
+    out = np.empty(3, dtype=np.float64)
+    for i in range(3):
+        out[i] = a[i] + b[i]
+    return out
+
+
+# Array variant of add_vec for use inside compiled hot loops; without numba
+# it is plain np.add.
+if njit is not None:
+    add_vec_njit = njit(cache=True, fastmath=True)(_add_vec_kernel)
+else:
+    add_vec_njit = np.add
@@ -0,0 +1,26 @@
+"""JSON encoding and decoding backed by orjson when it is installed."""
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+
+if orjson is not None:
+    def dumps(obj: Any) -> str:
+        """Serialize ``obj`` to a JSON string."""
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    def loads(data: Union[str, bytes]) -> Any:
+        """Deserialize a JSON document from ``str`` or ``bytes``."""
+        return orjson.loads(data)
+else:
+    def dumps(obj: Any) -> str:
+        """Serialize ``obj`` to a JSON string."""
+        return json.dumps(obj)
+
+    def loads(data: Union[str, bytes]) -> Any:
+        """Deserialize a JSON document from ``str`` or ``bytes``."""
+        return json.loads(data)